@@ -2,25 +2,71 @@ import os
 from flask import Flask, request, make_response
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from flask_mail import Mail
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from celery import Celery
 from config import Config
+from app.cache import SlotCache
+from app.mailer import Mailer
+from app.passwords import PasswordHasher
+from app.otp_store import OTPStore
+from app.metrics import Metrics
+from app.query_audit import QueryAudit
+from app.db_routing import RoutingSession, configure_replicas, init_replicas
+from app.sqlite_mode import configure_sqlite, init_sqlite_engines
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
-mail = Mail()
+mail = Mailer()
 jwt = JWTManager()
+celery = Celery(__name__)
+slot_cache = SlotCache()
+password_hasher = PasswordHasher()
+otp_store = OTPStore()
+metrics = Metrics()
+query_audit = QueryAudit()
+
+def init_celery(app):
+    """
+    Bind the shared Celery instance to the Flask app so the web process can
+    enqueue tasks and the worker runs them inside an app context.
+    """
+    celery.conf.update(
+        broker_url=app.config.get("CELERY_BROKER_URL"),
+        task_always_eager=app.config.get("CELERY_TASK_ALWAYS_EAGER", False),
+        task_ignore_result=True,
+    )
+
+    class ContextTask(celery.Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context(), query_audit.task_scope(self.name):
+                return self.run(*args, **kwargs)
+
+    celery.Task = ContextTask
+    celery.set_default()
+    return celery
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
     # Initialize extensions
+    sqlite_mode = configure_sqlite(app)
+    replicas = configure_replicas(app)
     db.init_app(app)
+    if sqlite_mode:
+        init_sqlite_engines(app, db)
+    if replicas:
+        init_replicas(app, db)
     migrate.init_app(app, db)
     mail.init_app(app)
     jwt.init_app(app)
+    init_celery(app)
+    slot_cache.init_app(app)
+    password_hasher.init_app(app)
+    otp_store.init_app(app)
+    metrics.init_app(app)
+    query_audit.init_app(app)
 
     # --- CORS CONFIGURATION ---
     CORS(app,
@@ -46,4 +92,13 @@ def create_app():
     from app.routes import main
     app.register_blueprint(main)
 
+    from app.auth_utils import init_identity_cache
+    init_identity_cache(app)
+
+    from app.zoom_utils import zoom_client
+    zoom_client.init_app(app)
+
+    from app.cli import register_commands
+    register_commands(app)
+
     return app
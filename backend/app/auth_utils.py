@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import event
+from app import db
+from app.models import Recruiter
+
+# The recruiter fields endpoints actually need; loaded without the password
+# or Zoom token columns.
+RecruiterIdentity = namedtuple("RecruiterIdentity", ["id", "email", "name", "timezone"])
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries also expire after ttl seconds."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_identity_cache = TTLCache()
+
+
+def init_identity_cache(app):
+    _identity_cache.maxsize = app.config.get("RECRUITER_CACHE_SIZE", 1024)
+    _identity_cache.ttl = app.config.get("RECRUITER_CACHE_TTL", 60)
+
+
+def recruiter_claims(recruiter):
+    """Extra JWT claims issued at login so requests can skip the email lookup."""
+    return {"rid": recruiter.id}
+
+
+def _load_identity(recruiter_id=None, email=None):
+    query = db.session.query(Recruiter.id, Recruiter.email, Recruiter.name, Recruiter.timezone)
+    if recruiter_id is not None:
+        row = query.filter(Recruiter.id == recruiter_id).first()
+    else:
+        row = query.filter(Recruiter.email == email).first()
+    return RecruiterIdentity(*row) if row else None
+
+
+def current_recruiter():
+    """
+    Identity of the recruiter behind the current JWT, or None.
+
+    Looked up by the "rid" claim (tokens issued before it existed fall back to
+    the email identity), memoised on flask.g for the request and in a per-process
+    TTL'd LRU cache across requests. Profile changes invalidate the cache entry
+    in the process that made them only; other workers see them within
+    RECRUITER_CACHE_TTL seconds.
+    """
+    if "current_recruiter" in g:
+        return g.current_recruiter
+
+    email = get_jwt_identity()
+    identity = None
+    if email:
+        recruiter_id = get_jwt().get("rid")
+        key = ("id", recruiter_id) if recruiter_id is not None else ("email", email)
+        identity = _identity_cache.get(key)
+        if identity is None:
+            identity = _load_identity(recruiter_id=recruiter_id, email=email)
+            if identity is not None:
+                _identity_cache.set(key, identity)
+        if identity is not None and identity.email != email:
+            identity = None
+
+    g.current_recruiter = identity
+    return identity
+
+
+def invalidate_recruiter(recruiter_id, email=None):
+    _identity_cache.delete(("id", recruiter_id))
+    if email:
+        _identity_cache.delete(("email", email))
+
+
+@event.listens_for(Recruiter, "after_update")
+@event.listens_for(Recruiter, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    invalidate_recruiter(target.id, target.email)
+    # An email change must also drop the entry cached under the old address
+    for old_email in db.inspect(target).attrs.email.history.deleted or ():
+        invalidate_recruiter(target.id, old_email)
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from flask import current_app
+import redis
+
+
+class _LocalBackend:
+    """Process-local fallback for single-node deployments (one gunicorn worker per cache)."""
+
+    def __init__(self, max_entries=10000):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._generations = {}
+        self._max_entries = max_entries
+
+    def get_generation(self, key):
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def incr_generation(self, key):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if len(self._values) >= self._max_entries:
+                # Drop the entry closest to expiry to stay bounded
+                oldest = min(self._values, key=lambda k: self._values[k][0])
+                del self._values[oldest]
+            self._values[key] = (time.monotonic() + ttl, value)
+
+
+class _RedisBackend:
+    """Shared across all gunicorn workers (and hosts) pointing at the same Redis."""
+
+    def __init__(self, url):
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get_generation(self, key):
+        value = self._client.get(key)
+        return int(value) if value is not None else 0
+
+    def incr_generation(self, key):
+        self._client.incr(key)
+
+    def get(self, key):
+        value = self._client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(key, value, ex=ttl)
+
+
+def cache_backend(url):
+    """Redis at url, or a process-local backend when url is "memory://" (or empty)."""
+    url = url or "memory://"
+    return _LocalBackend() if url.startswith("memory://") else _RedisBackend(url)
+
+
+class SlotCache:
+    """
+    Per-recruiter cache of the rendered public availability slot list.
+
+    Entries are keyed by a per-recruiter generation number. invalidate() bumps
+    the generation after a write commits, so a reader that loaded the slots
+    just before the write can only store them under the old generation, which
+    nobody reads any more. Cache errors never fail a request; the caller just
+    falls through to the database.
+    """
+
+    key_prefix = "public_availability"
+
+    def __init__(self, app=None):
+        self._backend = None
+        self.ttl = 60
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get("PUBLIC_AVAILABILITY_CACHE_TTL", 60)
+        self._backend = cache_backend(app.config.get("CACHE_REDIS_URL"))
+        app.extensions["slot_cache"] = self
+
+    def _generation_key(self, recruiter_id):
+        return f"{self.key_prefix}:{recruiter_id}:gen"
+
+    def _slots_key(self, recruiter_id, generation):
+        return f"{self.key_prefix}:{recruiter_id}:{generation}"
+
+    def get_or_load(self, recruiter_id, loader):
+        """Return the cached slot list for a recruiter, calling loader() on a miss."""
+        if self._backend is None or self.ttl <= 0:
+            return loader()
+        try:
+            generation = self._backend.get_generation(self._generation_key(recruiter_id))
+            cached = self._backend.get(self._slots_key(recruiter_id, generation))
+        except redis.RedisError as e:
+            current_app.logger.warning("Slot cache read failed: %s", str(e))
+            return loader()
+        if cached is not None:
+            return json.loads(cached)
+
+        slots = loader()
+        try:
+            self._backend.set(self._slots_key(recruiter_id, generation), json.dumps(slots), self.ttl)
+        except redis.RedisError as e:
+            current_app.logger.warning("Slot cache write failed: %s", str(e))
+        return slots
+
+    def invalidate(self, recruiter_id):
+        """Call after committing any change to the recruiter's slots or bookings."""
+        if self._backend is None:
+            return
+        try:
+            self._backend.incr_generation(self._generation_key(recruiter_id))
+        except redis.RedisError as e:
+            current_app.logger.error("Slot cache invalidation failed for recruiter %s: %s", recruiter_id, str(e))
@@ -0,0 +1,78 @@
+import click
+from flask.cli import with_appcontext
+
+
+@click.command("check-query-plans")
+@click.option("--verbose", "-v", is_flag=True, help="Print every plan, not only failing ones.")
+@with_appcontext
+def check_query_plans_command(verbose):
+    """Fail if any hot endpoint query is planned as a full table scan."""
+    from app.query_plans import check_query_plans
+
+    failures = 0
+    for name, plan, scans in check_query_plans():
+        click.echo(f"{'FULL SCAN' if scans else 'ok':<10} {name}")
+        if scans or verbose:
+            for line in plan:
+                click.echo(f"           {line}")
+        failures += bool(scans)
+    if failures:
+        raise click.ClickException(f"{failures} hot quer{'y' if failures == 1 else 'ies'} fell back to a full table scan")
+
+
+@click.command("seed")
+@click.option("--recruiters", default=1000, show_default=True)
+@click.option("--slots-per-recruiter", default=1000, show_default=True)
+@click.option("--booked-fraction", default=0.3, show_default=True)
+@click.option("--open-invitations", default=20, show_default=True, help="Unused invitations per recruiter.")
+@click.option("--slot-minutes", default=30, show_default=True)
+@click.option("--email-domain", default="seed.example.com", show_default=True)
+@click.option("--password", default="seed-password", show_default=True)
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per multi-row INSERT.")
+@click.option("--random-seed", default=42, show_default=True)
+@with_appcontext
+def seed_command(**options):
+    """Generate a large synthetic dataset (recruiters, slots, bookings, invitations)."""
+    import time
+    from app.seed import seed_dataset
+
+    started = time.perf_counter()
+
+    def progress(counts):
+        click.echo(f"  {counts['recruiter']} recruiters, {counts['availability']} slots, "
+                   f"{counts['booking']} bookings ({time.perf_counter() - started:.1f}s)")
+
+    try:
+        counts = seed_dataset(progress=progress, **options)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+
+
+@click.command("export")
+@click.argument("kind", type=click.Choice(["bookings", "availability"]))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default="csv", show_default=True)
+@click.option("--recruiter-id", "recruiter_ids", type=int, multiple=True, help="Repeatable; all recruiters if omitted.")
+@click.option("--from", "day_from", type=click.DateTime(["%Y-%m-%d"]), help="First UTC day.")
+@click.option("--to", "day_to", type=click.DateTime(["%Y-%m-%d"]), help="Last UTC day (inclusive).")
+@click.option("--output", "-o", default="-", show_default=True, help="File to write; - for stdout.")
+@with_appcontext
+def export_command(kind, fmt, recruiter_ids, day_from, day_to, output):
+    """Stream bookings or availability of any recruiters as CSV or NDJSON."""
+    from datetime import timedelta
+    from flask import current_app
+    from app.exports import export_chunks, export_statement
+    from app.tz_utils import UTC
+
+    start = day_from.replace(tzinfo=UTC) if day_from else None
+    end = (day_to + timedelta(days=1)).replace(tzinfo=UTC) if day_to else None
+    statement = export_statement(kind, list(recruiter_ids) or None, start, end)
+    with click.open_file(output, "w", encoding="utf-8") as out:
+        for chunk in export_chunks(statement, fmt, current_app.config.get("EXPORT_BATCH_SIZE", 1000)):
+            out.write(chunk)
+
+
+def register_commands(app):
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(export_command)
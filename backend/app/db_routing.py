@@ -0,0 +1,181 @@
+"""
+Session routing between the primary (writer) engine, read replicas and a
+SQLite reader engine.
+
+db.session is a RoutingSession. Flushes and INSERT/UPDATE/DELETE statements
+always go to the primary, and once a transaction has written, the rest of it
+stays there so it reads its own writes. Other statements may go elsewhere:
+
+- Views and Celery tasks decorated with @read_only read from one of the
+  SQLALCHEMY_REPLICA_URLS, picked per transaction. A recruiter who wrote in
+  the last REPLICA_STICKY_SECONDS reads from the primary instead, so their
+  dashboard never shows data older than their own change. Writes are noted
+  after commit for the recruiter in the request's JWT; routes that change
+  another recruiter's data (public booking and cancellation) call
+  note_recruiter_write() themselves.
+- Without replicas, a SQLite reader engine (app/sqlite_mode.py) serves GET,
+  HEAD and @read_only requests. Every other request may write, so each of its
+  transactions runs on the writer from its first statement, and its reads see
+  the rows under the BEGIN IMMEDIATE lock it is about to write with. Once such
+  a request has committed a write, what follows (reloading objects for the
+  notification emails) goes back to the reader, so the lock isn't held across
+  SMTP or Zoom calls. Celery tasks and CLI commands read from the reader until
+  their transaction first writes: they claim rows with conditional UPDATEs
+  and do their network calls between transactions. The reader is the same
+  file, so it is never stale.
+"""
+import random
+from functools import wraps
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_jwt_extended import get_jwt
+from flask_sqlalchemy.session import Session
+import redis
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+from app.cache import cache_backend
+
+READ_ONLY_METHODS = frozenset(("GET", "HEAD"))
+REPLICA_BIND_PREFIX = "replica_"
+
+
+def read_only(f):
+    """
+    Mark a view or Celery task as read-only so its queries may be served by a
+    replica. Put it below @jwt_required() so the recruiter is known:
+
+        @main.route("/profile")
+        @jwt_required()
+        @read_only
+        def profile(): ...
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def configure_replicas(app):
+    """Add a bind per replica URL. Must run before db.init_app; returns True if there are replicas."""
+    urls = app.config.get("SQLALCHEMY_REPLICA_URLS") or []
+    if not urls:
+        return False
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    for i, url in enumerate(urls):
+        # Binds don't inherit SQLALCHEMY_ENGINE_OPTIONS
+        binds[f"{REPLICA_BIND_PREFIX}{i}"] = {**app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}), "url": url}
+    return True
+
+
+def init_replicas(app, db):
+    with app.app_context():
+        app.extensions["db_replica_engines"] = [
+            db.engines[f"{REPLICA_BIND_PREFIX}{i}"] for i in range(len(app.config["SQLALCHEMY_REPLICA_URLS"]))
+        ]
+    # Shared by all workers with Redis; with "memory://" stickiness only holds within a worker
+    app.extensions["db_write_marks"] = cache_backend(app.config.get("CACHE_REDIS_URL"))
+
+
+def set_reader_engine(app, engine, reads_before_write=False):
+    """reads_before_write lets tasks and commands read from it until they first write."""
+    app.extensions["db_reader_engine"] = engine
+    app.extensions["db_reads_before_write"] = reads_before_write
+
+
+def _write_mark_key(recruiter_id):
+    return f"db_write:{recruiter_id}"
+
+
+def note_recruiter_write(recruiter_id):
+    """Send the recruiter's reads to the primary for REPLICA_STICKY_SECONDS. Call after commit."""
+    marks = current_app.extensions.get("db_write_marks")
+    if marks is None or recruiter_id is None:
+        return
+    try:
+        marks.set(_write_mark_key(recruiter_id), "1", current_app.config.get("REPLICA_STICKY_SECONDS", 10))
+    except redis.RedisError as e:
+        current_app.logger.warning("Could not record write for recruiter %s: %s", recruiter_id, str(e))
+
+
+def _request_recruiter_id():
+    """The recruiter a request acts for: its JWT, else a recruiter_id in the URL."""
+    if not has_request_context():
+        return None
+    try:
+        recruiter_id = get_jwt().get("rid")
+    except RuntimeError:
+        recruiter_id = None
+    if recruiter_id is None and request.view_args:
+        recruiter_id = request.view_args.get("recruiter_id")
+    return recruiter_id
+
+
+def _recently_wrote(recruiter_id):
+    marks = current_app.extensions.get("db_write_marks")
+    if marks is None or recruiter_id is None:
+        return False
+    try:
+        return marks.get(_write_mark_key(recruiter_id)) is not None
+    except redis.RedisError as e:
+        # Can't tell, so don't risk a stale read
+        current_app.logger.warning("Write mark lookup failed: %s", str(e))
+        return True
+
+
+def replica_engine():
+    """A replica for the current context, or None if it must not (or cannot) use one."""
+    replicas = current_app.extensions.get("db_replica_engines")
+    if not replicas or not g.get("db_read_only"):
+        return None
+    if _recently_wrote(_request_recruiter_id()):
+        return None
+    return random.choice(replicas)
+
+
+def reader_engine():
+    """The SQLite reader if reads in the current context may use it, else None."""
+    engine = current_app.extensions.get("db_reader_engine")
+    if engine is None:
+        return None
+    if not has_request_context():
+        return engine if current_app.extensions.get("db_reads_before_write") else None
+    if request.method in READ_ONLY_METHODS or g.get("db_read_only") or g.get("db_committed_write"):
+        return engine
+    return None
+
+
+class RoutingSession(Session):
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self._wrote = False
+        self._read_engine = None
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self._wrote = True
+            elif not self._wrote and has_app_context():
+                # Chosen once per transaction, so its reads all see one replica
+                if self._read_engine is None:
+                    self._read_engine = replica_engine() or reader_engine() or False
+                if self._read_engine:
+                    return self._read_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _note_commit(session):
+    if session._wrote and has_app_context():
+        g.db_committed_write = True
+    if session._wrote and has_request_context() and current_app.extensions.get("db_write_marks") is not None:
+        try:
+            note_recruiter_write(get_jwt().get("rid"))
+        except RuntimeError:
+            pass  # no JWT in this request
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session, transaction):
+    if transaction.parent is None:
+        session._wrote = False
+        session._read_engine = None
@@ -0,0 +1,98 @@
+"""
+Streaming CSV and NDJSON exports of bookings and availability.
+
+export_statement() selects plain columns, never ORM entities, so rows skip
+the identity map. export_chunks() runs it with yield_per, which makes
+SQLAlchemy use a server-side cursor (a named cursor on Postgres; SQLite
+steps its cursor on demand anyway), and turns each batch of
+EXPORT_BATCH_SIZE rows into one piece of text. Memory stays at one batch
+however many years the export covers. The header goes out before the
+statement runs, so the client sees bytes at once.
+
+The statement runs in a single read transaction for the whole download.
+On SQLite that keeps the WAL from being checkpointed until it ends. Workers
+with a request timeout (gunicorn sync) must allow for long downloads.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from sqlalchemy import select
+from app import db
+from app.models import Availability, Booking
+from app.tz_utils import as_utc
+
+# Format (also the file extension) -> mimetype
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+_COLUMNS = {
+    "bookings": (
+        Booking.id, Booking.recruiter_id, Booking.availability_id, Booking.invitation_id,
+        Booking.start_at, Booking.end_at, Booking.candidate_name, Booking.candidate_email,
+        Booking.candidate_position, Booking.meeting_link, Booking.reminder_sent_at,
+    ),
+    "availability": (
+        Availability.id, Availability.recruiter_id, Availability.start_at, Availability.end_at,
+        Availability.booked, Booking.id.label("booking_id"),
+    ),
+}
+
+# Spreadsheets run cells starting with these as formulas; candidates type the names
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def export_statement(kind, recruiter_ids=None, start=None, end=None):
+    """
+    Rows of `kind` ("bookings" or "availability") starting in [start, end),
+    for the given recruiters (all when None), in (recruiter_id, start_at, id)
+    order so each recruiter's rows come off ix_*_recruiter_start_at.
+    """
+    model = Booking if kind == "bookings" else Availability
+    statement = select(*_COLUMNS[kind])
+    if model is Availability:
+        statement = statement.outerjoin(Booking, Booking.availability_id == Availability.id)
+    if recruiter_ids is not None:
+        statement = statement.where(model.recruiter_id.in_(recruiter_ids))
+    if start is not None:
+        statement = statement.where(model.start_at >= start)
+    if end is not None:
+        statement = statement.where(model.start_at < end)
+    return statement.order_by(model.recruiter_id, model.start_at, model.id)
+
+
+def _plain(value):
+    # SQLite hands back naive datetimes; everything is exported as UTC
+    return as_utc(value).isoformat() if isinstance(value, datetime) else value
+
+
+def _csv_cell(value):
+    value = _plain(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_text(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def export_chunks(statement, fmt, batch_size):
+    """Text of the export, a batch of rows at a time. Run inside the app (or request) context."""
+    keys = [column.key for column in statement.selected_columns]
+    if fmt == "csv":
+        yield _csv_text([keys])
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    try:
+        for rows in result.partitions():
+            if fmt == "csv":
+                yield _csv_text(rows)
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(keys, map(_plain, row)))) + "\n" for row in rows
+                )
+    finally:
+        # Also runs when the client goes away mid-download
+        result.close()
@@ -0,0 +1,67 @@
+import bisect
+from app import db
+from app.models import MAX_SLOT_DURATION, Availability
+from app.tz_utils import as_utc
+
+
+class IntervalIndex:
+    """
+    Sorted set of busy [start, end) intervals for one recruiter, in UTC.
+
+    Overlapping or touching intervals are merged as they are added, so both
+    the start and end lists stay strictly increasing. An overlap question is
+    then a single bisect on the starts: the last interval starting before the
+    candidate's end is the only one that can reach past the candidate's start.
+    """
+
+    def __init__(self, intervals=()):
+        self._starts = []
+        self._ends = []
+        for start, end in sorted(intervals):
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def overlaps(self, start, end):
+        i = bisect.bisect_left(self._starts, end)
+        return i > 0 and self._ends[i - 1] > start
+
+    def add(self, start, end):
+        lo = bisect.bisect_left(self._starts, start)
+        if lo > 0 and self._ends[lo - 1] >= start:
+            lo -= 1
+        hi = bisect.bisect_right(self._starts, end)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def claim(self, start, end):
+        """Add the interval unless it overlaps; returns True if it was added."""
+        if self.overlaps(start, end):
+            return False
+        self.add(start, end)
+        return True
+
+
+def load_recruiter_intervals(recruiter_id, range_start, range_end, exclude_slot_id=None):
+    """
+    Build an IntervalIndex of the recruiter's slots that touch [range_start, range_end),
+    loaded with one range query on (recruiter_id, start_at). No slot is longer
+    than MAX_SLOT_DURATION, so none starting earlier can reach the range.
+    """
+    query = db.session.query(Availability.start_at, Availability.end_at).filter(
+        Availability.recruiter_id == recruiter_id,
+        Availability.start_at > range_start - MAX_SLOT_DURATION,
+        Availability.start_at < range_end,
+        Availability.end_at > range_start
+    )
+    if exclude_slot_id is not None:
+        query = query.filter(Availability.id != exclude_slot_id)
+    return IntervalIndex((as_utc(start), as_utc(end)) for start, end in query)
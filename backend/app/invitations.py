@@ -0,0 +1,70 @@
+import csv
+import io
+from flask import current_app
+
+
+def booking_link(recruiter_id, token, pool_id=None):
+    if pool_id is not None:
+        return f"{current_app.config.get('FRONTEND_URL')}/book-pool/{pool_id}/{token}"
+    return f"{current_app.config.get('FRONTEND_URL')}/book-slot/{recruiter_id}/{token}"
+
+def invitation_email_body(candidate_name, recruiter_id, token, expiration, pool_id=None):
+    expiration_str = expiration.strftime("%Y-%m-%d %H:%M UTC")
+    return (
+        f"Hello {candidate_name},\n\n"
+        "You have been invited to book an interview slot. Please use the following link to schedule your interview:\n\n"
+        f"{booking_link(recruiter_id, token, pool_id)}\n\n"
+        "For your reference, your invitation token is: " + token + "\n"
+        f"This token (and the link) will expire on {expiration_str}.\n\n"
+        "Best regards,\nYour Recruitment Team"
+    )
+
+
+def _candidate_rows_from_csv(text):
+    reader = csv.DictReader(io.StringIO(text))
+    for row in reader:
+        row = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+        yield {
+            "candidate_name": row.get("candidate_name") or row.get("name"),
+            "candidate_email": row.get("candidate_email") or row.get("email"),
+        }
+
+def read_candidates(req):
+    """
+    Candidates for a bulk invitation from the request: a JSON body with a
+    "candidates" list, an uploaded CSV file ("file"), or a raw text/csv body.
+    CSV needs a header row with candidate_name/candidate_email (or name/email).
+    Returns (candidates, fields), fields being where the campaign's other
+    settings (name, pool_id) come from: the JSON body, the form or the query.
+    """
+    if req.files.get("file"):
+        text = req.files["file"].read().decode("utf-8-sig")
+        return list(_candidate_rows_from_csv(text)), req.form
+    if req.mimetype == "text/csv":
+        return list(_candidate_rows_from_csv(req.get_data(as_text=True))), req.args
+    data = req.get_json(silent=True) or {}
+    candidates = data.get("candidates")
+    return (candidates if isinstance(candidates, list) else []), data
+
+def validate_candidates(candidates):
+    """
+    Split candidates into valid rows and per-row errors. Emails are compared
+    case-insensitively and only the first occurrence of an address is kept.
+    """
+    valid, errors, seen = [], [], set()
+    for i, candidate in enumerate(candidates):
+        if not isinstance(candidate, dict):
+            errors.append({"row": i, "error": "Expected an object with candidate_name and candidate_email"})
+            continue
+        name = (candidate.get("candidate_name") or "").strip()
+        email = (candidate.get("candidate_email") or "").strip()
+        if not name or not email:
+            errors.append({"row": i, "error": "Candidate name and email are required"})
+        elif "@" not in email or len(email) > 100 or len(name) > 100:
+            errors.append({"row": i, "error": f"Invalid candidate: {email}"})
+        elif email.lower() in seen:
+            errors.append({"row": i, "error": f"Duplicate email: {email}"})
+        else:
+            seen.add(email.lower())
+            valid.append({"candidate_name": name, "candidate_email": email})
+    return valid, errors
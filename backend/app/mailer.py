@@ -0,0 +1,37 @@
+import smtplib
+from flask import current_app
+from flask_mail import Connection, Mail
+
+
+class _TimeoutConnection(Connection):
+    """Flask-Mail's connection, with a socket timeout on the SMTP session."""
+
+    def __init__(self, state, timeout):
+        super().__init__(state)
+        self.timeout = timeout
+
+    def configure_host(self):
+        smtp_class = smtplib.SMTP_SSL if self.mail.use_ssl else smtplib.SMTP
+        host = smtp_class(self.mail.server, self.mail.port, timeout=self.timeout)
+        host.set_debuglevel(int(self.mail.debug))
+        if self.mail.use_tls:
+            host.starttls()
+        if self.mail.username and self.mail.password:
+            host.login(self.mail.username, self.mail.password)
+        return host
+
+
+class Mailer(Mail):
+    """
+    Flask-Mail with MAIL_TIMEOUT applied to connecting and to every SMTP
+    command. Flask-Mail itself never times out, so a stuck mail server would
+    hold the request's worker (or thread) until the server gave up.
+    """
+
+    def connect(self):
+        app = getattr(self, "app", None) or current_app
+        try:
+            state = app.extensions["mail"]
+        except KeyError:
+            raise RuntimeError("The current application was not configured with Flask-Mail")
+        return _TimeoutConnection(state, app.config.get("MAIL_TIMEOUT", 10))
@@ -0,0 +1,148 @@
+"""
+Prometheus instrumentation, served in text format on /metrics.
+
+Every request is timed into a histogram labelled with its endpoint, and the
+SQL statements it runs are counted and timed through SQLAlchemy cursor events.
+Outbound SMTP, Zoom and Google Calendar calls are wrapped in
+timed_outbound(). Under gunicorn each worker is its own process; with
+PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py sets it) every worker writes
+its samples to files in that directory and /metrics merges them, so a scrape
+sees the whole server whichever worker answers it. The scraper authenticates
+with METRICS_AUTH_TOKEN; without one /metrics is only served when
+METRICS_PUBLIC is set (development, or a port only the scraper can reach).
+"""
+import hmac
+import os
+import time
+from contextlib import contextmanager
+from flask import Response, current_app, g, has_request_context, jsonify, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by endpoint",
+    ["endpoint", "method"], buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter("http_requests", "Requests by endpoint and status", ["endpoint", "method", "status"])
+REQUEST_SQL_QUERIES = Histogram(
+    "http_request_sql_queries", "SQL statements executed per request",
+    ["endpoint"], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_duration_seconds", "Time spent executing SQL per request",
+    ["endpoint"], buckets=LATENCY_BUCKETS
+)
+OUTBOUND_LATENCY = Histogram(
+    "outbound_request_duration_seconds", "Latency of calls to SMTP, Zoom and Google",
+    ["service", "operation", "outcome"], buckets=LATENCY_BUCKETS
+)
+
+
+@contextmanager
+def timed_outbound(service, operation):
+    """
+    Time a call to an external service. The outcome label is "ok" unless the
+    block raises; code that gets an HTTP status back can set outcome itself:
+
+        with timed_outbound("zoom", "create_meeting") as call:
+            response = session.post(...)
+            call["outcome"] = str(response.status_code)
+    """
+    call = {"outcome": "ok"}
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call["outcome"] = "error"
+        raise
+    finally:
+        OUTBOUND_LATENCY.labels(service, operation, call["outcome"]).observe(time.perf_counter() - started)
+
+
+def _endpoint_label():
+    # Unmatched URLs (404s, scanners) share one label to keep cardinality bounded
+    return request.endpoint or "unmatched"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "sql_stats" in g:
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "sql_stats" in g:
+        started = conn.info.get("metrics_query_started")
+        stats = g.sql_stats
+        stats["queries"] += 1
+        if started:
+            stats["seconds"] += time.perf_counter() - started.pop()
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("metrics_query_started"):
+        connection.info["metrics_query_started"].pop()
+
+
+def _listen_for_sql():
+    # Registered on the Engine class so every engine (binds, replicas) is covered
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.sql_stats = {"queries": 0, "seconds": 0.0}
+
+
+def _finish_request(response):
+    started = g.pop("request_started", None)
+    stats = g.pop("sql_stats", None)
+    if started is None or request.endpoint == "metrics":
+        return response
+    endpoint = _endpoint_label()
+    REQUEST_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - started)
+    REQUESTS.labels(endpoint, request.method, str(response.status_code)).inc()
+    REQUEST_SQL_QUERIES.labels(endpoint).observe(stats["queries"])
+    REQUEST_SQL_SECONDS.labels(endpoint).observe(stats["seconds"])
+    return response
+
+
+def metrics_view():
+    token = current_app.config.get("METRICS_AUTH_TOKEN")
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return jsonify({"error": "Unauthorized"}), 401
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+class Metrics:
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get("METRICS_ENABLED", True):
+            return
+        _listen_for_sql()
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+        # Metrics reveal endpoints and traffic; serving them without a token is opt-in
+        if app.config.get("METRICS_AUTH_TOKEN") or app.config.get("METRICS_PUBLIC"):
+            app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
+        else:
+            app.logger.warning("/metrics is off: set METRICS_AUTH_TOKEN, or METRICS_PUBLIC=True to serve it without one")
+        app.extensions["metrics"] = self
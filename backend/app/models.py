@@ -1,4 +1,5 @@
 from app import db
+from app.tz_utils import UTC
 from datetime import datetime, timedelta
 
 class Recruiter(db.Model):
@@ -6,30 +7,69 @@ class Recruiter(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(200), nullable=False)
-    reset_token = db.Column(db.String(120), nullable=True)
-    otp = db.Column(db.String(6), nullable=True)
-    otp_expiration = db.Column(db.DateTime, nullable=True)
     timezone = db.Column(db.String(50), nullable=True)
     zoom_access_token = db.Column(db.String(500), nullable=True)
     zoom_refresh_token = db.Column(db.String(500), nullable=True)
+    # When zoom_access_token lapses; the beat job refreshes tokens ahead of it
+    zoom_token_expires_at = db.Column(db.DateTime(timezone=True), nullable=True)
 
     availabilities = db.relationship('Availability', backref='recruiter', lazy=True)
     bookings = db.relationship('Booking', backref='recruiter', lazy=True)
     invitations = db.relationship('Invitation', backref='recruiter', lazy=True)
 
 
-class Availability(db.Model):
+# Slots are entered as start and end times on one local date, so none is
+# longer than a day plus a DST shift; overlap queries rely on this bound.
+MAX_SLOT_DURATION = timedelta(hours=26)
+
+
+class UTCIntervalMixin:
+    """
+    Slots and bookings keep their UTC instants in start_at/end_at. The legacy
+    date/start_time/end_time columns are still written for older clients.
+    """
+
+    @staticmethod
+    def interval_columns(start_at, end_at):
+        """Column values for an interval, for bulk inserts that bypass the ORM objects."""
+        start_at = start_at.astimezone(UTC)
+        end_at = end_at.astimezone(UTC)
+        if end_at - start_at > MAX_SLOT_DURATION:
+            raise ValueError(f"Interval {start_at} - {end_at} is longer than MAX_SLOT_DURATION")
+        return {
+            "start_at": start_at,
+            "end_at": end_at,
+            "date": start_at.date(),
+            "start_time": start_at.time().replace(tzinfo=None),
+            "end_time": end_at.time().replace(tzinfo=None),
+        }
+
+    def set_interval(self, start_at, end_at):
+        for column, value in self.interval_columns(start_at, end_at).items():
+            setattr(self, column, value)
+
+
+class Availability(UTCIntervalMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     recruiter_id = db.Column(db.Integer, db.ForeignKey('recruiter.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
     start_time = db.Column(db.Time, nullable=False)
     end_time = db.Column(db.Time, nullable=False)
     booked = db.Column(db.Boolean, default=False)
+    start_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    end_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    # Id of the slot's Google Calendar event (assigned before the event is pushed)
+    google_event_id = db.Column(db.String(255), nullable=True)
     
     booking = db.relationship('Booking', backref='availability', uselist=False)
 
+    __table_args__ = (
+        db.Index('ix_availability_recruiter_start_at', 'recruiter_id', 'start_at'),
+        db.Index('ix_availability_recruiter_booked_start_at', 'recruiter_id', 'booked', 'start_at'),
+    )
+
 
-class Booking(db.Model):
+class Booking(UTCIntervalMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     candidate_name = db.Column(db.String(100), nullable=False)
     candidate_email = db.Column(db.String(100), nullable=False)
@@ -39,7 +79,60 @@ class Booking(db.Model):
     date = db.Column(db.Date, nullable=False)
     start_time = db.Column(db.Time, nullable=False)
     end_time = db.Column(db.Time, nullable=False)
+    start_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    end_at = db.Column(db.DateTime(timezone=True), nullable=False)
     meeting_link = db.Column(db.String(200), nullable=True)
+    # Id of the ETA task that will send the reminder, so it can be revoked/rescheduled
+    reminder_task_id = db.Column(db.String(155), nullable=True)
+    # Set once the reminder has gone out; makes sending idempotent
+    reminder_sent_at = db.Column(db.DateTime, nullable=True)
+    # The invitation this booking was made with; cancellation looks it up by token
+    invitation_id = db.Column(db.Integer, db.ForeignKey('invitation.id'), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_booking_recruiter_start_at', 'recruiter_id', 'start_at'),
+        db.Index('ix_booking_reminder_due', 'reminder_sent_at', 'start_at'),
+        db.Index('ix_booking_invitation_id', 'invitation_id'),
+        db.Index('ix_booking_availability_id', 'availability_id'),
+        db.Index('ix_booking_candidate_email', 'candidate_email', 'recruiter_id'),
+    )
+
+
+class RecruiterDailyStats(db.Model):
+    """
+    Per-recruiter, per-day (UTC) counters kept up to date by the endpoints that
+    create, book and cancel slots, so analytics never scan Booking. Cancelled
+    bookings are deleted, so these are also the only record of past volume.
+    Each recruiter's row on app.stats.TOTALS_DAY holds their running totals.
+    """
+    __tablename__ = 'recruiter_daily_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recruiter_id = db.Column(db.Integer, db.ForeignKey('recruiter.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    slots_offered = db.Column(db.Integer, nullable=False, default=0)
+    slots_booked = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_by_candidate = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_by_recruiter = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('recruiter_id', 'day', name='uq_recruiter_daily_stats_day'),
+    )
+
+
+class InvitationCampaign(db.Model):
+    """A bulk invitation send; its invitations are emailed by a background task."""
+    __tablename__ = 'invitation_campaign'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recruiter_id = db.Column(db.Integer, db.ForeignKey('recruiter.id'), nullable=False)
+    name = db.Column(db.String(200), nullable=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, sending, completed
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    invitations = db.relationship('Invitation', backref='campaign', lazy=True)
 
 
 class Invitation(db.Model):
@@ -49,3 +142,47 @@ class Invitation(db.Model):
     used = db.Column(db.Boolean, default=False)
     cancel_count = db.Column(db.Integer, default=0)
     expiration = db.Column(db.DateTime, nullable=False, default=lambda: datetime.utcnow() + timedelta(hours=48))
+    candidate_name = db.Column(db.String(100), nullable=True)
+    candidate_email = db.Column(db.String(100), nullable=True)
+    # Set for campaign invitations: pending, sending, sent or failed
+    campaign_id = db.Column(db.Integer, db.ForeignKey('invitation_campaign.id'), nullable=True)
+    delivery_status = db.Column(db.String(20), nullable=True)
+    delivery_error = db.Column(db.String(255), nullable=True)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    # Set for pool invitations: the candidate books a time in the pool and the
+    # booking goes to one of its recruiters (recruiter_id is who invited them)
+    pool_id = db.Column(db.Integer, db.ForeignKey('interview_pool.id'), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_invitation_campaign_status', 'campaign_id', 'delivery_status'),
+    )
+
+
+class InterviewPool(db.Model):
+    """Recruiters sharing interviews: candidates book a time, not a recruiter."""
+    __tablename__ = 'interview_pool'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey('recruiter.id'), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    members = db.relationship('InterviewPoolMember', backref='pool', lazy=True, cascade='all, delete-orphan')
+
+
+class InterviewPoolMember(db.Model):
+    __tablename__ = 'interview_pool_member'
+
+    id = db.Column(db.Integer, primary_key=True)
+    pool_id = db.Column(db.Integer, db.ForeignKey('interview_pool.id'), nullable=False)
+    recruiter_id = db.Column(db.Integer, db.ForeignKey('recruiter.id'), nullable=False)
+    # Last pool booking given to this member; breaks load ties round-robin
+    last_assigned_at = db.Column(db.DateTime, nullable=True)
+    # When the recruiter accepted the owner's invitation (the owner on creation).
+    # Until then the pool neither shows their slots nor assigns them bookings.
+    accepted_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint('pool_id', 'recruiter_id', name='uq_interview_pool_member'),
+        db.Index('ix_interview_pool_member_recruiter_id', 'recruiter_id'),
+    )
@@ -0,0 +1,160 @@
+import threading
+import time
+from flask import current_app
+import redis
+
+
+class OTPStoreUnavailable(Exception):
+    """The OTP store backend could not be reached."""
+
+
+class MemoryOTPStore:
+    """
+    In-process stand-in for tests and single-process development. Codes stored
+    here are invisible to other gunicorn workers, so don't use it behind -w > 1.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _live(self, key):
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._values[key]
+            return None
+        return entry
+
+    def put(self, key, value, ttl):
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[1] if entry else None
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            del self._values[key]
+            return entry[1]
+
+    def incr(self, key, ttl):
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                count, expires = 1, time.monotonic() + ttl
+            else:
+                count, expires = int(entry[1]) + 1, entry[0]
+            self._values[key] = (expires, str(count))
+            return count
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+
+class RedisOTPStore:
+    """
+    Redis-backed store; expiry is native (SET EX). Pop and incr run as MULTI
+    transactions of plain commands (GET+DEL, SET NX EX+INCR) rather than
+    GETDEL (Redis 6.2) and EXPIRE NX (Redis 7), so any Redis >= 2.6.12 works.
+    """
+
+    def __init__(self, url):
+        self._client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1, decode_responses=True)
+
+    def _call(self, fn, *args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except redis.RedisError as e:
+            raise OTPStoreUnavailable(str(e)) from e
+
+    def put(self, key, value, ttl):
+        self._call(self._client.set, key, value, ex=ttl)
+
+    def get(self, key):
+        return self._call(self._client.get, key)
+
+    def _pop(self, key):
+        with self._client.pipeline() as pipe:
+            pipe.get(key)
+            pipe.delete(key)
+            value, _ = pipe.execute()
+        return value
+
+    def pop(self, key):
+        return self._call(self._pop, key)
+
+    def _incr(self, key, ttl):
+        # The window starts with the first attempt: only a new counter gets the TTL
+        with self._client.pipeline() as pipe:
+            pipe.set(key, 0, ex=ttl, nx=True)
+            pipe.incr(key)
+            _, count = pipe.execute()
+        return count
+
+    def incr(self, key, ttl):
+        return self._call(self._incr, key, ttl)
+
+    def delete(self, *keys):
+        self._call(self._client.delete, *keys)
+
+
+class OTPStore:
+    """
+    Short-lived secrets (login OTPs, password reset tokens) and their attempt
+    counters, kept out of the recruiter table. Backed by Redis at
+    OTP_STORE_URL, or by MemoryOTPStore when that is "memory://".
+    """
+
+    key_prefix = "otp"
+
+    def __init__(self, app=None):
+        self._backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        url = app.config.get("OTP_STORE_URL") or "memory://"
+        if url.startswith("memory://"):
+            self._backend = MemoryOTPStore()
+        else:
+            self._backend = RedisOTPStore(url)
+        app.extensions["otp_store"] = self
+
+    def _key(self, kind, subject):
+        return f"{self.key_prefix}:{kind}:{subject}"
+
+    def _attempts_key(self, kind, subject):
+        return f"{self.key_prefix}:{kind}:{subject}:attempts"
+
+    def issue(self, kind, subject, value, ttl):
+        """Store value for subject (replacing any previous one) and reset its attempt counter."""
+        self._backend.delete(self._attempts_key(kind, subject))
+        self._backend.put(self._key(kind, subject), value, ttl)
+
+    def peek(self, kind, subject):
+        return self._backend.get(self._key(kind, subject))
+
+    def consume(self, kind, subject):
+        """Atomically fetch and delete; only one caller can ever get the value."""
+        value = self._backend.pop(self._key(kind, subject))
+        if value is not None:
+            self._backend.delete(self._attempts_key(kind, subject))
+        return value
+
+    def record_attempt(self, kind, subject):
+        """Count a verification attempt; returns the count within the current window."""
+        ttl = current_app.config.get("OTP_TTL_SECONDS", 300)
+        return self._backend.incr(self._attempts_key(kind, subject), ttl)
+
+    def revoke(self, kind, subject):
+        self._backend.delete(self._key(kind, subject), self._attempts_key(kind, subject))
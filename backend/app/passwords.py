@@ -0,0 +1,72 @@
+import threading
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    """All hashing slots stayed busy for PASSWORD_HASH_QUEUE_TIMEOUT seconds."""
+
+
+def _stored_method(method):
+    """The method werkzeug writes into hashes made with `method`, e.g. "pbkdf2:sha256" -> "pbkdf2:sha256:260000"."""
+    if not method.startswith("pbkdf2:"):
+        return method
+    args = method[7:].split(":")
+    name = args.pop(0)
+    iterations = int(args[0] or 0) if args else DEFAULT_PBKDF2_ITERATIONS
+    return f"pbkdf2:{name}:{iterations}"
+
+
+class PasswordHasher:
+    """
+    Bounds pbkdf2 hashing/verification per process.
+
+    hashlib's pbkdf2 releases the GIL, so hashes run in the request threads
+    themselves and use other cores while the rest of the worker carries on.
+    At most PASSWORD_HASH_WORKERS hashes run and PASSWORD_HASH_QUEUE wait per
+    process. A login burst beyond that gets HashingBusy (a fast 503) instead
+    of every thread sitting on CPU-bound hashing while cheap reads queue up.
+    The limits only matter with several threads per process (the gthread
+    workers in gunicorn.conf.py); a sync worker never hashes twice at once.
+    """
+
+    def __init__(self, app=None):
+        self.method = "pbkdf2:sha256:260000"
+        self.salt_length = 16
+        self.queue_timeout = 2.0
+        self._running = None
+        self._slots = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", self.method)
+        self.salt_length = app.config.get("PASSWORD_SALT_LENGTH", self.salt_length)
+        self.queue_timeout = app.config.get("PASSWORD_HASH_QUEUE_TIMEOUT", self.queue_timeout)
+        workers = app.config.get("PASSWORD_HASH_WORKERS", 2)
+        queue = app.config.get("PASSWORD_HASH_QUEUE", 8)
+        self._running = threading.BoundedSemaphore(workers)
+        self._slots = threading.BoundedSemaphore(workers + queue)
+        app.extensions["password_hasher"] = self
+
+    def _run(self, fn, *args, **kwargs):
+        if self._slots is None:
+            return fn(*args, **kwargs)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingBusy()
+        try:
+            with self._running:
+                return fn(*args, **kwargs)
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, method=self.method, salt_length=self.salt_length)
+
+    def verify(self, stored_hash, password):
+        return self._run(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        """True if the stored hash was made with a different method, iteration count or salt length than configured."""
+        method, _, rest = stored_hash.partition("$")
+        salt = rest.partition("$")[0]
+        return method != _stored_method(self.method) or len(salt) != self.salt_length
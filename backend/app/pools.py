@@ -0,0 +1,153 @@
+"""
+Interview pools: one time-ordered stream of the open slots of all members,
+and least-loaded assignment of pool bookings.
+
+The stream is a k-way merge (heapq.merge) over one cursor per recruiter. A
+cursor reads its recruiter's open future slots in start order through
+ix_availability_recruiter_booked_start_at, a page at a time, continuing from
+the last (start_at, id) it returned. The pages of all members are read with
+one UNION ALL of per-recruiter LIMIT queries, so a pool of hundreds of
+recruiters costs a couple of statements and a few rows per member, however
+many slots each of them has published.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from itertools import groupby
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, union_all
+from app import db
+from app.models import Availability, Booking, InterviewPoolMember
+from app.tz_utils import as_utc, utc_now
+
+# SQLite allows at most 500 SELECTs in one compound statement
+UNION_CHUNK = 200
+
+_SLOT_COLUMNS = (Availability.id, Availability.recruiter_id, Availability.start_at, Availability.end_at)
+
+
+def pool_member_ids(pool_id):
+    """Members who accepted their invitation; pending ones take no part in the pool."""
+    return [row.recruiter_id for row in db.session.query(InterviewPoolMember.recruiter_id).filter(
+        InterviewPoolMember.pool_id == pool_id, InterviewPoolMember.accepted_at.isnot(None)
+    )]
+
+
+def _open_slots(recruiter_id, after, limit):
+    """Open slots of one recruiter after `after` (a start_at, or a (start_at, id) keyset position)."""
+    if isinstance(after, tuple):
+        start_at, slot_id = after
+        position = or_(Availability.start_at > start_at, and_(Availability.start_at == start_at, Availability.id > slot_id))
+    else:
+        position = Availability.start_at > after
+    return (
+        select(*_SLOT_COLUMNS)
+        .where(Availability.recruiter_id == recruiter_id, Availability.booked == False, position)
+        .order_by(Availability.start_at, Availability.id)
+        .limit(limit)
+    )
+
+
+def _pages(positions, size):
+    """The next `size` open slots of each recruiter in positions ({recruiter_id: after})."""
+    pages = defaultdict(list)
+    recruiter_ids = list(positions)
+    for offset in range(0, len(recruiter_ids), UNION_CHUNK):
+        # Each arm keeps its own ORDER BY/LIMIT, so it is wrapped in a subquery
+        arms = [select(_open_slots(recruiter_id, positions[recruiter_id], size).subquery())
+                for recruiter_id in recruiter_ids[offset:offset + UNION_CHUNK]]
+        statement = union_all(*arms) if len(arms) > 1 else arms[0]
+        for row in db.session.execute(statement):
+            pages[row.recruiter_id].append(row)
+    for rows in pages.values():
+        rows.sort(key=_merge_key)
+    return pages
+
+
+def _merge_key(row):
+    # SQLite hands back naive datetimes
+    return as_utc(row.start_at), row.id
+
+
+def _times(rows, limit):
+    times = []
+    for start_at, group in groupby(rows, key=lambda row: as_utc(row.start_at)):
+        ends = Counter(as_utc(row.end_at) for row in group)
+        times.extend(
+            {"start_at": start_at, "end_at": end_at, "recruiters_available": ends[end_at]}
+            for end_at in sorted(ends)
+        )
+        if len(times) >= limit:
+            break
+    return times[:limit]
+
+
+def earliest_pool_slots(recruiter_ids, limit, now=None):
+    """
+    The earliest `limit` open times across the recruiters, as dicts with
+    start_at, end_at (UTC) and recruiters_available. Slots of different
+    recruiters with the same start and end are one time.
+
+    Works in rounds of one statement each. A cursor whose page came back full
+    may have more rows; it is read again only if its last row starts before
+    the limit-th time found so far, since anything after that can't be in the
+    answer. A recruiter's slots don't overlap, so a page of `limit` rows
+    reaches past that time: two rounds are enough.
+    """
+    if not recruiter_ids or limit <= 0:
+        return []
+    # Spread evenly, each member holds about limit/len of the answer
+    size = min(limit, math.ceil(limit / len(recruiter_ids)) + 1)
+    positions = dict.fromkeys(recruiter_ids, now or utc_now())
+    merged, times = [], []
+    while positions:
+        pages = _pages(positions, size)
+        merged = list(heapq.merge(merged, *pages.values(), key=_merge_key))
+        times = _times(merged, limit)
+        cutoff = times[-1]["start_at"] if len(times) == limit else None
+        if cutoff is not None:
+            merged = [row for row in merged if as_utc(row.start_at) <= cutoff]
+        positions = {
+            recruiter_id: (rows[-1].start_at, rows[-1].id)
+            for recruiter_id, rows in pages.items()
+            if len(rows) == size and (cutoff is None or as_utc(rows[-1].start_at) < cutoff)
+        }
+        size = limit
+    return times
+
+
+def assignment_candidates(pool_id, start_at, end_at):
+    """
+    Open slots of the pool's accepted members at exactly this time, as (slot_id,
+    recruiter_id), in assignment order: fewest bookings in the
+    POOL_LOAD_WINDOW_DAYS around the slot first, then the member who was
+    assigned a pool booking longest ago (round robin among equals).
+    """
+    rows = db.session.query(
+        Availability.id, Availability.recruiter_id, InterviewPoolMember.last_assigned_at
+    ).join(
+        InterviewPoolMember, InterviewPoolMember.recruiter_id == Availability.recruiter_id
+    ).filter(
+        InterviewPoolMember.pool_id == pool_id,
+        InterviewPoolMember.accepted_at.isnot(None),
+        Availability.booked == False,
+        Availability.start_at == start_at,
+        Availability.end_at == end_at
+    ).all()
+    if not rows:
+        return []
+
+    half_window = timedelta(days=current_app.config.get("POOL_LOAD_WINDOW_DAYS", 7)) / 2
+    loads = dict(
+        db.session.query(Booking.recruiter_id, func.count())
+        .filter(
+            Booking.recruiter_id.in_({row.recruiter_id for row in rows}),
+            Booking.start_at >= start_at - half_window,
+            Booking.start_at < start_at + half_window
+        )
+        .group_by(Booking.recruiter_id)
+        .all()
+    )
+    rows.sort(key=lambda row: (loads.get(row.recruiter_id, 0), row.last_assigned_at or datetime.min, row.recruiter_id))
+    return [(row.id, row.recruiter_id) for row in rows]
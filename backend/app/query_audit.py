@@ -0,0 +1,225 @@
+"""
+N+1 query detection for development and tests.
+
+With QUERY_AUDIT set, every SQL statement a request or Celery task runs is
+recorded and grouped by its normalized text (literals replaced by ?, IN and
+VALUES lists collapsed). When one statement repeats more than
+QUERY_AUDIT_REPEAT_THRESHOLD times the request or task is reported: a warning
+with QUERY_AUDIT=warn, RepeatedQueryError with QUERY_AUDIT=raise.
+QUERY_AUDIT=record only collects, for the pytest fixtures in app/testing.py.
+
+Batched statements (executemany, insertmanyvalues) are counted but never
+treated as repeats. Transaction control (BEGIN, COMMIT, PRAGMA, ...) is not
+counted: SQLite mode sends its BEGIN as a statement, other setups don't. A
+task run inside a request (eager Celery) is audited as its own scope, and its
+statements don't count against the request. Off by default; every statement
+pays for a regex and a stack walk while it is on.
+"""
+import os
+import re
+import sys
+import warnings
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+AUDIT_MODES = ("record", "warn", "raise")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_active_logs = ContextVar("query_audit_logs", default=())
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*\([^()]*\)(?:\s*,\s*\([^()]*\))*", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_TRANSACTION_CONTROL = frozenset(("BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA"))
+
+
+class RepeatedQueryError(Exception):
+    """A request or task ran the same statement more often than allowed."""
+
+
+class RepeatedQueryWarning(UserWarning):
+    pass
+
+
+def normalize_sql(statement):
+    """Statement text with literals and parameter lists collapsed, for grouping."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _VALUES_LIST.sub("VALUES (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _caller():
+    """file:line of the innermost application frame that issued the statement."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(BACKEND_DIR) and filename != __file__
+                and "site-packages" not in filename and os.sep + "venv" + os.sep not in filename):
+            return f"{os.path.relpath(filename, BACKEND_DIR)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+class QueryLog:
+    """Statements recorded in one scope (a request, a task, a test block)."""
+
+    def __init__(self, label, unit=False):
+        self.label = label
+        # One request or task; enclosing units don't count its statements as theirs
+        self.unit = unit
+        self.total = 0
+        self.batched = 0
+        # Run by request or task scopes opened inside this one
+        self.nested = 0
+        self.statements = Counter()
+        self.callers = {}
+        self.children = []
+
+    def record(self, sql, caller, batched):
+        self.total += 1
+        if batched:
+            self.batched += 1
+            return
+        self.statements[sql] += 1
+        self.callers.setdefault(sql, caller)
+
+    def record_nested(self):
+        self.total += 1
+        self.nested += 1
+
+    @property
+    def own(self):
+        """Statements this scope ran itself, less batched rounds."""
+        return self.total - self.batched - self.nested
+
+    def repeated(self, threshold):
+        """[(sql, count, caller)] for statements run more than threshold times."""
+        return [
+            (sql, count, self.callers.get(sql))
+            for sql, count in self.statements.most_common()
+            if count > threshold
+        ]
+
+    def report(self, threshold):
+        lines = [f"{self.label}: {self.total} statements ({self.batched} batched, {self.nested} nested)"]
+        for sql, count, caller in self.repeated(threshold):
+            lines.append(f"  {count}x at {caller or '?'}: {sql[:300]}")
+        return "\n".join(lines)
+
+
+def is_transaction_control(statement):
+    words = statement.split(None, 1)
+    return bool(words) and words[0].upper() in _TRANSACTION_CONTROL
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    logs = _active_logs.get()
+    if not logs or is_transaction_control(statement):
+        return
+    sql, caller = normalize_sql(statement), _caller()
+    # Scopes enclosing the innermost request or task only count its statements
+    unit = max((i for i, log in enumerate(logs) if log.unit), default=0)
+    for i, log in enumerate(logs):
+        if i < unit and log.unit:
+            log.record_nested()
+        else:
+            log.record(sql, caller, executemany)
+
+
+@contextmanager
+def record_queries(label="queries", unit=False):
+    """
+    Record the statements run inside the block into a QueryLog, whether or not
+    QUERY_AUDIT is on. Request and task logs finished inside the block are
+    added to its children. A unit scope (one request or task) leaves the
+    statements of unit scopes opened inside it to them.
+    """
+    _listen_for_sql()
+    log = QueryLog(label, unit)
+    token = _active_logs.set(_active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+        for parent in _active_logs.get():
+            parent.children.append(log)
+
+
+def check_repeats(log, threshold, mode):
+    """Warn or raise (per mode) if any statement in log repeated more than threshold times."""
+    if mode not in ("warn", "raise") or not log.repeated(threshold):
+        return
+    message = "Repeated queries (possible N+1) in " + log.report(threshold)
+    if mode == "raise":
+        raise RepeatedQueryError(message)
+    current_app.logger.warning(message)
+    warnings.warn(message, RepeatedQueryWarning, stacklevel=2)
+
+
+def _listen_for_sql():
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _start_request():
+    g.query_audit = record_queries(request.endpoint or "unmatched", unit=True)
+    g.query_audit_log = g.query_audit.__enter__()
+
+
+def _finish_request(response):
+    scope = g.pop("query_audit", None)
+    if scope is None:
+        return response
+    scope.__exit__(None, None, None)
+    log = g.pop("query_audit_log")
+    check_repeats(log, current_app.config["QUERY_AUDIT_REPEAT_THRESHOLD"], current_app.config["QUERY_AUDIT"])
+    return response
+
+
+def _abandon_request(exception):
+    # after_request did not run (unhandled error); just close the scope
+    scope = g.pop("query_audit", None)
+    if scope is not None:
+        scope.__exit__(None, None, None)
+
+
+class QueryAudit:
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        mode = (app.config.get("QUERY_AUDIT") or "").lower()
+        if not mode:
+            return
+        if mode not in AUDIT_MODES:
+            raise ValueError(f"QUERY_AUDIT must be one of {', '.join(AUDIT_MODES)}, not {mode!r}")
+        app.config["QUERY_AUDIT"] = mode
+        app.config.setdefault("QUERY_AUDIT_REPEAT_THRESHOLD", 5)
+        _listen_for_sql()
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+        app.teardown_request(_abandon_request)
+        app.extensions["query_audit"] = self
+
+    def task_scope(self, task_name):
+        """Context manager auditing one Celery task run; a no-op when QUERY_AUDIT is off."""
+        if "query_audit" not in current_app.extensions:
+            return nullcontext()
+        return self._audit_task(task_name)
+
+    @contextmanager
+    def _audit_task(self, task_name):
+        with record_queries(f"task {task_name}", unit=True) as log:
+            yield log
+        check_repeats(log, current_app.config["QUERY_AUDIT_REPEAT_THRESHOLD"], current_app.config["QUERY_AUDIT"])
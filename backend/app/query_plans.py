@@ -0,0 +1,174 @@
+"""
+EXPLAIN-based check that the hot endpoint queries are served by indexes.
+
+Each entry in _hot_queries() mirrors a query an endpoint or task runs on every
+call. check_query_plans() compiles them against the configured database,
+runs EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (FORMAT JSON) (Postgres) and
+reports any full scan of one of the large tables. Exposed as
+`flask check-query-plans`; run it after `flask db upgrade` against SQLite and
+a local Postgres to catch a dropped or unusable index before it ships;
+tests/test_query_plans.py does the same on a schema built from the models.
+"""
+import json
+from datetime import date, timedelta
+from sqlalchemy import func, select
+from app import db
+from app.exports import export_statement
+from app.models import MAX_SLOT_DURATION, Availability, Booking, InterviewPoolMember, Invitation, Recruiter, RecruiterDailyStats
+from app.tz_utils import utc_now
+
+# Tables that grow with usage; a sequential scan of any of them is a regression
+LARGE_TABLES = {
+    "availability", "booking", "invitation", "recruiter", "recruiter_daily_stats", "interview_pool_member"
+}
+
+
+def _hot_queries():
+    now = utc_now()
+    week = now + timedelta(days=7)
+    today = date.today()
+    return [
+        ("login / verify-otp: recruiter by email",
+         select(Recruiter.id, Recruiter.password).where(Recruiter.email == "r@example.com")),
+        ("public availability: open slots",
+         select(Availability).where(Availability.recruiter_id == 1, Availability.booked == False)
+         .order_by(Availability.start_at)),
+        ("public book-slot: alternative slots",
+         select(Availability).where(
+             Availability.recruiter_id == 1, Availability.booked.isnot(True), Availability.start_at > now
+         ).order_by(Availability.start_at).limit(5)),
+        ("slot writers: overlap window",
+         select(Availability.start_at, Availability.end_at).where(
+             Availability.recruiter_id == 1, Availability.start_at > now - MAX_SLOT_DURATION,
+             Availability.start_at < week, Availability.end_at > now
+         )),
+        ("my-availability: page with bookings",
+         select(Availability.id, Availability.start_at, Booking.candidate_name)
+         .outerjoin(Booking, Booking.availability_id == Availability.id)
+         .where(Availability.recruiter_id == 1, Availability.start_at >= now, Availability.start_at < week)
+         .order_by(Availability.start_at, Availability.id).limit(500)),
+        ("update-availability: booking of a slot",
+         select(Booking).where(Booking.availability_id == 1)),
+        ("public cancel-booking: invitation, booking and slot",
+         select(Invitation, Booking, Availability)
+         .outerjoin(Booking, Booking.invitation_id == Invitation.id)
+         .outerjoin(Availability, Availability.id == Booking.availability_id)
+         .where(Invitation.token == "token")),
+        ("public cancel-booking: legacy email fallback",
+         select(Booking).where(
+             Booking.recruiter_id == 1, Booking.candidate_email == "c@example.com", Booking.invitation_id.is_(None)
+         )),
+        ("analytics: rollup totals",
+         select(func.sum(RecruiterDailyStats.slots_booked)).where(RecruiterDailyStats.recruiter_id == 1)),
+        ("analytics: series",
+         select(RecruiterDailyStats).where(
+             RecruiterDailyStats.recruiter_id == 1,
+             RecruiterDailyStats.day >= today,
+             RecruiterDailyStats.day <= today + timedelta(days=30)
+         )),
+        ("analytics: upcoming today",
+         select(func.count()).select_from(Booking).where(
+             Booking.recruiter_id == 1, Booking.start_at >= now, Booking.start_at < now + timedelta(days=1)
+         )),
+        ("reminder sweep",
+         select(Booking).where(
+             Booking.reminder_sent_at.is_(None), Booking.start_at > now, Booking.start_at <= now + timedelta(hours=2)
+         )),
+        ("pool availability: members",
+         select(InterviewPoolMember.recruiter_id).where(
+             InterviewPoolMember.pool_id == 1, InterviewPoolMember.accepted_at.isnot(None)
+         )),
+        ("pool availability: member cursor page",
+         select(Availability.id, Availability.start_at).where(
+             Availability.recruiter_id == 1, Availability.booked == False, Availability.start_at > now
+         ).order_by(Availability.start_at, Availability.id).limit(20)),
+        ("pool book-slot: members free at a time",
+         select(Availability.id, InterviewPoolMember.last_assigned_at)
+         .join(InterviewPoolMember, InterviewPoolMember.recruiter_id == Availability.recruiter_id)
+         .where(
+             InterviewPoolMember.pool_id == 1, InterviewPoolMember.accepted_at.isnot(None),
+             Availability.booked == False,
+             Availability.start_at == now, Availability.end_at == week
+         )),
+        ("pool book-slot: member load",
+         select(Booking.recruiter_id, func.count()).where(
+             Booking.recruiter_id == 1, Booking.start_at >= now, Booking.start_at < week
+         ).group_by(Booking.recruiter_id)),
+        ("export: bookings",
+         export_statement("bookings", [1, 2], now - timedelta(days=365), now)),
+        ("export: availability with bookings",
+         export_statement("availability", [1, 2], now - timedelta(days=365), now)),
+        ("invitation campaign: status counts",
+         select(Invitation.delivery_status, func.count()).where(Invitation.campaign_id == 1)
+         .group_by(Invitation.delivery_status)),
+        ("invitation campaign: pending chunk",
+         select(Invitation.id).where(Invitation.campaign_id == 1, Invitation.delivery_status == "pending")
+         .order_by(Invitation.id).limit(100)),
+    ]
+
+
+def _sqlite_full_scans(connection, sql, params):
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+    plan = [row[-1] for row in rows]
+    scans = []
+    for detail in plan:
+        words = detail.split()
+        # "SCAN t" is a full table (or full index) scan; "AUTOMATIC" indexes
+        # are built per query from a full scan.
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in LARGE_TABLES:
+            scans.append(detail)
+        elif "AUTOMATIC" in words and len(words) >= 2 and words[1] in LARGE_TABLES:
+            scans.append(detail)
+    return plan, scans
+
+
+def _postgres_full_scans(connection, sql, params):
+    # With seq scans priced out the planner still picks one if no index fits,
+    # so small or empty development tables give the same answer as production.
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    raw = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params).scalar()
+    document = raw if isinstance(raw, list) else json.loads(raw)
+    plan, scans = [], []
+
+    def walk(node, depth=0):
+        label = node["Node Type"] + (f" on {node['Relation Name']}" if "Relation Name" in node else "")
+        plan.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES:
+            scans.append(label)
+        for child in node.get("Plans", ()):
+            walk(child, depth + 1)
+
+    walk(document[0]["Plan"])
+    return plan, scans
+
+
+def check_query_plans(engine=None):
+    """
+    EXPLAIN every hot query on engine (the app's by default); returns a list
+    of (name, plan_lines, full_scans). Runs inside a transaction that is
+    rolled back, so settings don't leak.
+    """
+    engine = engine if engine is not None else db.engine
+    dialect = engine.dialect
+    if dialect.name == "sqlite":
+        explain = _sqlite_full_scans
+    elif dialect.name == "postgresql":
+        explain = _postgres_full_scans
+    else:
+        raise RuntimeError(f"Query plan checks support SQLite and Postgres, not {dialect.name}")
+
+    results = []
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            for name, statement in _hot_queries():
+                # Expands IN lists into plain parameters EXPLAIN can take
+                compiled = statement.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+                params = compiled.construct_params()
+                if dialect.positional:
+                    params = tuple(params[key] for key in compiled.positiontup)
+                plan, scans = explain(connection, str(compiled), params)
+                results.append((name, plan, scans))
+        finally:
+            transaction.rollback()
+    return results
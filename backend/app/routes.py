@@ -1,23 +1,44 @@
+from collections import Counter
 from datetime import datetime, timedelta
-import random, string, uuid
-from zoneinfo import ZoneInfo
+import base64, binascii, csv, hmac, random, string, uuid
 import requests
-from flask import Blueprint, request, jsonify, current_app, make_response, redirect
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask import Blueprint, Response, request, jsonify, current_app, make_response, redirect, stream_with_context
+from flask_jwt_extended import jwt_required, create_access_token
 from flask_mail import Message
-from werkzeug.security import generate_password_hash, check_password_hash
-from app import db, mail
-from app.models import Recruiter, Availability, Booking, Invitation
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
+from app import db, mail, slot_cache, password_hasher, otp_store
+from app.passwords import HashingBusy
+from app.otp_store import OTPStoreUnavailable
+from app.models import (
+    Recruiter, Availability, Booking, Invitation, InvitationCampaign, InterviewPool, InterviewPoolMember
+)
+from app.tz_utils import (
+    UTC, ZoneInfoNotFoundError, as_utc, get_zone, is_valid_zone, local_to_utc, utc_now, utc_to_local
+)
+from app.intervals import load_recruiter_intervals
+from app.auth_utils import current_recruiter, recruiter_claims
+from app.invitations import invitation_email_body, read_candidates, validate_candidates
+from app.metrics import timed_outbound
+from app.exports import EXPORT_FORMATS, export_chunks, export_statement
+from app.pools import assignment_candidates, earliest_pool_slots, pool_member_ids
+from app.db_routing import note_recruiter_write, read_only
+from app.stats import (
+    STAT_COLUMNS, record_daily_stats, record_daily_stats_many, running_totals, stats_series, stats_totals
+)
+from tasks import (
+    enqueue_booking_meeting, new_reminder_task_id, schedule_booking_reminder, revoke_booking_reminder,
+    queue_calendar_delete, queue_calendar_push, queue_invitation_campaign
+)
+from google_calendar import new_event_id
 from flask import make_response
 from flask_cors import cross_origin
+from sqlalchemy import and_, func, insert, or_, select
 
 main = Blueprint('main', __name__)
 
 def send_email(to, subject, body):
     msg = Message(subject=subject, recipients=[to], body=body)
-    mail.send(msg)
+    with timed_outbound("smtp", "send"):
+        mail.send(msg)
 
 def generate_meeting_link():
     random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
@@ -28,39 +49,34 @@ def create_jitsi_meeting():
     random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
     return f"https://meet.jit.si/{random_str}"
 
-# Optional: Google Calendar Integration (if desired)
-def sync_to_google_calendar(email, availability_date, start_time, end_time):
-    service_account_file = current_app.config.get("GOOGLE_SERVICE_ACCOUNT_FILE")
-    if not service_account_file:
-        current_app.logger.error("Service account credentials file not provided")
-        return
+# Keyset pagination cursor over (start_at, id)
+def encode_slot_cursor(start_at, slot_id):
+    raw = f"{as_utc(start_at).isoformat()}|{slot_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_slot_cursor(cursor):
     try:
-        credentials = service_account.Credentials.from_service_account_file(
-            service_account_file,
-            scopes=["https://www.googleapis.com/auth/calendar"]
-        )
-    except Exception as e:
-        current_app.logger.error(f"Error loading service account credentials: {str(e)}")
-        return
-    try:
-        service = build("calendar", "v3", credentials=credentials)
-        event = {
-            "summary": "Available Slot",
-            "start": {
-                "dateTime": f"{availability_date}T{start_time}:00",
-                "timeZone": "America/New_York",
-            },
-            "end": {
-                "dateTime": f"{availability_date}T{end_time}:00",
-                "timeZone": "America/New_York",
-            },
-        }
-        service.events().insert(
-            calendarId=current_app.config.get("GOOGLE_CALENDAR_ID", "primary"),
-            body=event
-        ).execute()
-    except Exception as e:
-        current_app.logger.error(f"Error syncing to Google Calendar: {str(e)}")
+        start_str, id_str = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return as_utc(datetime.fromisoformat(start_str)), int(id_str)
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(str(e))
+
+def local_date_window(from_str, to_str, local_tz):
+    """
+    UTC bounds [start, end) of an optional from/to window of YYYY-MM-DD dates
+    in local_tz, "to" inclusive; None for a missing side. Raises ValueError.
+    """
+    start = end = None
+    if from_str:
+        start = datetime.combine(datetime.strptime(from_str, "%Y-%m-%d").date(), datetime.min.time(), tzinfo=local_tz)
+    if to_str:
+        end = datetime.combine(datetime.strptime(to_str, "%Y-%m-%d").date() + timedelta(days=1), datetime.min.time(), tzinfo=local_tz)
+    return (start.astimezone(UTC) if start else None), (end.astimezone(UTC) if end else None)
+
+def server_busy_response():
+    response = jsonify({"error": "Server is busy, please try again shortly."})
+    response.headers["Retry-After"] = "1"
+    return response, 503
 
 # -----------------------
 # Recruiter Endpoints
@@ -76,12 +92,18 @@ def register_recruiter():
     
     if not name or not email or not password:
         return jsonify({"error": "All fields are required"}), 400
+    if not is_valid_zone(timezone):
+        return jsonify({"error": "Unknown timezone"}), 400
+    
+    # Hash before the first query: from there on the request holds the write lock
+    try:
+        hashed_password = password_hasher.hash(password)
+    except HashingBusy:
+        return server_busy_response()
     
     existing_user = Recruiter.query.filter_by(email=email).first()
     if existing_user:
         return jsonify({"error": "Email already registered"}), 409
-    
-    hashed_password = generate_password_hash(password, method="pbkdf2:sha256")
     new_recruiter = Recruiter(
         name=name, 
         email=email, 
@@ -103,6 +125,8 @@ def register_recruiter():
     }), 201
 
 
+# Not @read_only: it may rehash the password, and a replica may not have the
+# account yet right after /register.
 @main.route("/login", methods=["POST"])
 def login():
     data = request.get_json()
@@ -110,23 +134,43 @@ def login():
     password = data.get("password")
     
     recruiter = Recruiter.query.filter_by(email=email).first()
-    if not recruiter or not check_password_hash(recruiter.password, password):
+    if not recruiter or not password:
         return jsonify({"error": "Invalid credentials"}), 401
+    recruiter_id, stored_hash, name, email = recruiter.id, recruiter.password, recruiter.name, recruiter.email
+    # End the read so the write lock isn't held while hashing and mailing
+    db.session.rollback()
+    try:
+        if not password_hasher.verify(stored_hash, password):
+            return jsonify({"error": "Invalid credentials"}), 401
+        # Transparently upgrade hashes made with older PASSWORD_HASH_METHOD settings
+        if password_hasher.needs_rehash(stored_hash):
+            new_hash = password_hasher.hash(password)
+            # Unless the password changed in the meantime
+            Recruiter.query.filter_by(id=recruiter_id, password=stored_hash).update(
+                {"password": new_hash}, synchronize_session=False
+            )
+            db.session.commit()
+    except HashingBusy:
+        return server_busy_response()
     
     otp = ''.join(random.choices(string.digits, k=6))
-    recruiter.otp = otp
-    recruiter.otp_expiration = datetime.utcnow() + timedelta(minutes=5)
-    db.session.commit()
+    ttl = current_app.config.get("OTP_TTL_SECONDS", 300)
+    try:
+        otp_store.issue("login", email, otp, ttl)
+    except OTPStoreUnavailable as e:
+        current_app.logger.error("OTP store unavailable: %s", str(e))
+        return server_busy_response()
     
     send_email(
-        recruiter.email,
+        email,
         "Your OTP for Login",
-        f"Hello {recruiter.name},\n\nYour one-time password is: {otp}\nIt expires in 5 minutes."
+        f"Hello {name},\n\nYour one-time password is: {otp}\nIt expires in {ttl // 60} minutes."
     )
     
     return jsonify({"message": "OTP sent to your email. Please verify to complete login."}), 200
 
 @main.route("/verify-otp", methods=["POST"])
+@read_only
 def verify_otp():
     data = request.get_json()
     email = data.get("email")
@@ -135,21 +179,31 @@ def verify_otp():
     if not email or not otp:
         return jsonify({"error": "Email and OTP are required"}), 400
     
+    try:
+        attempts = otp_store.record_attempt("login", email)
+        if attempts > current_app.config.get("OTP_MAX_ATTEMPTS", 5):
+            # Too many guesses burn the code; the recruiter has to log in again
+            otp_store.revoke("login", email)
+            return jsonify({"error": "Too many attempts. Please log in again."}), 429
+        expected = otp_store.peek("login", email)
+        if expected is None or not hmac.compare_digest(expected, str(otp)):
+            return jsonify({"error": "Invalid or expired OTP"}), 401
+        # Single use: of two concurrent verifications only one gets the code
+        if otp_store.consume("login", email) != expected:
+            return jsonify({"error": "Invalid or expired OTP"}), 401
+    except OTPStoreUnavailable as e:
+        current_app.logger.error("OTP store unavailable: %s", str(e))
+        return server_busy_response()
+    
     recruiter = Recruiter.query.filter_by(email=email).first()
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
     
-    if recruiter.otp != otp or recruiter.otp_expiration < datetime.utcnow():
-        return jsonify({"error": "Invalid or expired OTP"}), 401
-    
-    recruiter.otp = None
-    recruiter.otp_expiration = None
-    db.session.commit()
-    
-    token = create_access_token(identity=email)
+    token = create_access_token(identity=email, additional_claims=recruiter_claims(recruiter))
     return jsonify({"access_token": token}), 200
 
 @main.route("/forgot-password", methods=["POST"])
+@read_only
 def forgot_password():
     data = request.get_json()
     email = data.get("email")
@@ -163,8 +217,11 @@ def forgot_password():
     
     reset_token = str(uuid.uuid4())
     reset_link = f"{current_app.config.get('FRONTEND_URL')}/reset-password/{reset_token}"
-    recruiter.reset_token = reset_token
-    db.session.commit()
+    try:
+        otp_store.issue("reset", reset_token, str(recruiter.id), current_app.config.get("RESET_TOKEN_TTL_SECONDS", 3600))
+    except OTPStoreUnavailable as e:
+        current_app.logger.error("OTP store unavailable: %s", str(e))
+        return server_busy_response()
     
     send_email(
         recruiter.email,
@@ -183,13 +240,25 @@ def reset_password():
     if not token or not new_password:
         return jsonify({"error": "Token and new password are required"}), 400
     
-    recruiter = Recruiter.query.filter_by(reset_token=token).first()
+    try:
+        recruiter_id = otp_store.peek("reset", token)
+        if not recruiter_id:
+            return jsonify({"error": "Invalid token"}), 400
+        
+        # Hash before the first query, which takes the write lock
+        hashed_password = password_hasher.hash(new_password)
+        # Consume only after hashing so a busy 503 leaves the link usable
+        if otp_store.consume("reset", token) != recruiter_id:
+            return jsonify({"error": "Invalid token"}), 400
+    except HashingBusy:
+        return server_busy_response()
+    except OTPStoreUnavailable as e:
+        current_app.logger.error("OTP store unavailable: %s", str(e))
+        return server_busy_response()
+    recruiter = db.session.get(Recruiter, int(recruiter_id))
     if not recruiter:
         return jsonify({"error": "Invalid token"}), 400
-    
-    hashed_password = generate_password_hash(new_password, method="pbkdf2:sha256")
     recruiter.password = hashed_password
-    recruiter.reset_token = None
     db.session.commit()
     
     return jsonify({"message": "Password reset successfully!"}), 200
@@ -202,8 +271,7 @@ def reset_password():
 @jwt_required()
 def set_availability():
     data = request.get_json()
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
@@ -223,31 +291,33 @@ def set_availability():
         return jsonify({"error": "Invalid date or time format"}), 400
     
     recruiter_timezone = recruiter.timezone if recruiter.timezone else "UTC"
-    local_start_dt = datetime.combine(local_date, local_start_time).replace(tzinfo=ZoneInfo(recruiter_timezone))
-    local_end_dt = datetime.combine(local_date, local_end_time).replace(tzinfo=ZoneInfo(recruiter_timezone))
-    
-    utc_start_dt = local_start_dt.astimezone(ZoneInfo("UTC"))
-    utc_end_dt = local_end_dt.astimezone(ZoneInfo("UTC"))
+    utc_start_dt, utc_end_dt = local_to_utc([
+        datetime.combine(local_date, local_start_time),
+        datetime.combine(local_date, local_end_time)
+    ], recruiter_timezone)
+    if utc_end_dt <= utc_start_dt:
+        return jsonify({"error": "End time must be after start time"}), 400
+
+    busy = load_recruiter_intervals(recruiter.id, utc_start_dt, utc_end_dt)
+    if busy.overlaps(utc_start_dt, utc_end_dt):
+        return jsonify({"error": "This slot overlaps an existing availability slot"}), 409
     
-    new_availability = Availability(
-        recruiter_id=recruiter.id,
-        date=utc_start_dt.date(),
-        start_time=utc_start_dt.time(),
-        end_time=utc_end_dt.time(),
-        booked=False
-    )
+    new_availability = Availability(recruiter_id=recruiter.id, booked=False, google_event_id=new_event_id())
+    new_availability.set_interval(utc_start_dt, utc_end_dt)
     db.session.add(new_availability)
+    record_daily_stats(recruiter.id, new_availability.date, slots_offered=1)
     db.session.commit()
+    slot_cache.invalidate(recruiter.id)
     
-    sync_to_google_calendar(recruiter.email, local_date, start_time_str, end_time_str)
+    if new_availability.google_event_id:
+        queue_calendar_push([new_availability.id])
     return jsonify({"message": "Availability set successfully!"}), 201
 
 @main.route("/set-recurring-availability", methods=["POST"])
 @jwt_required()
 def set_recurring_availability():
     data = request.get_json()
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
@@ -268,35 +338,54 @@ def set_recurring_availability():
     except ValueError:
         return jsonify({"error": "Invalid date or time format. Use YYYY-MM-DD for dates and HH:MM for times."}), 400
     
-    recruiter_timezone = recruiter.timezone if recruiter.timezone else "UTC"
+    if local_end_time <= local_start_time:
+        return jsonify({"error": "End time must be after start time"}), 400
     
+    recruiter_timezone = recruiter.timezone if recruiter.timezone else "UTC"
+
+    # Every weekly occurrence as a UTC interval, converted in one batch
+    local_bounds = []
     current_date = local_start_date
     while current_date <= local_end_date:
-        local_start_dt = datetime.combine(current_date, local_start_time).replace(tzinfo=ZoneInfo(recruiter_timezone))
-        local_end_dt = datetime.combine(current_date, local_end_time).replace(tzinfo=ZoneInfo(recruiter_timezone))
-        
-        utc_start_dt = local_start_dt.astimezone(ZoneInfo("UTC"))
-        utc_end_dt = local_end_dt.astimezone(ZoneInfo("UTC"))
-        
-        new_availability = Availability(
-            recruiter_id=recruiter.id,
-            date=utc_start_dt.date(),
-            start_time=utc_start_dt.time(),
-            end_time=utc_end_dt.time(),
-            booked=False
-        )
-        db.session.add(new_availability)
+        local_bounds.append(datetime.combine(current_date, local_start_time))
+        local_bounds.append(datetime.combine(current_date, local_end_time))
         current_date += timedelta(days=7)  # Weekly recurrence
+    utc_bounds = local_to_utc(local_bounds, recruiter_timezone)
+    occurrences = list(zip(utc_bounds[0::2], utc_bounds[1::2]))
+
+    slots_created = 0
+    new_slots = []
+    offered = Counter()
+    if occurrences:
+        # One range query for the whole series, then a log-time check per occurrence
+        busy = load_recruiter_intervals(recruiter.id, occurrences[0][0], occurrences[-1][1])
+        for utc_start_dt, utc_end_dt in occurrences:
+            if utc_end_dt <= utc_start_dt or not busy.claim(utc_start_dt, utc_end_dt):
+                continue
+            new_availability = Availability(recruiter_id=recruiter.id, booked=False, google_event_id=new_event_id())
+            new_availability.set_interval(utc_start_dt, utc_end_dt)
+            db.session.add(new_availability)
+            offered[new_availability.date] += 1
+            new_slots.append(new_availability)
+            slots_created += 1
     
+    record_daily_stats_many(recruiter.id, {day: {"slots_offered": n} for day, n in offered.items()})
+    db.session.flush()
+    synced_ids = [slot.id for slot in new_slots if slot.google_event_id]
     db.session.commit()
-    return jsonify({"message": "Recurring availability set successfully!"}), 201
+    slot_cache.invalidate(recruiter.id)
+    queue_calendar_push(synced_ids)
+    skipped = len(occurrences) - slots_created
+    return jsonify({
+        "message": f"Recurring availability set successfully! {slots_created} slots created"
+                   + (f", {skipped} skipped because they overlap existing slots." if skipped else ".")
+    }), 201
 
 @main.route("/set-daily-availability", methods=["POST"])
 @jwt_required()
 def set_daily_availability():
     data = request.get_json()
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
@@ -317,104 +406,309 @@ def set_daily_availability():
     except Exception:
         return jsonify({"error": "Invalid date, time, or duration format"}), 400
 
+    if duration <= 0:
+        return jsonify({"error": "Duration must be a positive number of minutes"}), 400
+
     recruiter_timezone = recruiter.timezone if recruiter.timezone else "UTC"
     # Construct the starting and ending datetime objects in local time
     local_start_dt = datetime.combine(availability_date, local_start_time)
     local_end_dt = datetime.combine(availability_date, local_end_time)
     
     slots_created = []
-    current_start = local_start_dt
-
-    # Fetch existing slots for this recruiter on the given date
-    existing_slots = Availability.query.filter_by(
-        recruiter_id=recruiter.id,
-        date=availability_date
-    ).all()
-
-    # Helper function to check if two time intervals overlap
-    def overlaps(new_start, new_end, existing_start, existing_end):
-        return new_start < existing_end and new_end > existing_start
 
+    # Slot boundaries in local time, then converted to UTC in one batch
+    local_boundaries = []
+    current_start = local_start_dt
     while current_start + timedelta(minutes=duration) <= local_end_dt:
-        current_end = current_start + timedelta(minutes=duration)
-        
-        # Check for overlap with existing slots
-        overlap_found = False
-        for slot in existing_slots:
-            # Combine the existing slot's date and times into datetime objects (assuming they represent local time)
-            existing_start = datetime.combine(availability_date, slot.start_time)
-            existing_end = datetime.combine(availability_date, slot.end_time)
-            if overlaps(current_start, current_end, existing_start, existing_end):
-                overlap_found = True
-                break
-        
-        # If no overlap is found, create the new slot.
-        if not overlap_found:
-            local_start_dt_tz = current_start.replace(tzinfo=ZoneInfo(recruiter_timezone))
-            local_end_dt_tz = current_end.replace(tzinfo=ZoneInfo(recruiter_timezone))
-            utc_start = local_start_dt_tz.astimezone(ZoneInfo("UTC"))
-            utc_end = local_end_dt_tz.astimezone(ZoneInfo("UTC"))
-            
-            new_slot = Availability(
-                recruiter_id=recruiter.id,
-                date=utc_start.date(),
-                start_time=utc_start.time(),
-                end_time=utc_end.time(),
-                booked=False
-            )
+        local_boundaries.append(current_start)
+        current_start += timedelta(minutes=duration)
+    local_boundaries.append(current_start)
+    utc_boundaries = local_to_utc(local_boundaries, recruiter_timezone)
+
+    # Existing slots in the requested window, loaded once (in UTC)
+    busy = load_recruiter_intervals(recruiter.id, utc_boundaries[0], utc_boundaries[-1])
+
+    for utc_start, utc_end in zip(utc_boundaries, utc_boundaries[1:]):
+        # Create the slot unless it overlaps an existing (or just generated) one.
+        # Slots that fall into a DST gap come out empty or reversed and are skipped.
+        if utc_start < utc_end and busy.claim(utc_start, utc_end):
+            new_slot = Availability(recruiter_id=recruiter.id, booked=False, google_event_id=new_event_id())
+            new_slot.set_interval(utc_start, utc_end)
             db.session.add(new_slot)
             slots_created.append(new_slot)
-            # Add the new slot to the list of existing slots so subsequent iterations avoid overlaps.
-            existing_slots.append(new_slot)
-        
-        current_start = current_end
 
+    offered = Counter(slot.date for slot in slots_created)
+    record_daily_stats_many(recruiter.id, {day: {"slots_offered": n} for day, n in offered.items()})
+    db.session.flush()
+    synced_ids = [slot.id for slot in slots_created if slot.google_event_id]
     db.session.commit()
+    slot_cache.invalidate(recruiter.id)
+    queue_calendar_push(synced_ids)
     return jsonify({"message": f"Daily availability set successfully! {len(slots_created)} slots created."}), 201
 
+def expand_bulk_slot_specs(data):
+    """
+    Turn a bulk availability payload into (date, start_time, end_time) local
+    triples. Accepts either explicit "slots" or "dates" x "ranges", each range
+    optionally split into "duration"-minute slots. Returns (specs, errors).
+    """
+    specs, errors = [], []
+
+    def parse_time(value, label):
+        try:
+            return datetime.strptime(value, "%H:%M").time()
+        except (TypeError, ValueError):
+            errors.append(f"{label}: invalid time {value!r}, use HH:MM")
+
+    def parse_date(value, label):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            errors.append(f"{label}: invalid date {value!r}, use YYYY-MM-DD")
+
+    duration = data.get("duration")
+    if duration is not None:
+        try:
+            duration = int(duration)
+            if duration <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors.append("duration must be a positive number of minutes")
+            duration = None
+
+    def add_range(local_date, start, end, label):
+        if local_date is None or start is None or end is None:
+            return
+        if end <= start:
+            errors.append(f"{label}: end_time must be after start_time")
+            return
+        if not duration:
+            specs.append((local_date, start, end))
+            return
+        current = datetime.combine(local_date, start)
+        range_end = datetime.combine(local_date, end)
+        while current + timedelta(minutes=duration) <= range_end:
+            specs.append((local_date, current.time(), (current + timedelta(minutes=duration)).time()))
+            current += timedelta(minutes=duration)
+
+    slots = data.get("slots")
+    dates = data.get("dates")
+    ranges = data.get("ranges")
+    if slots is not None:
+        if not isinstance(slots, list):
+            return [], ["slots must be a list"]
+        for i, spec in enumerate(slots):
+            if not isinstance(spec, dict):
+                errors.append(f"slots[{i}]: must be an object")
+                continue
+            add_range(
+                parse_date(spec.get("date"), f"slots[{i}]"),
+                parse_time(spec.get("start_time"), f"slots[{i}]"),
+                parse_time(spec.get("end_time"), f"slots[{i}]"),
+                f"slots[{i}]"
+            )
+    elif dates is not None and ranges is not None:
+        if not isinstance(dates, list) or not isinstance(ranges, list):
+            return [], ["dates and ranges must be lists"]
+        parsed_dates = [parse_date(value, f"dates[{i}]") for i, value in enumerate(dates)]
+        parsed_ranges = []
+        for i, spec in enumerate(ranges):
+            if not isinstance(spec, dict):
+                errors.append(f"ranges[{i}]: must be an object")
+                continue
+            parsed_ranges.append((
+                parse_time(spec.get("start_time"), f"ranges[{i}]"),
+                parse_time(spec.get("end_time"), f"ranges[{i}]"),
+                f"ranges[{i}]"
+            ))
+        for local_date in parsed_dates:
+            for start, end, label in parsed_ranges:
+                add_range(local_date, start, end, label)
+    else:
+        errors.append("Provide either slots, or dates and ranges")
+    return specs, errors
+
+@main.route("/set-availability/bulk", methods=["POST"])
+@jwt_required()
+def set_bulk_availability():
+    data = request.get_json() or {}
+    recruiter = current_recruiter()
+    
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+
+    specs, errors = expand_bulk_slot_specs(data)
+    if errors:
+        return jsonify({"error": "Invalid availability payload", "details": errors}), 400
+    if not specs:
+        return jsonify({"error": "No slots to create"}), 400
+    max_slots = current_app.config.get("BULK_AVAILABILITY_MAX_SLOTS", 5000)
+    if len(specs) > max_slots:
+        return jsonify({"error": f"Too many slots in one request (max {max_slots})"}), 413
+
+    recruiter_timezone = recruiter.timezone if recruiter.timezone else "UTC"
+    local_bounds = []
+    for local_date, start, end in specs:
+        local_bounds.append(datetime.combine(local_date, start))
+        local_bounds.append(datetime.combine(local_date, end))
+    utc_bounds = local_to_utc(local_bounds, recruiter_timezone)
+    intervals = list(zip(utc_bounds[0::2], utc_bounds[1::2]))
+
+    # Check the batch against existing slots and itself. With skip_overlaps the
+    # conflicting entries are dropped, otherwise the whole request is rejected.
+    skip_overlaps = bool(data.get("skip_overlaps"))
+    busy = load_recruiter_intervals(
+        recruiter.id,
+        min(start for start, _ in intervals),
+        max(end for _, end in intervals)
+    )
+    rows, conflicts = [], []
+    for i, (utc_start, utc_end) in enumerate(intervals):
+        if utc_end <= utc_start or not busy.claim(utc_start, utc_end):
+            conflicts.append(i)
+            continue
+        row = Availability.interval_columns(utc_start, utc_end)
+        row.update(recruiter_id=recruiter.id, booked=False, google_event_id=new_event_id())
+        rows.append(row)
+    if conflicts and not skip_overlaps:
+        local_date, start, end = specs[conflicts[0]]
+        return jsonify({
+            "error": f"{len(conflicts)} slot(s) overlap existing or other requested slots",
+            "first_conflict": {
+                "date": local_date.strftime("%Y-%m-%d"),
+                "start_time": start.strftime("%H:%M"),
+                "end_time": end.strftime("%H:%M")
+            }
+        }), 409
+    if not rows:
+        return jsonify({"message": "No slots created; all overlap existing slots.", "created_ids": []}), 200
+
+    # Multi-row INSERT ... RETURNING id per batch (insertmanyvalues on Postgres
+    # and SQLite), all inside one transaction with a single commit. The ids are
+    # not needed in row order; asking for it (sort_by_parameter_order) makes
+    # SQLite fall back to one INSERT per row.
+    batch_size = current_app.config.get("BULK_INSERT_BATCH_SIZE", 500)
+    created_ids = []
+    try:
+        for offset in range(0, len(rows), batch_size):
+            created_ids.extend(db.session.scalars(
+                insert(Availability).returning(Availability.id),
+                rows[offset:offset + batch_size]
+            ))
+        created_ids.sort()
+        offered = Counter(row["date"] for row in rows)
+        record_daily_stats_many(recruiter.id, {day: {"slots_offered": n} for day, n in offered.items()})
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error("Bulk availability insert failed: %s", str(e))
+        return jsonify({"error": "Failed to create availability slots"}), 500
+    slot_cache.invalidate(recruiter.id)
+    queue_calendar_push(created_ids)
+
+    return jsonify({
+        "message": f"Bulk availability set successfully! {len(created_ids)} slots created.",
+        "created_ids": created_ids,
+        "skipped": len(conflicts)
+    }), 201
+
 
 @main.route("/my-availability", methods=["GET"])
 @jwt_required()
+@read_only
 def my_availability():
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
     
     recruiter_timezone = recruiter.timezone if recruiter.timezone else "UTC"
-    availabilities = Availability.query.filter_by(recruiter_id=recruiter.id).all()
+    local_tz = get_zone(recruiter_timezone)
+
+    cursor = request.args.get("cursor")
+    # Without from or a cursor (the existing frontend sends neither) the list
+    # starts today in the recruiter's timezone, so the first page holds the
+    # upcoming slots rather than the oldest ones
+    from_str = request.args.get("from")
+    if not from_str and not cursor:
+        from_str = utc_now().astimezone(local_tz).strftime("%Y-%m-%d")
+    try:
+        window_start, window_end = local_date_window(from_str, request.args.get("to"), local_tz)
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD for from and to."}), 400
+
+    max_page_size = current_app.config.get("MY_AVAILABILITY_MAX_PAGE_SIZE", 2000)
+    try:
+        limit = int(request.args.get("limit", current_app.config.get("MY_AVAILABILITY_PAGE_SIZE", 500)))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, max_page_size))
+
+    try:
+        after = decode_slot_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    # One query for the page: slot columns plus the booking (if any) joined via
+    # Availability.booking, ordered on (recruiter_id, start_at) so it walks the index.
+    query = (
+        db.session.query(
+            Availability.id,
+            Availability.start_at,
+            Availability.end_at,
+            Availability.booked,
+            Booking.id.label("booking_id"),
+            Booking.candidate_name,
+            Booking.candidate_email,
+            Booking.candidate_position,
+        )
+        .outerjoin(Availability.booking)
+        .filter(Availability.recruiter_id == recruiter.id)
+    )
+    if window_start is not None:
+        query = query.filter(Availability.start_at >= window_start)
+    if window_end is not None:
+        query = query.filter(Availability.start_at < window_end)
+    if after is not None:
+        after_start, after_id = after
+        query = query.filter(or_(
+            Availability.start_at > after_start,
+            and_(Availability.start_at == after_start, Availability.id > after_id)
+        ))
+    rows = query.order_by(Availability.start_at, Availability.id).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_slot_cursor(rows[-1].start_at, rows[-1].id)
+
+    # Convert the whole page to local time in one pass
+    local_times = utc_to_local(
+        [dt for row in rows for dt in (row.start_at, row.end_at)], recruiter_timezone
+    )
     slots = []
-    for slot in availabilities:
-        utc_start_dt = datetime.combine(slot.date, slot.start_time).replace(tzinfo=ZoneInfo("UTC"))
-        utc_end_dt = datetime.combine(slot.date, slot.end_time).replace(tzinfo=ZoneInfo("UTC"))
-        local_start_dt = utc_start_dt.astimezone(ZoneInfo(recruiter_timezone))
-        local_end_dt = utc_end_dt.astimezone(ZoneInfo(recruiter_timezone))
-        
+    for row, local_start_dt, local_end_dt in zip(rows, local_times[0::2], local_times[1::2]):
         slot_data = {
-            "id": slot.id,
+            "id": row.id,
             "date": local_start_dt.strftime("%Y-%m-%d"),
             "start_time": local_start_dt.strftime("%H:%M"),
             "end_time": local_end_dt.strftime("%H:%M"),
-            "booked": slot.booked
+            "booked": row.booked
         }
-        if slot.booked:
-            booking = Booking.query.filter_by(availability_id=slot.id).first()
-            if booking:
-                slot_data["candidate_name"] = booking.candidate_name
-                slot_data["candidate_email"] = booking.candidate_email
-                slot_data["candidate_position"] = booking.candidate_position
-                slot_data["booking_id"] = booking.id
+        if row.booked and row.booking_id is not None:
+            slot_data["candidate_name"] = row.candidate_name
+            slot_data["candidate_email"] = row.candidate_email
+            slot_data["candidate_position"] = row.candidate_position
+            slot_data["booking_id"] = row.booking_id
         slots.append(slot_data)
     
-    return jsonify({"available_slots": slots}), 200
+    return jsonify({"available_slots": slots, "next_cursor": next_cursor}), 200
 
 @main.route("/update-availability/<int:slot_id>", methods=["PUT"])
 @jwt_required()
 def update_availability(slot_id):
     data = request.get_json()
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
 
@@ -436,20 +730,49 @@ def update_availability(slot_id):
         return jsonify({"error": "Invalid date or time format"}), 400
 
     recruiter_timezone = recruiter.timezone if recruiter.timezone else "UTC"
-    local_start_dt = datetime.combine(local_date, local_start_time).replace(tzinfo=ZoneInfo(recruiter_timezone))
-    local_end_dt = datetime.combine(local_date, local_end_time).replace(tzinfo=ZoneInfo(recruiter_timezone))
-    utc_start_dt = local_start_dt.astimezone(ZoneInfo("UTC"))
-    utc_end_dt = local_end_dt.astimezone(ZoneInfo("UTC"))
-
-    slot.date = utc_start_dt.date()
-    slot.start_time = utc_start_dt.time()
-    slot.end_time = utc_end_dt.time()
+    utc_start_dt, utc_end_dt = local_to_utc([
+        datetime.combine(local_date, local_start_time),
+        datetime.combine(local_date, local_end_time)
+    ], recruiter_timezone)
+    if utc_end_dt <= utc_start_dt:
+        return jsonify({"error": "End time must be after start time"}), 400
+
+    busy = load_recruiter_intervals(recruiter.id, utc_start_dt, utc_end_dt, exclude_slot_id=slot.id)
+    if busy.overlaps(utc_start_dt, utc_end_dt):
+        return jsonify({"error": "The new time overlaps another availability slot"}), 409
+
+    old_day = slot.date
+    slot.set_interval(utc_start_dt, utc_end_dt)
+    # Slots created before calendar sync was enabled get their event now
+    calendar_update = slot.google_event_id is not None
+    if not calendar_update:
+        slot.google_event_id = new_event_id()
+    if slot.date != old_day:
+        moved = {"slots_offered": 1, "slots_booked": 1 if slot.booked else 0}
+        record_daily_stats_many(recruiter.id, {
+            old_day: {column: -n for column, n in moved.items()},
+            slot.date: moved
+        })
+
+    # Keep the booking's copy of the schedule in sync and move its reminder.
+    booking = Booking.query.filter_by(availability_id=slot.id).first() if slot.booked else None
+    old_reminder_task_id = None
+    if booking:
+        booking.set_interval(utc_start_dt, utc_end_dt)
+        old_reminder_task_id = booking.reminder_task_id
+        booking.reminder_task_id = new_reminder_task_id()
+        booking.reminder_sent_at = None
     db.session.commit()
+    slot_cache.invalidate(recruiter.id)
+    if slot.google_event_id:
+        queue_calendar_push([slot.id], update=calendar_update)
+
+    if booking:
+        revoke_booking_reminder(old_reminder_task_id)
+        schedule_booking_reminder(booking)
 
     # If the slot is booked, send an update email to the candidate.
     if slot.booked:
-        from app.models import Booking  # Ensure Booking is imported if not already
-        booking = Booking.query.filter_by(availability_id=slot.id).first()
         if booking:
             # Construct a message with the updated meeting time.
             email_body = (
@@ -473,8 +796,7 @@ def update_availability(slot_id):
 @main.route("/delete-availability/<int:slot_id>", methods=["DELETE"])
 @jwt_required()
 def delete_availability(slot_id):
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
 
@@ -486,15 +808,17 @@ def delete_availability(slot_id):
         return jsonify({"error": "Cannot delete a booked slot"}), 400
 
     db.session.delete(slot)
+    record_daily_stats(recruiter.id, slot.date, slots_offered=-1)
     db.session.commit()
+    slot_cache.invalidate(recruiter.id)
+    queue_calendar_delete([slot.google_event_id])
     return jsonify({"message": "Availability slot deleted successfully!"}), 200
 
 # Cancel Booking Endpoint – only for booked slots
 @main.route("/cancel-booking/<int:booking_id>", methods=["DELETE"])
 @jwt_required()
 def cancel_booking(booking_id):
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
 
@@ -509,11 +833,15 @@ def cancel_booking(booking_id):
     try:
         db.session.delete(booking)
         slot.booked = False
+        record_daily_stats(recruiter.id, booking.date, cancelled_by_recruiter=1)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": "Failed to cancel booking"}), 500
 
+    slot_cache.invalidate(recruiter.id)
+    revoke_booking_reminder(booking.reminder_task_id)
+
     try:
         send_email(
             booking.candidate_email,
@@ -527,36 +855,185 @@ def cancel_booking(booking_id):
 
 @main.route("/analytics", methods=["GET"])
 @jwt_required()
+@read_only
 def analytics():
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
 
-    total_bookings = Booking.query.filter_by(recruiter_id=recruiter.id).count()
-    upcoming_bookings = Booking.query.filter(
+    # All time counters are the one running totals row. Upcoming bookings are
+    # the daily rows after today (as many as days booked ahead) plus a live
+    # count of today's, split into past and upcoming by the clock.
+    now = utc_now()
+    today = now.date()
+    totals = running_totals(recruiter.id)
+    ahead = stats_totals(recruiter.id, day_from=today + timedelta(days=1))
+    upcoming_today = Booking.query.filter(
         Booking.recruiter_id == recruiter.id,
-        Booking.date >= datetime.utcnow().date()
+        Booking.start_at >= now,
+        Booking.start_at < datetime.combine(today + timedelta(days=1), datetime.min.time(), tzinfo=UTC)
     ).count()
 
-    return jsonify({
-        "total_bookings": total_bookings,
-        "upcoming_bookings": upcoming_bookings,
-    }), 200
+    result = {
+        "total_bookings": active_bookings(totals),
+        "upcoming_bookings": active_bookings(ahead) + upcoming_today,
+        "totals": totals,
+    }
+
+    # Optional utilization series: ?from=YYYY-MM-DD&to=YYYY-MM-DD (UTC days)
+    from_str = request.args.get("from")
+    to_str = request.args.get("to")
+    if from_str or to_str:
+        try:
+            day_from = datetime.strptime(from_str, "%Y-%m-%d").date()
+            day_to = datetime.strptime(to_str, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            return jsonify({"error": "from and to must both be dates in YYYY-MM-DD format"}), 400
+        max_days = current_app.config.get("ANALYTICS_MAX_RANGE_DAYS", 366)
+        if day_to < day_from or (day_to - day_from).days >= max_days:
+            return jsonify({"error": f"Invalid range; to must not precede from and span at most {max_days} days"}), 400
+
+        by_day = stats_series(recruiter.id, day_from, day_to)
+        empty = dict.fromkeys(STAT_COLUMNS, 0)
+        series = []
+        day = day_from
+        while day <= day_to:
+            counters = by_day.get(day, empty)
+            booked = active_bookings(counters)
+            series.append(dict(
+                counters,
+                date=day.strftime("%Y-%m-%d"),
+                active_bookings=booked,
+                utilization=round(booked / counters["slots_offered"], 4) if counters["slots_offered"] > 0 else None
+            ))
+            day += timedelta(days=1)
+        result["series"] = series
+        result["range_totals"] = {
+            column: sum(counters[column] for counters in by_day.values()) for column in STAT_COLUMNS
+        }
+
+    return jsonify(result), 200
+
+def active_bookings(counters):
+    """Bookings still standing: made minus cancelled by either side."""
+    return counters["slots_booked"] - counters["cancelled_by_candidate"] - counters["cancelled_by_recruiter"]
+
+# -----------------------
+# Exports
+# -----------------------
+
+def export_response(kind):
+    """
+    Stream the recruiter's bookings or availability as CSV or NDJSON.
+    ?format=csv|ndjson and ?from=&to= (YYYY-MM-DD in the recruiter's timezone,
+    "to" inclusive). Only the recruiter's own rows: candidate details belong
+    to the recruiter they booked, so ?recruiter_id= naming anyone else is 403.
+    """
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    try:
+        start, end = local_date_window(
+            request.args.get("from"), request.args.get("to"), get_zone(recruiter.timezone or "UTC")
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD for from and to."}), 400
+
+    try:
+        recruiter_ids = {
+            int(value) for param in request.args.getlist("recruiter_id") for value in param.split(",") if value.strip()
+        } or {recruiter.id}
+    except ValueError:
+        return jsonify({"error": "recruiter_id must be an integer"}), 400
+    if recruiter_ids != {recruiter.id}:
+        return jsonify({"error": "You can only export your own data"}), 403
+
+    statement = export_statement(kind, [recruiter.id], start, end)
+    batch_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+    response = Response(stream_with_context(export_chunks(statement, fmt, batch_size)), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{kind}-{utc_now():%Y%m%d}.{fmt}"'
+    # Ask proxies (nginx and friends) to pass chunks on instead of buffering the whole body
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+@main.route("/export/bookings", methods=["GET"])
+@jwt_required()
+@read_only
+def export_bookings():
+    return export_response("bookings")
+
+@main.route("/export/availability", methods=["GET"])
+@jwt_required()
+@read_only
+def export_availability():
+    return export_response("availability")
 
 # -----------------------
 # Public Endpoints (For Candidates)
 # -----------------------
 
-@main.route("/public/availability/<int:recruiter_id>", methods=["GET"])
-def view_public_availability(recruiter_id):
-    availabilities = Availability.query.filter_by(recruiter_id=recruiter_id, booked=False).all()
-    slots = [{
+def serialize_public_slot(slot):
+    return {
         "id": slot.id,
         "date": slot.date.strftime("%Y-%m-%d"),
         "start_time": slot.start_time.strftime("%H:%M"),
-        "end_time": slot.end_time.strftime("%H:%M")
-    } for slot in availabilities]
+        "end_time": slot.end_time.strftime("%H:%M"),
+        "start_at": as_utc(slot.start_at).isoformat(),
+        "end_at": as_utc(slot.end_at).isoformat()
+    }
+
+def load_public_slots(recruiter_id):
+    availabilities = Availability.query.filter_by(
+        recruiter_id=recruiter_id, booked=False
+    ).order_by(Availability.start_at).all()
+    return [serialize_public_slot(slot) for slot in availabilities]
+
+def alternative_public_slots(recruiter_id):
+    """The next few open slots, offered to a candidate who lost a booking race."""
+    limit = current_app.config.get("BOOKING_ALTERNATIVES_LIMIT", 5)
+    availabilities = Availability.query.filter(
+        Availability.recruiter_id == recruiter_id,
+        Availability.booked.isnot(True),
+        Availability.start_at > utc_now()
+    ).order_by(Availability.start_at).limit(limit).all()
+    return [serialize_public_slot(slot) for slot in availabilities]
+
+def localize_public_slots(slots, tz_name):
+    """Rewrite date/start_time/end_time of cached (UTC) public slots into tz_name, in one batch."""
+    local_times = utc_to_local(
+        [datetime.fromisoformat(value) for slot in slots for value in (slot["start_at"], slot["end_at"])],
+        tz_name
+    )
+    localized = []
+    for slot, local_start, local_end in zip(slots, local_times[0::2], local_times[1::2]):
+        localized.append(dict(
+            slot,
+            date=local_start.strftime("%Y-%m-%d"),
+            start_time=local_start.strftime("%H:%M"),
+            end_time=local_end.strftime("%H:%M")
+        ))
+    return localized
+
+@main.route("/public/availability/<int:recruiter_id>", methods=["GET"])
+@read_only
+def view_public_availability(recruiter_id):
+    candidate_tz = request.args.get("tz")
+    if candidate_tz:
+        try:
+            get_zone(candidate_tz)
+        except ZoneInfoNotFoundError:
+            return jsonify({"error": "Unknown timezone"}), 400
+
+    # Served from the shared slot cache; every write to the recruiter's slots
+    # or bookings calls slot_cache.invalidate() after committing.
+    slots = slot_cache.get_or_load(recruiter_id, lambda: load_public_slots(recruiter_id))
+    if candidate_tz:
+        return jsonify({"available_slots": localize_public_slots(slots, candidate_tz), "timezone": candidate_tz}), 200
     return jsonify({"available_slots": slots}), 200
 
 @main.route("/public/book-slot", methods=["POST"])
@@ -580,15 +1057,56 @@ def public_book_slot():
     if invitation.expiration < datetime.utcnow():
         return jsonify({"error": "This invitation link has expired."}), 400
 
-    # Check if the slot is available
-    slot = Availability.query.filter_by(id=availability_id, booked=False).first()
-    if not slot:
-        return jsonify({"error": "Slot not available"}), 404
+    # Claim the slot and consume the invitation with conditional UPDATEs in a
+    # single transaction. Only one concurrent request can flip booked/used, the
+    # others match zero rows and get a 409 without waiting on any other lock.
+    # Both claims always run in the same order (slot, then invitation).
+    slot_claimed = Availability.query.filter(
+        Availability.id == availability_id,
+        Availability.recruiter_id == invitation.recruiter_id,
+        Availability.booked.isnot(True)
+    ).update({"booked": True}, synchronize_session=False)
+    if not slot_claimed:
+        db.session.rollback()
+        if not db.session.query(Availability.id).filter_by(
+            id=availability_id, recruiter_id=invitation.recruiter_id
+        ).first():
+            return jsonify({"error": "Slot not found"}), 404
+        return jsonify({
+            "error": "Slot not available",
+            "alternative_slots": alternative_public_slots(invitation.recruiter_id)
+        }), 409
+
+    if not claim_invitation(invitation):
+        db.session.rollback()
+        return jsonify({"error": "This invitation link has already been used."}), 409
+
+    return complete_public_booking(
+        availability_id, invitation, invitation_token, candidate_name, candidate_email, candidate_position
+    )
 
-    slot.booked = True
-    recruiter = Recruiter.query.filter_by(id=slot.recruiter_id).first()
-    # Generate a meeting link using Jitsi Meet
-    meeting_link = create_jitsi_meeting()
+def claim_invitation(invitation):
+    """Conditionally mark the invitation used; False if another request got there first."""
+    return Invitation.query.filter(
+        Invitation.id == invitation.id,
+        Invitation.used.isnot(True),
+        Invitation.expiration >= datetime.utcnow()
+    ).update({"used": True}, synchronize_session=False)
+
+def complete_public_booking(availability_id, invitation, invitation_token, candidate_name, candidate_email,
+                            candidate_position):
+    """
+    Create the booking for a claimed slot and invitation, commit, then set up
+    the meeting and reminder and notify both sides. Shared by the recruiter
+    and pool booking endpoints.
+    """
+    slot = db.session.get(Availability, availability_id)
+    recruiter = db.session.get(Recruiter, slot.recruiter_id)
+    # Recruiters with Zoom connected get their meeting created in the
+    # background (the link is emailed once it exists); everyone else gets an
+    # instant Jitsi Meet link.
+    uses_zoom = bool(recruiter.zoom_refresh_token)
+    meeting_link = None if uses_zoom else create_jitsi_meeting()
     
     new_booking = Booking(
         candidate_name=candidate_name,
@@ -596,15 +1114,36 @@ def public_book_slot():
         candidate_position=candidate_position,  # Save the candidate's position
         availability_id=slot.id,
         recruiter_id=slot.recruiter_id,
-        date=slot.date,
-        start_time=slot.start_time,
-        end_time=slot.end_time,
-        meeting_link=meeting_link
+        meeting_link=meeting_link,
+        reminder_task_id=new_reminder_task_id(),
+        invitation_id=invitation.id
     )
+    new_booking.set_interval(as_utc(slot.start_at), as_utc(slot.end_at))
     db.session.add(new_booking)
-    # Mark the invitation as used so it cannot be reused
-    invitation.used = True
-    db.session.commit()
+    # The rest only reads slot, recruiter and the booking, which nobody else
+    # changes meanwhile; keep them loaded instead of reloading each after commit
+    db.session().expire_on_commit = False
+    try:
+        record_daily_stats(slot.recruiter_id, new_booking.date, slots_booked=1)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error("Booking commit error: %s", str(e))
+        return jsonify({"error": "Failed to book slot due to a server error."}), 500
+    slot_cache.invalidate(slot.recruiter_id)
+    note_recruiter_write(slot.recruiter_id)
+
+    if uses_zoom and not enqueue_booking_meeting(new_booking):
+        meeting_link = create_jitsi_meeting()
+        new_booking.meeting_link = meeting_link
+        db.session.commit()
+    if meeting_link:
+        meeting_line = f"Please join the meeting using this link: {meeting_link}"
+    else:
+        meeting_line = "Your Zoom meeting link will be sent in a separate email shortly."
+
+    # Reminder goes out REMINDER_LEAD_MINUTES before the interview via an ETA task
+    schedule_booking_reminder(new_booking)
     
     # Build a cancellation link.
     cancellation_link = f"{current_app.config.get('FRONTEND_URL')}/cancel-booking?email={candidate_email}&token={invitation_token}"
@@ -615,7 +1154,7 @@ def public_book_slot():
         "Your Interview Slot is Confirmed",
         f"Hello {candidate_name},\n\nYour interview is scheduled for {slot.date} at {slot.start_time}.\n"
         f"Position: {candidate_position}\n"
-        f"Please join the meeting using this link: {meeting_link}\n\n"
+        f"{meeting_line}\n\n"
         f"If you need to cancel your booking, please use the following link:\n{cancellation_link}\n\n"
         "Good luck!"
     )
@@ -627,7 +1166,7 @@ def public_book_slot():
         f"Hello {recruiter.name},\n\nA new booking has been made for the slot on {slot.date} from {slot.start_time} to {slot.end_time}.\n"
         f"Candidate: {candidate_name} ({candidate_email})\n"
         f"Position: {candidate_position}\n"
-        f"Meeting Link: {meeting_link}"
+        f"Meeting Link: {meeting_link or 'pending (Zoom meeting is being created)'}"
     )
     
     return jsonify({"message": "Slot booked successfully!"}), 201
@@ -649,11 +1188,18 @@ def send_invitation():
     if not candidate_name or not candidate_email:
         return jsonify({"error": "Candidate name and email are required"}), 400
 
-    recruiter_email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=recruiter_email).first()
+    recruiter = current_recruiter()
     if not recruiter:
         return jsonify({"error": "Recruiter not found"}), 404
 
+    # Optionally invite to one of the recruiter's pools instead of to themselves
+    pool_id = data.get("pool_id")
+    if pool_id is not None:
+        if not isinstance(pool_id, int):
+            return jsonify({"error": "pool_id must be an integer"}), 400
+        if not member_pool(pool_id, recruiter.id):
+            return jsonify({"error": "Pool not found"}), 404
+
     # Generate a random invitation token and store it in the Invitation model
     invitation_token = uuid.uuid4().hex
     expiration_time = datetime.utcnow() + timedelta(hours=48)
@@ -661,22 +1207,15 @@ def send_invitation():
         recruiter_id=recruiter.id,
         token=invitation_token,
         used=False,
-        expiration=expiration_time
+        expiration=expiration_time,
+        candidate_name=candidate_name,
+        candidate_email=candidate_email,
+        pool_id=pool_id
     )
     db.session.add(invitation)
     db.session.commit()
 
-    booking_link = f"{current_app.config.get('FRONTEND_URL')}/book-slot/{recruiter.id}/{invitation_token}"
-    expiration_str = expiration_time.strftime("%Y-%m-%d %H:%M UTC")
-    
-    message_body = (
-        f"Hello {candidate_name},\n\n"
-        "You have been invited to book an interview slot. Please use the following link to schedule your interview:\n\n"
-        f"{booking_link}\n\n"
-        "For your reference, your invitation token is: " + invitation_token + "\n"
-        f"This token (and the link) will expire on {expiration_str}.\n\n"
-        "Best regards,\nYour Recruitment Team"
-    )
+    message_body = invitation_email_body(candidate_name, recruiter.id, invitation_token, expiration_time, pool_id)
     
     try:
         send_email(candidate_email, "Interview Invitation", message_body)
@@ -684,10 +1223,388 @@ def send_invitation():
     except Exception as e:
         current_app.logger.error("Error sending invitation: %s", str(e))
         return jsonify({"error": "Failed to send invitation"}), 500
+
+@main.route("/send-invitation/bulk", methods=["POST"])
+@jwt_required()
+def send_bulk_invitations():
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+
+    try:
+        candidates, fields = read_candidates(request)
+    except (UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"error": f"Could not read candidate CSV: {str(e)}"}), 400
+    campaign_name = fields.get("name")
+    pool_id = fields.get("pool_id")
+    if pool_id is not None:
+        try:
+            pool_id = int(pool_id)
+        except (TypeError, ValueError):
+            return jsonify({"error": "pool_id must be an integer"}), 400
+        if not member_pool(pool_id, recruiter.id):
+            return jsonify({"error": "Pool not found"}), 404
+    max_candidates = current_app.config.get("BULK_INVITATION_MAX_CANDIDATES", 2000)
+    if len(candidates) > max_candidates:
+        return jsonify({"error": f"Too many candidates in one campaign (max {max_candidates})"}), 413
+    valid, errors = validate_candidates(candidates)
+    if not valid:
+        return jsonify({"error": "No valid candidates", "details": errors}), 400
+
+    # Campaign and all its invitations go in with one transaction: the
+    # invitation rows as batched multi-row INSERTs, then a single commit.
+    expiration_time = datetime.utcnow() + timedelta(hours=48)
+    batch_size = current_app.config.get("BULK_INSERT_BATCH_SIZE", 500)
+    try:
+        campaign = InvitationCampaign(
+            recruiter_id=recruiter.id,
+            name=(campaign_name or "")[:200] or None,
+            total=len(valid),
+            status="queued"
+        )
+        db.session.add(campaign)
+        db.session.flush()
+        rows = [
+            dict(
+                candidate,
+                recruiter_id=recruiter.id,
+                token=uuid.uuid4().hex,
+                used=False,
+                cancel_count=0,
+                expiration=expiration_time,
+                campaign_id=campaign.id,
+                delivery_status="pending",
+                pool_id=pool_id
+            )
+            for candidate in valid
+        ]
+        for offset in range(0, len(rows), batch_size):
+            db.session.execute(insert(Invitation), rows[offset:offset + batch_size])
+        campaign_id = campaign.id
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error("Bulk invitation insert failed: %s", str(e))
+        return jsonify({"error": "Failed to create invitations"}), 500
+
+    # Delivery happens in the worker; a campaign that cannot be queued now is
+    # picked up by the beat sweep.
+    queue_invitation_campaign(campaign_id)
+    return jsonify({
+        "message": f"{len(valid)} invitations queued for delivery.",
+        "campaign_id": campaign_id,
+        "total": len(valid),
+        "skipped": errors
+    }), 202
+
+@main.route("/invitation-campaigns/<int:campaign_id>", methods=["GET"])
+@jwt_required()
+def invitation_campaign_status(campaign_id):
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+
+    campaign = InvitationCampaign.query.filter_by(id=campaign_id, recruiter_id=recruiter.id).first()
+    if not campaign:
+        return jsonify({"error": "Campaign not found"}), 404
+
+    counts = dict.fromkeys(("pending", "sending", "sent", "failed"), 0)
+    counts.update(
+        db.session.query(Invitation.delivery_status, func.count())
+        .filter(Invitation.campaign_id == campaign.id)
+        .group_by(Invitation.delivery_status)
+        .all()
+    )
+
+    # Per-recipient results, optionally filtered by ?status=, paged by ?after_id=
+    try:
+        after_id = int(request.args.get("after_id", 0))
+        limit = min(int(request.args.get("limit", 500)), 2000)
+    except ValueError:
+        return jsonify({"error": "after_id and limit must be integers"}), 400
+    query = db.session.query(
+        Invitation.id, Invitation.candidate_name, Invitation.candidate_email,
+        Invitation.delivery_status, Invitation.delivery_error, Invitation.sent_at, Invitation.used
+    ).filter(Invitation.campaign_id == campaign.id, Invitation.id > after_id)
+    status_filter = request.args.get("status")
+    if status_filter:
+        query = query.filter(Invitation.delivery_status == status_filter)
+    rows = query.order_by(Invitation.id).limit(limit + 1).all()
+    recipients = [{
+        "invitation_id": row.id,
+        "candidate_name": row.candidate_name,
+        "candidate_email": row.candidate_email,
+        "delivery_status": row.delivery_status,
+        "delivery_error": row.delivery_error,
+        "sent_at": row.sent_at.strftime("%Y-%m-%d %H:%M:%S") if row.sent_at else None,
+        "used": bool(row.used)
+    } for row in rows[:limit]]
+
+    done = counts["sent"] + counts["failed"]
+    return jsonify({
+        "campaign_id": campaign.id,
+        "name": campaign.name,
+        "status": campaign.status,
+        "created_at": campaign.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "completed_at": campaign.completed_at.strftime("%Y-%m-%d %H:%M:%S") if campaign.completed_at else None,
+        "total": campaign.total,
+        "counts": counts,
+        "progress": round(done / campaign.total, 4) if campaign.total else 1.0,
+        "recipients": recipients,
+        "next_after_id": recipients[-1]["invitation_id"] if len(rows) > limit else None
+    }), 200
+# -----------------------
+# Interview Pools
+# -----------------------
+
+def member_pool(pool_id, recruiter_id, include_pending=False):
+    """The pool if the recruiter is a member (or, with include_pending, invited), else None."""
+    query = InterviewPool.query.join(
+        InterviewPoolMember, InterviewPoolMember.pool_id == InterviewPool.id
+    ).filter(InterviewPool.id == pool_id, InterviewPoolMember.recruiter_id == recruiter_id)
+    if not include_pending:
+        query = query.filter(InterviewPoolMember.accepted_at.isnot(None))
+    return query.first()
+
+@main.route("/pools", methods=["POST"])
+@jwt_required()
+def create_pool():
+    data = request.get_json() or {}
+    name = (data.get("name") or "").strip()
+    if not name or len(name) > 100:
+        return jsonify({"error": "Pool name is required (at most 100 characters)"}), 400
+
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+
+    try:
+        pool = InterviewPool(name=name, owner_id=recruiter.id)
+        db.session.add(pool)
+        db.session.flush()
+        db.session.add(InterviewPoolMember(pool_id=pool.id, recruiter_id=recruiter.id, accepted_at=datetime.utcnow()))
+        pool_id = pool.id
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error("Pool creation failed: %s", str(e))
+        return jsonify({"error": "Failed to create pool"}), 500
+    return jsonify({"message": "Pool created", "pool_id": pool_id}), 201
+
+@main.route("/pools", methods=["GET"])
+@jwt_required()
+@read_only
+def my_pools():
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+
+    # Pools the recruiter is in or invited to, with their own acceptance and
+    # the number of accepted members (COUNT skips the NULL accepted_at)
+    mine = db.session.query(InterviewPoolMember.pool_id, InterviewPoolMember.accepted_at).filter(
+        InterviewPoolMember.recruiter_id == recruiter.id
+    ).subquery()
+    rows = db.session.query(
+        InterviewPool.id, InterviewPool.name, InterviewPool.owner_id, mine.c.accepted_at,
+        func.count(InterviewPoolMember.accepted_at)
+    ).join(
+        mine, mine.c.pool_id == InterviewPool.id
+    ).join(
+        InterviewPoolMember, InterviewPoolMember.pool_id == InterviewPool.id
+    ).group_by(
+        InterviewPool.id, InterviewPool.name, InterviewPool.owner_id, mine.c.accepted_at
+    ).order_by(InterviewPool.id).all()
+    return jsonify({"pools": [{
+        "id": pool_id,
+        "name": name,
+        "owner": owner_id == recruiter.id,
+        "pending": accepted_at is None,
+        "member_count": member_count
+    } for pool_id, name, owner_id, accepted_at, member_count in rows]}), 200
+
+@main.route("/pools/<int:pool_id>/members", methods=["POST"])
+@jwt_required()
+def add_pool_members(pool_id):
+    """
+    Invite recruiters by email. They join only once they accept (POST
+    /pools/<id>/accept); until then the pool gets nothing of theirs.
+    """
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+    pool = InterviewPool.query.filter_by(id=pool_id, owner_id=recruiter.id).first()
+    if not pool:
+        return jsonify({"error": "Pool not found"}), 404
+
+    data = request.get_json() or {}
+    emails = data.get("emails")
+    if not isinstance(emails, list) or not emails:
+        return jsonify({"error": "emails must be a non-empty list of recruiter emails"}), 400
+    emails = {str(email).strip().lower() for email in emails}
+
+    found = dict(db.session.query(func.lower(Recruiter.email), Recruiter.id).filter(
+        func.lower(Recruiter.email).in_(emails)
+    ).all())
+    existing = {row.recruiter_id for row in db.session.query(InterviewPoolMember.recruiter_id).filter(
+        InterviewPoolMember.pool_id == pool.id, InterviewPoolMember.recruiter_id.in_(found.values())
+    )}
+    invited = sorted(set(found.values()) - existing)
+    try:
+        if invited:
+            db.session.execute(insert(InterviewPoolMember), [
+                {"pool_id": pool.id, "recruiter_id": recruiter_id} for recruiter_id in invited
+            ])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error("Inviting pool members failed: %s", str(e))
+        return jsonify({"error": "Failed to invite pool members"}), 500
+    return jsonify({"invited": invited, "unknown_emails": sorted(emails - set(found))}), 200
+
+@main.route("/pools/<int:pool_id>/accept", methods=["POST"])
+@jwt_required()
+def accept_pool_invitation(pool_id):
+    """The invited recruiter joins the pool. To decline, they remove themselves."""
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+
+    accepted = InterviewPoolMember.query.filter(
+        InterviewPoolMember.pool_id == pool_id,
+        InterviewPoolMember.recruiter_id == recruiter.id,
+        InterviewPoolMember.accepted_at.is_(None)
+    ).update({"accepted_at": datetime.utcnow()}, synchronize_session=False)
+    db.session.commit()
+    if not accepted:
+        return jsonify({"error": "No pending invitation to this pool"}), 404
+    return jsonify({"message": "Joined pool"}), 200
+
+@main.route("/pools/<int:pool_id>/members/<int:member_id>", methods=["DELETE"])
+@jwt_required()
+def remove_pool_member(pool_id, member_id):
+    """
+    The owner removes a member or withdraws an invitation, or a member leaves
+    (an invited recruiter declines). The owner stays in their pool.
+    """
+    recruiter = current_recruiter()
+    if not recruiter:
+        return jsonify({"error": "Recruiter not found"}), 404
+    pool = member_pool(pool_id, recruiter.id, include_pending=True)
+    if not pool:
+        return jsonify({"error": "Pool not found"}), 404
+    if member_id != recruiter.id and pool.owner_id != recruiter.id:
+        return jsonify({"error": "Only the pool owner can remove other members"}), 403
+    if member_id == pool.owner_id:
+        return jsonify({"error": "The pool owner cannot leave the pool"}), 400
+
+    removed = InterviewPoolMember.query.filter_by(pool_id=pool.id, recruiter_id=member_id).delete()
+    db.session.commit()
+    if not removed:
+        return jsonify({"error": "Not a member of this pool"}), 404
+    return jsonify({"message": "Member removed"}), 200
+
+def serialize_pool_time(entry):
+    return {
+        "date": entry["start_at"].strftime("%Y-%m-%d"),
+        "start_time": entry["start_at"].strftime("%H:%M"),
+        "end_time": entry["end_at"].strftime("%H:%M"),
+        "start_at": entry["start_at"].isoformat(),
+        "end_at": entry["end_at"].isoformat(),
+        "recruiters_available": entry["recruiters_available"]
+    }
+
+@main.route("/public/pools/<int:pool_id>/availability", methods=["GET"])
+@read_only
+def view_pool_availability(pool_id):
+    """The earliest open times across the pool's recruiters, merged into one list."""
+    candidate_tz = request.args.get("tz")
+    if candidate_tz:
+        try:
+            get_zone(candidate_tz)
+        except ZoneInfoNotFoundError:
+            return jsonify({"error": "Unknown timezone"}), 400
+    try:
+        limit = int(request.args.get("limit", current_app.config.get("POOL_AVAILABILITY_LIMIT", 20)))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, current_app.config.get("POOL_AVAILABILITY_MAX_LIMIT", 100)))
+
+    pool = db.session.get(InterviewPool, pool_id)
+    if not pool:
+        return jsonify({"error": "Pool not found"}), 404
+
+    slots = [serialize_pool_time(entry) for entry in earliest_pool_slots(pool_member_ids(pool.id), limit)]
+    result = {"pool": {"id": pool.id, "name": pool.name}}
+    if candidate_tz:
+        return jsonify(dict(result, available_slots=localize_public_slots(slots, candidate_tz), timezone=candidate_tz)), 200
+    return jsonify(dict(result, available_slots=slots)), 200
+
+@main.route("/public/pools/<int:pool_id>/book-slot", methods=["POST"])
+def public_book_pool_slot(pool_id):
+    """
+    Book a time from the pool's availability. The booking goes to the
+    least-loaded member with an open slot at that time (see
+    app/pools.assignment_candidates); if another candidate claims that slot
+    first, the next member in line is tried.
+    """
+    data = request.get_json()
+    candidate_name = data.get("candidate_name")
+    candidate_email = data.get("candidate_email")
+    candidate_position = data.get("candidate_position")
+    invitation_token = data.get("invitation_token")
+
+    if not candidate_name or not candidate_email or not data.get("start_at") or not data.get("end_at") or not invitation_token:
+        return jsonify({"error": "Candidate name, email, start_at, end_at and invitation token are required"}), 400
+    try:
+        start_at = as_utc(datetime.fromisoformat(data["start_at"]))
+        end_at = as_utc(datetime.fromisoformat(data["end_at"]))
+    except (TypeError, ValueError):
+        return jsonify({"error": "start_at and end_at must be ISO 8601 timestamps"}), 400
+
+    invitation = Invitation.query.filter_by(token=invitation_token).first()
+    if not invitation or invitation.pool_id != pool_id:
+        return jsonify({"error": "Invalid invitation token."}), 400
+    if invitation.used:
+        return jsonify({"error": "This invitation link has already been used."}), 400
+    if invitation.expiration < datetime.utcnow():
+        return jsonify({"error": "This invitation link has expired."}), 400
+
+    # Same claim protocol as public_book_slot, one candidate slot at a time
+    assigned = None
+    for slot_id, recruiter_id in assignment_candidates(pool_id, start_at, end_at):
+        if Availability.query.filter(
+            Availability.id == slot_id,
+            Availability.booked.isnot(True)
+        ).update({"booked": True}, synchronize_session=False):
+            assigned = (slot_id, recruiter_id)
+            break
+    if not assigned:
+        db.session.rollback()
+        alternatives = earliest_pool_slots(
+            pool_member_ids(pool_id), current_app.config.get("BOOKING_ALTERNATIVES_LIMIT", 5)
+        )
+        return jsonify({
+            "error": "Slot not available",
+            "alternative_slots": [serialize_pool_time(entry) for entry in alternatives]
+        }), 409
+
+    if not claim_invitation(invitation):
+        db.session.rollback()
+        return jsonify({"error": "This invitation link has already been used."}), 409
+    slot_id, recruiter_id = assigned
+    InterviewPoolMember.query.filter_by(pool_id=pool_id, recruiter_id=recruiter_id).update(
+        {"last_assigned_at": datetime.utcnow()}, synchronize_session=False
+    )
+
+    return complete_public_booking(
+        slot_id, invitation, invitation_token, candidate_name, candidate_email, candidate_position
+    )
+
 #############
 @main.route("/profile", methods=["GET", "OPTIONS"])
 @cross_origin()  # This decorator ensures the response includes CORS headers
 @jwt_required(optional=True)
+@read_only
 def profile():
     if request.method == "OPTIONS":
         response = make_response("")
@@ -696,8 +1613,7 @@ def profile():
         response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
         return response, 200
 
-    email = get_jwt_identity()
-    recruiter = Recruiter.query.filter_by(email=email).first()
+    recruiter = current_recruiter()
     if recruiter:
         return jsonify({
             "id": recruiter.id,
@@ -719,28 +1635,45 @@ def public_cancel_booking():
     if not candidate_name or not candidate_email or not invitation_token:
         return jsonify({"error": "Candidate name, email, and invitation token are required"}), 400
 
-    # Validate invitation token
-    invitation = Invitation.query.filter_by(token=invitation_token).first()
-    if not invitation:
+    # Invitation, booking, booked slot and the booking's recruiter (the inviting
+    # one if there is no linked booking; pool bookings go to another member) in
+    # one query: the unique token index, then ix_booking_invitation_id and the
+    # primary keys.
+    row = (
+        db.session.query(Invitation, Recruiter, Booking, Availability)
+        .select_from(Invitation)
+        .outerjoin(Booking, Booking.invitation_id == Invitation.id)
+        .outerjoin(Availability, Availability.id == Booking.availability_id)
+        .join(Recruiter, Recruiter.id == func.coalesce(Booking.recruiter_id, Invitation.recruiter_id))
+        .filter(Invitation.token == invitation_token)
+        .first()
+    )
+    if not row:
         return jsonify({"error": "Invalid invitation token."}), 400
+    invitation, recruiter, booking, slot = row
     if invitation.expiration < datetime.utcnow():
         return jsonify({"error": "This invitation link has expired."}), 400
     if invitation.cancel_count >= 2:
         return jsonify({"error": "Cancellation limit reached. You cannot cancel more than 2 times."}), 400
 
-    # Find the booking using candidate email. 
-    # (Assuming candidate_email uniquely identifies the booking for this invitation.)
-    booking = Booking.query.filter_by(candidate_email=candidate_email).first()
-    if not booking:
+    if booking is None:
+        # Bookings made before they were linked to their invitation
+        booking = Booking.query.filter_by(
+            recruiter_id=invitation.recruiter_id, candidate_email=candidate_email, invitation_id=None
+        ).first()
+        slot = db.session.get(Availability, booking.availability_id) if booking else None
+    if not booking or booking.candidate_email.lower() != candidate_email.lower():
         return jsonify({"error": "Booking not found."}), 404
 
-    # Get the associated slot.
-    slot = Availability.query.filter_by(id=booking.availability_id).first()
     if slot:
         slot.booked = False  # Mark slot as available
+    # Read before the commit expires them
+    recruiter_name, recruiter_email = recruiter.name, recruiter.email
+    slot_summary = f"{slot.date} from {slot.start_time} to {slot.end_time}" if slot else None
 
     # Remove the booking record.
     db.session.delete(booking)
+    record_daily_stats(booking.recruiter_id, booking.date, cancelled_by_candidate=1)
     
     # Update the invitation: increment cancellation count and mark as unused.
     invitation.cancel_count += 1
@@ -753,6 +1686,10 @@ def public_cancel_booking():
         current_app.logger.error("Cancellation commit error: %s", str(e))
         return jsonify({"error": "Failed to cancel booking due to a server error."}), 500
 
+    slot_cache.invalidate(booking.recruiter_id)
+    note_recruiter_write(booking.recruiter_id)
+    revoke_booking_reminder(booking.reminder_task_id)
+
     # Send email to the candidate confirming cancellation.
     try:
         send_email(
@@ -765,12 +1702,11 @@ def public_cancel_booking():
     
     # Also, send email to the recruiter notifying them about the cancellation.
     try:
-        recruiter = Recruiter.query.filter_by(id=slot.recruiter_id).first()
-        if recruiter:
+        if slot_summary:
             send_email(
-                recruiter.email,
+                recruiter_email,
                 "Booking Cancelled",
-                f"Hello {recruiter.name},\n\nThe booking for the slot on {slot.date} from {slot.start_time} to {slot.end_time} "
+                f"Hello {recruiter_name},\n\nThe booking for the slot on {slot_summary} "
                 f"has been cancelled by {candidate_name} ({candidate_email}).\n\nBest regards,\nYour Scheduler App"
             )
     except Exception as e:
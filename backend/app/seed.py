@@ -0,0 +1,157 @@
+"""
+Synthetic dataset generator behind `flask seed`.
+
+Recruiters work 09:00-17:00 on weekdays in their own timezone, offering
+back-to-back slots starting tomorrow. A share of the slots is booked, each
+booking made with its own invitation, and every recruiter has some further
+open invitations. The daily analytics rollup is filled to match. Rows go in
+with batched multi-row INSERTs and a commit every few recruiters, so memory
+stays flat for millions of slots.
+"""
+import random
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import insert
+from app import db, password_hasher
+from app.models import Availability, Booking, Invitation, Recruiter, RecruiterDailyStats
+from app.stats import record_daily_stats_many
+from app.tz_utils import as_utc, local_to_utc
+
+SEED_TIMEZONES = [
+    "America/New_York", "America/Chicago", "America/Los_Angeles", "America/Toronto",
+    "Europe/London", "Europe/Berlin", "Asia/Kolkata", "Asia/Singapore", "Australia/Sydney", "UTC",
+]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Lee", "Patel", "Garcia", "Nguyen", "Brown", "Khan", "Silva", "Muller", "Kim"]
+POSITIONS = ["Backend Engineer", "Data Analyst", "Product Manager", "Designer", "QA Engineer", None]
+
+
+def _insert_returning_ids(model, rows, batch_size, key, normalize=None):
+    """
+    Insert rows and return their ids in row order, matched up through the
+    unique column key (normalize is applied to the values read back).
+    RETURNING order isn't guaranteed, and asking SQLAlchemy to sort it makes
+    SQLite insert one row per statement.
+    """
+    ids_by_key = {}
+    for offset in range(0, len(rows), batch_size):
+        for row_id, value in db.session.execute(
+            insert(model).returning(model.id, getattr(model, key)),
+            rows[offset:offset + batch_size]
+        ):
+            ids_by_key[normalize(value) if normalize else value] = row_id
+    return [ids_by_key[row[key]] for row in rows]
+
+
+def _local_slot_starts(count, slot_minutes, start_day):
+    """The first count weekday working-hour slot starts (naive local) from start_day on."""
+    per_day = (8 * 60) // slot_minutes
+    starts = []
+    day = start_day
+    while len(starts) < count:
+        if day.weekday() < 5:
+            for i in range(min(per_day, count - len(starts))):
+                starts.append(datetime.combine(day, time(9)) + timedelta(minutes=i * slot_minutes))
+        day += timedelta(days=1)
+    return starts
+
+
+def _candidate(rng, n):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return f"{first} {last}", f"{first}.{last}.{n}@candidates.example.com".lower()
+
+
+def seed_dataset(recruiters=1000, slots_per_recruiter=1000, booked_fraction=0.3, open_invitations=20,
+                 slot_minutes=30, email_domain="seed.example.com", password="seed-password",
+                 batch_size=5000, commit_every=20, random_seed=42, progress=None):
+    """
+    Insert the synthetic dataset and return row counts. Recruiter emails are
+    recruiter<N>@<email_domain>; raises ValueError if that domain is already seeded.
+    """
+    rng = random.Random(random_seed)
+    if Recruiter.query.filter(Recruiter.email.like(f"%@{email_domain}")).first():
+        raise ValueError(f"Recruiters @{email_domain} already exist; pick another --email-domain")
+
+    # One hash shared by every seeded recruiter keeps seeding fast
+    password_hash = password_hasher.hash(password)
+    tomorrow = date.today() + timedelta(days=1)
+    counts = defaultdict(int)
+    candidate_no = 0
+
+    for first in range(0, recruiters, commit_every):
+        chunk = range(first, min(first + commit_every, recruiters))
+        recruiter_rows = [{
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "email": f"recruiter{n}@{email_domain}",
+            "password": password_hash,
+            "timezone": rng.choice(SEED_TIMEZONES),
+        } for n in chunk]
+        recruiter_ids = _insert_returning_ids(Recruiter, recruiter_rows, batch_size, "email")
+
+        for recruiter_id, recruiter_row in zip(recruiter_ids, recruiter_rows):
+            local_starts = _local_slot_starts(slots_per_recruiter, slot_minutes, tomorrow)
+            local_bounds = []
+            for start in local_starts:
+                local_bounds.extend((start, start + timedelta(minutes=slot_minutes)))
+            utc_bounds = local_to_utc(local_bounds, recruiter_row["timezone"])
+
+            slot_rows = []
+            for utc_start, utc_end in zip(utc_bounds[0::2], utc_bounds[1::2]):
+                if utc_end <= utc_start:
+                    continue  # DST gap
+                row = Availability.interval_columns(utc_start, utc_end)
+                row.update(recruiter_id=recruiter_id, booked=rng.random() < booked_fraction, google_event_id=None)
+                slot_rows.append(row)
+            slot_ids = _insert_returning_ids(Availability, slot_rows, batch_size, "start_at", as_utc)
+
+            booked = [(slot_id, row) for slot_id, row in zip(slot_ids, slot_rows) if row["booked"]]
+            invitation_rows, candidates = [], []
+            expiration = datetime.utcnow() + timedelta(days=30)
+            for index in range(len(booked) + open_invitations):
+                candidate_no += 1
+                name, email = _candidate(rng, candidate_no)
+                candidates.append((name, email))
+                invitation_rows.append({
+                    "recruiter_id": recruiter_id,
+                    "token": uuid.uuid4().hex,
+                    "used": index < len(booked),
+                    "cancel_count": 0,
+                    "expiration": expiration,
+                    "candidate_name": name,
+                    "candidate_email": email,
+                })
+            invitation_ids = _insert_returning_ids(Invitation, invitation_rows, batch_size, "token")
+
+            booking_rows = []
+            for (slot_id, slot_row), invitation_id, (name, email) in zip(booked, invitation_ids, candidates):
+                booking_rows.append(dict(
+                    Booking.interval_columns(slot_row["start_at"], slot_row["end_at"]),
+                    candidate_name=name,
+                    candidate_email=email,
+                    candidate_position=rng.choice(POSITIONS),
+                    availability_id=slot_id,
+                    recruiter_id=recruiter_id,
+                    meeting_link=f"https://meet.jit.si/seed{slot_id}",
+                    invitation_id=invitation_id,
+                ))
+            for offset in range(0, len(booking_rows), batch_size):
+                db.session.execute(insert(Booking), booking_rows[offset:offset + batch_size])
+
+            daily = defaultdict(lambda: defaultdict(int))
+            for row in slot_rows:
+                daily[row["date"]]["slots_offered"] += 1
+                if row["booked"]:
+                    daily[row["date"]]["slots_booked"] += 1
+            record_daily_stats_many(recruiter_id, daily)
+
+            counts["availability"] += len(slot_rows)
+            counts["booking"] += len(booking_rows)
+            counts["invitation"] += len(invitation_rows)
+            counts[RecruiterDailyStats.__tablename__] += len(daily)
+
+        counts["recruiter"] += len(recruiter_ids)
+        db.session.commit()
+        if progress:
+            progress(dict(counts))
+    return dict(counts)
@@ -0,0 +1,103 @@
+"""
+Production settings for a SQLite file shared by several gunicorn workers and
+the Celery worker and beat.
+
+- WAL journal, so readers and the writer don't block each other.
+- busy_timeout, so a writer waits for the lock instead of failing with
+  "database is locked".
+- Write transactions start with BEGIN IMMEDIATE. A deferred transaction that
+  reads and then writes can't wait for a lock another process holds; SQLite
+  fails it at once, whatever busy_timeout says. Taking the write lock up
+  front turns those failures into short waits.
+- Separate pools: GET and @read_only requests read through a reader engine
+  with plain (deferred) BEGIN, so read-only work such as OTP checks never holds
+  the write lock. Requests that may write run on the writer engine from their
+  first read, so they read and write under one lock (app/db_routing.py). Its
+  small pool queues a process's writers in Python rather than in SQLite's
+  busy loop.
+
+Applies to file databases only; in-memory SQLite and other databases are
+left untouched. Set SQLITE_TUNING=False to get SQLAlchemy's defaults back.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+READER_BIND = "sqlite_reader"
+
+
+def is_sqlite_file(uri):
+    url = make_url(uri)
+    if url.get_backend_name() != "sqlite":
+        return False
+    database = url.database or ""
+    return database not in ("", ":memory:") and "mode=memory" not in str(url)
+
+
+def _engine_options(app, pool_size):
+    return {
+        "pool_size": pool_size,
+        "max_overflow": 0,
+        "pool_timeout": app.config.get("SQLITE_POOL_TIMEOUT", 10),
+        "connect_args": {
+            # sqlite3's own lock wait, in seconds; matches busy_timeout
+            "timeout": app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000) / 1000,
+            "check_same_thread": False,
+        },
+    }
+
+
+def configure_sqlite(app):
+    """
+    Set engine options for the writer and add the reader bind. Must run
+    before db.init_app, which creates the engines. Returns True if SQLite
+    mode is on.
+    """
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI")
+    if not app.config.get("SQLITE_TUNING", True) or not uri or not is_sqlite_file(uri):
+        return False
+    options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+    for key, value in _engine_options(app, app.config.get("SQLITE_WRITER_POOL_SIZE", 2)).items():
+        options.setdefault(key, value)
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    binds[READER_BIND] = {"url": uri, **_engine_options(app, app.config.get("SQLITE_READER_POOL_SIZE", 4))}
+    return True
+
+
+def _pragmas(app):
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={app.config.get('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA busy_timeout={int(app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        # Negative cache_size is in KiB
+        f"PRAGMA cache_size=-{int(app.config.get('SQLITE_CACHE_SIZE_KB', 20000))}",
+        f"PRAGMA mmap_size={int(app.config.get('SQLITE_MMAP_SIZE_MB', 128)) * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _install_listeners(engine, pragmas, begin_statement):
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        # Stop the sqlite3 module from issuing its own deferred BEGIN before
+        # writes; the begin listener below starts every transaction instead.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        connection.exec_driver_sql(begin_statement)
+
+
+def init_sqlite_engines(app, db):
+    """Install pragmas and BEGIN handling on the engines made by db.init_app and register the reader."""
+    from app.db_routing import set_reader_engine
+
+    with app.app_context():
+        engines = db.engines
+        pragmas = _pragmas(app)
+        _install_listeners(engines[None], pragmas, "BEGIN IMMEDIATE")
+        _install_listeners(engines[READER_BIND], pragmas, "BEGIN")
+        set_reader_engine(app, engines[READER_BIND], reads_before_write=True)
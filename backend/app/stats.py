@@ -0,0 +1,104 @@
+from collections import Counter
+from datetime import date
+from sqlalchemy import func, insert, update
+from app import db
+from app.models import RecruiterDailyStats
+
+STAT_COLUMNS = ("slots_offered", "slots_booked", "cancelled_by_candidate", "cancelled_by_recruiter")
+
+# The recruiter's row on this day holds their running totals, so reading all
+# time counters is one row whatever the length of their history
+TOTALS_DAY = date(1, 1, 1)
+
+
+def _dialect_insert(dialect_name):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def record_daily_stats_many(recruiter_id, deltas_by_day):
+    """
+    Add counter deltas to the recruiter's rollup rows, {day: {column: delta}},
+    and their sum to the running totals row.
+
+    Runs as an INSERT ... ON CONFLICT DO UPDATE (col = col + delta) in the
+    caller's session, so the counters commit or roll back together with the
+    write they describe. Concurrent writers for the same day never lose updates.
+    The totals row goes first: writers for one recruiter queue on it before
+    touching any day, so they can't lock days in opposite orders.
+    """
+    rows = []
+    totals = Counter()
+    for day, deltas in deltas_by_day.items():
+        row = {column: int(deltas.get(column, 0)) for column in STAT_COLUMNS}
+        if any(row.values()):
+            totals.update(row)
+            row.update(recruiter_id=recruiter_id, day=day)
+            rows.append(row)
+    if not rows:
+        return
+    rows.insert(0, dict({column: totals[column] for column in STAT_COLUMNS}, recruiter_id=recruiter_id, day=TOTALS_DAY))
+
+    table = RecruiterDailyStats.__table__
+    dialect_insert = _dialect_insert(db.session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.recruiter_id, table.c.day],
+            set_={column: table.c[column] + stmt.excluded[column] for column in STAT_COLUMNS}
+        )
+        db.session.execute(stmt, rows)
+        return
+
+    # Other backends: update in place, insert the days that have no row yet
+    for row in rows:
+        result = db.session.execute(
+            update(table)
+            .where(table.c.recruiter_id == recruiter_id, table.c.day == row["day"])
+            .values({column: table.c[column] + row[column] for column in STAT_COLUMNS})
+        )
+        if result.rowcount == 0:
+            db.session.execute(insert(table), [row])
+
+
+def record_daily_stats(recruiter_id, day, **deltas):
+    record_daily_stats_many(recruiter_id, {day: deltas})
+
+
+def running_totals(recruiter_id):
+    """All time counters of the recruiter: their TOTALS_DAY row, zeros if they have none yet."""
+    row = db.session.query(*[getattr(RecruiterDailyStats, column) for column in STAT_COLUMNS]).filter(
+        RecruiterDailyStats.recruiter_id == recruiter_id, RecruiterDailyStats.day == TOTALS_DAY
+    ).first()
+    return dict(zip(STAT_COLUMNS, row or (0,) * len(STAT_COLUMNS)))
+
+
+def stats_totals(recruiter_id, day_from=None, day_to=None):
+    """
+    Summed counters over the recruiter's daily rows, optionally limited to
+    [day_from, day_to]; one row per day with activity in the range.
+    """
+    query = db.session.query(*[
+        func.coalesce(func.sum(getattr(RecruiterDailyStats, column)), 0) for column in STAT_COLUMNS
+    ]).filter(RecruiterDailyStats.recruiter_id == recruiter_id, RecruiterDailyStats.day > TOTALS_DAY)
+    if day_from is not None:
+        query = query.filter(RecruiterDailyStats.day >= day_from)
+    if day_to is not None:
+        query = query.filter(RecruiterDailyStats.day <= day_to)
+    return dict(zip(STAT_COLUMNS, (int(value) for value in query.one())))
+
+
+def stats_series(recruiter_id, day_from, day_to):
+    """Rollup rows for [day_from, day_to] keyed by day; days without activity are absent."""
+    rows = RecruiterDailyStats.query.filter(
+        RecruiterDailyStats.recruiter_id == recruiter_id,
+        RecruiterDailyStats.day > TOTALS_DAY,
+        RecruiterDailyStats.day >= day_from,
+        RecruiterDailyStats.day <= day_to
+    ).all()
+    return {row.day: {column: getattr(row, column) for column in STAT_COLUMNS} for row in rows}
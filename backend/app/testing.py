@@ -0,0 +1,94 @@
+"""
+pytest fixtures for SQL query budgets. Load them from a conftest.py:
+
+    pytest_plugins = ["app.testing"]
+
+    def test_my_availability(client, auth_headers, query_budget):
+        with query_budget():
+            client.get("/my-availability", headers=auth_headers)
+
+Every request made inside query_budget() is checked against its endpoint's
+entry in ENDPOINT_QUERY_BUDGETS (or the overrides passed in), counting
+statements other than batched INSERT/UPDATE rounds, transaction control and
+what eagerly run Celery tasks execute. A request over budget, or
+one repeating a statement more than max_repeats times, fails the test with the
+offending statements and the lines that ran them. The app under test must be
+created with QUERY_AUDIT set ("record" is enough) so that each request gets
+its own log; "raise" also fails N+1 patterns in requests outside the fixture.
+"""
+from contextlib import contextmanager
+import pytest
+from app.query_audit import record_queries
+
+# Statements per request as measured on tuned SQLite with a cold identity
+# cache (the export rows stream after the request and aren't included); keep
+# them tight so that a new lazy load or per-row query shows up as a failing test.
+ENDPOINT_QUERY_BUDGETS = {
+    "main.register_recruiter": 3,
+    "main.login": 1,
+    "main.verify_otp": 1,
+    "main.forgot_password": 1,
+    "main.reset_password": 2,
+    "main.profile": 1,
+    "main.view_public_availability": 1,
+    "main.my_availability": 2,
+    "main.analytics": 5,
+    "main.export_bookings": 1,
+    "main.export_availability": 1,
+    "main.set_availability": 5,
+    "main.set_recurring_availability": 2,
+    "main.set_daily_availability": 3,
+    "main.set_bulk_availability": 2,
+    "main.update_availability": 5,
+    "main.delete_availability": 5,
+    "main.cancel_booking": 7,
+    "main.public_book_slot": 7,
+    "main.public_cancel_booking": 5,
+    "main.send_invitation": 2,
+    "main.send_bulk_invitations": 2,
+    "main.invitation_campaign_status": 4,
+    "main.create_pool": 3,
+    "main.my_pools": 2,
+    "main.add_pool_members": 4,
+    "main.accept_pool_invitation": 2,
+    "main.remove_pool_member": 3,
+    "main.view_pool_availability": 4,
+    "main.public_book_pool_slot": 10,
+}
+DEFAULT_MAX_REPEATS = 2
+
+
+def budget_violations(log, budgets=None, max_repeats=DEFAULT_MAX_REPEATS):
+    """Descriptions of the requests recorded under log that broke their budget."""
+    budgets = {**ENDPOINT_QUERY_BUDGETS, **(budgets or {})}
+    violations = []
+    for request_log in log.children:
+        budget = budgets.get(request_log.label)
+        queries = request_log.own
+        if budget is not None and queries > budget:
+            violations.append(
+                f"{request_log.label} ran {queries} statements, budget {budget}\n"
+                + request_log.report(0)
+            )
+        elif request_log.repeated(max_repeats):
+            violations.append(f"{request_log.label} repeated a statement\n" + request_log.report(max_repeats))
+    return violations
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Context manager factory: query_budget(budgets=None, max_repeats=2).
+    budgets overrides ENDPOINT_QUERY_BUDGETS per endpoint name for this block.
+    """
+    @contextmanager
+    def check(budgets=None, max_repeats=DEFAULT_MAX_REPEATS):
+        with record_queries("query budget") as log:
+            yield log
+        if log.total and not log.children:
+            pytest.fail("query_budget saw no requests; create the app with QUERY_AUDIT set", pytrace=False)
+        violations = budget_violations(log, budgets, max_repeats)
+        if violations:
+            pytest.fail("Query budget exceeded:\n" + "\n\n".join(violations), pytrace=False)
+
+    return check
@@ -0,0 +1,145 @@
+import bisect
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+UTC = ZoneInfo("UTC")
+
+# Offsets are sampled at this step when looking for transitions; real zones
+# never change offset twice within six hours.
+_SAMPLE_STEP = timedelta(hours=6)
+
+def as_utc(dt):
+    """
+    Return dt as an aware UTC datetime.
+    SQLite hands timezone-aware columns back as naive values (always UTC here).
+    """
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+def utc_now():
+    return datetime.now(UTC)
+
+@lru_cache(maxsize=512)
+def get_zone(name):
+    """Cached ZoneInfo lookup; raises ZoneInfoNotFoundError for unknown names."""
+    if not name:
+        return UTC
+    try:
+        return ZoneInfo(name)
+    except (ValueError, ZoneInfoNotFoundError) as e:
+        raise ZoneInfoNotFoundError(f"Unknown timezone: {name}") from e
+
+def is_valid_zone(name):
+    try:
+        get_zone(name)
+        return True
+    except ZoneInfoNotFoundError:
+        return False
+
+@lru_cache(maxsize=4096)
+def _fixed_offset(offset):
+    return timezone(offset)
+
+def _offset_at(zone, instant):
+    return instant.astimezone(zone).utcoffset()
+
+@lru_cache(maxsize=2048)
+def _year_transitions(zone_name, year):
+    """
+    UTC instants in the given year at which the zone's offset changes, as
+    (instant, offset_before, offset_after). Found by sampling every six hours
+    and bisecting each change down to the second.
+    """
+    zone = get_zone(zone_name)
+    t = datetime(year, 1, 1, tzinfo=UTC)
+    end = datetime(year + 1, 1, 1, tzinfo=UTC)
+    previous = _offset_at(zone, t)
+    transitions = []
+    while t < end:
+        nxt = min(t + _SAMPLE_STEP, end)
+        offset = _offset_at(zone, nxt)
+        if offset != previous:
+            lo, hi = t, nxt
+            while hi - lo > timedelta(seconds=1):
+                mid = lo + (hi - lo) / 2
+                if _offset_at(zone, mid) == previous:
+                    lo = mid
+                else:
+                    hi = mid
+            transitions.append((hi.replace(microsecond=0), previous, offset))
+            previous = offset
+        t = nxt
+    return tuple(transitions)
+
+
+class ZoneWindow:
+    """
+    UTC-offset transition table for one zone over a window of instants, used
+    to convert whole lists of datetimes with a bisect per item instead of a
+    tzinfo lookup per item.
+
+    Local -> UTC follows the same rules as datetime.replace(tzinfo=zone) with
+    fold=0: ambiguous times take the earlier (pre-transition) offset, and
+    times inside a gap are shifted with the pre-transition offset as well.
+    """
+
+    def __init__(self, zone_name, start, end):
+        zone = get_zone(zone_name)
+        start = as_utc(start) - timedelta(days=1)
+        end = as_utc(end) + timedelta(days=1)
+        self._instants = []
+        self._local_thresholds = []
+        self._offsets = [_offset_at(zone, start)]
+        for year in range(start.year, end.year + 1):
+            for instant, before, after in _year_transitions(zone_name, year):
+                if start < instant <= end:
+                    self._instants.append(instant)
+                    # First local wall time that maps to the new offset
+                    self._local_thresholds.append((instant + max(before, after)).replace(tzinfo=None))
+                    self._offsets.append(after)
+
+    def offset_for_utc(self, dt):
+        return self._offsets[bisect.bisect_right(self._instants, dt)]
+
+    def offset_for_local(self, naive_dt):
+        return self._offsets[bisect.bisect_right(self._local_thresholds, naive_dt)]
+
+    def to_local(self, utc_dts):
+        """Aware UTC datetimes -> aware local datetimes (fixed-offset tzinfo)."""
+        result = []
+        for dt in utc_dts:
+            offset = self.offset_for_utc(dt)
+            result.append((dt + offset).replace(tzinfo=_fixed_offset(offset)))
+        return result
+
+    def to_utc(self, naive_local_dts):
+        """Naive local wall times -> aware UTC datetimes."""
+        return [
+            (dt - self.offset_for_local(dt)).replace(tzinfo=UTC)
+            for dt in naive_local_dts
+        ]
+
+
+def local_to_utc(naive_local_dts, zone_name):
+    """Convert a list of naive local wall times in zone_name to aware UTC datetimes."""
+    naive_local_dts = list(naive_local_dts)
+    if not naive_local_dts:
+        return []
+    window = ZoneWindow(
+        zone_name,
+        min(naive_local_dts).replace(tzinfo=UTC),
+        max(naive_local_dts).replace(tzinfo=UTC)
+    )
+    return window.to_utc(naive_local_dts)
+
+def utc_to_local(utc_dts, zone_name):
+    """Convert a list of UTC datetimes (aware, or naive meaning UTC) to local time in zone_name."""
+    utc_dts = [as_utc(dt) for dt in utc_dts]
+    if not utc_dts:
+        return []
+    window = ZoneWindow(zone_name, min(utc_dts), max(utc_dts))
+    return window.to_local(utc_dts)
@@ -1,94 +1,196 @@
-import time
-import jwt
-import requests
-from datetime import datetime, timedelta
+import os
 import random, string
+import threading
+from datetime import timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import current_app
 from app import db
+from app.metrics import timed_outbound
+from app.tz_utils import as_utc, utc_now
+
+ZOOM_TOKEN_URL = "https://zoom.us/oauth/token"
+ZOOM_API_URL = "https://api.zoom.us/v2"
+
+
+class ZoomError(Exception):
+    """A Zoom API call failed after retries (or was rejected outright)."""
+
 
 def generate_random_meeting_link():
     """Generate a random meeting link as a fallback."""
     random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
     return "https://meet.google.com/" + random_str
 
+def generate_jitsi_meeting_link():
+    """Jitsi Meet rooms need no API call, so they are the fallback for failed Zoom meetings."""
+    random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
+    return f"https://meet.jit.si/{random_str}"
+
+
+class ZoomClient:
+    """
+    Zoom OAuth/API client sharing one pooled requests.Session per process.
+
+    Every call has a (connect, read) timeout. Connection failures and 429/503
+    answers are retried a bounded number of times with exponential backoff
+    (honouring Retry-After); other errors are not, since a repeated meeting
+    POST after a lost response would create a duplicate meeting.
+    """
+
+    def __init__(self, app=None):
+        self.timeout = (3.05, 10)
+        self.retries = 3
+        self.backoff = 0.5
+        self.pool_size = 10
+        self.refresh_margin = timedelta(minutes=15)
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.timeout = (
+            app.config.get("ZOOM_CONNECT_TIMEOUT", self.timeout[0]),
+            app.config.get("ZOOM_READ_TIMEOUT", self.timeout[1])
+        )
+        self.retries = app.config.get("ZOOM_HTTP_RETRIES", self.retries)
+        self.backoff = app.config.get("ZOOM_HTTP_BACKOFF", self.backoff)
+        self.refresh_margin = timedelta(minutes=app.config.get("ZOOM_TOKEN_REFRESH_MARGIN_MINUTES", 15))
+        app.extensions["zoom_client"] = self
+
+    @property
+    def session(self):
+        # Sessions (and their sockets) must not be shared across a fork
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    retry = Retry(
+                        total=self.retries,
+                        connect=self.retries,
+                        read=0,
+                        status=self.retries,
+                        status_forcelist=(429, 503),
+                        allowed_methods=None,
+                        backoff_factor=self.backoff,
+                        raise_on_status=False
+                    )
+                    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.pool_size, max_retries=retry)
+                    session = requests.Session()
+                    session.mount("https://", adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def _post(self, operation, url, **kwargs):
+        try:
+            with timed_outbound("zoom", operation) as call:
+                response = self.session.post(url, timeout=self.timeout, **kwargs)
+                call["outcome"] = str(response.status_code)
+                return response
+        except requests.RequestException as e:
+            raise ZoomError(str(e)) from e
+
+    def token_expiring(self, recruiter):
+        """True if the recruiter's access token is missing, of unknown age, or inside the refresh margin."""
+        expires_at = as_utc(recruiter.zoom_token_expires_at)
+        return expires_at is None or expires_at - self.refresh_margin <= utc_now()
+
+    def refresh_token(self, recruiter):
+        """
+        Exchange the stored refresh token for a new token pair and record its
+        expiry. The caller commits.
+        """
+        if not recruiter.zoom_refresh_token:
+            raise ZoomError("Recruiter has not connected Zoom")
+        response = self._post(
+            "refresh_token",
+            ZOOM_TOKEN_URL,
+            params={"grant_type": "refresh_token", "refresh_token": recruiter.zoom_refresh_token},
+            auth=(current_app.config.get("ZOOM_CLIENT_ID"), current_app.config.get("ZOOM_CLIENT_SECRET"))
+        )
+        if response.status_code != 200:
+            raise ZoomError(f"Token refresh failed ({response.status_code}): {response.text}")
+        token_info = response.json()
+        recruiter.zoom_access_token = token_info.get("access_token")
+        recruiter.zoom_refresh_token = token_info.get("refresh_token", recruiter.zoom_refresh_token)
+        recruiter.zoom_token_expires_at = utc_now() + timedelta(seconds=int(token_info.get("expires_in", 3600)))
+
+    def create_meeting(self, recruiter, slot):
+        """Create a scheduled meeting for the slot; returns the join_url or raises ZoomError."""
+        if not recruiter.zoom_access_token and not recruiter.zoom_refresh_token:
+            raise ZoomError("Recruiter has not connected Zoom")
+        if self.token_expiring(recruiter):
+            self.refresh_token(recruiter)
+            db.session.commit()
+
+        slot_start_dt = as_utc(slot.start_at)
+        duration = int((as_utc(slot.end_at) - slot_start_dt).total_seconds() // 60) or 30
+        meeting_details = {
+            "topic": "Interview Meeting",
+            "type": 2,  # Scheduled meeting
+            "start_time": slot_start_dt.strftime("%Y-%m-%dT%H:%M:%SZ"),  # ISO 8601 format in UTC
+            "duration": duration,  # Meeting duration in minutes
+            "timezone": "UTC",
+            "agenda": "Interview scheduled via Scheduler App",
+            "settings": {
+                "host_video": True,
+                "participant_video": True,
+                "join_before_host": False,
+                "mute_upon_entry": True
+            }
+        }
+
+        response = self._post(
+            "create_meeting",
+            f"{ZOOM_API_URL}/users/me/meetings",
+            headers={"authorization": f"Bearer {recruiter.zoom_access_token}"},
+            json=meeting_details
+        )
+        if response.status_code == 401:
+            # Revoked or rotated elsewhere despite a valid expiry; refresh once
+            self.refresh_token(recruiter)
+            db.session.commit()
+            response = self._post(
+                "create_meeting",
+                f"{ZOOM_API_URL}/users/me/meetings",
+                headers={"authorization": f"Bearer {recruiter.zoom_access_token}"},
+                json=meeting_details
+            )
+        if response.status_code != 201:
+            raise ZoomError(f"Meeting creation failed ({response.status_code}): {response.text}")
+        join_url = response.json().get("join_url")
+        if not join_url:
+            raise ZoomError("Zoom meeting created but join_url missing")
+        return join_url
+
+
+zoom_client = ZoomClient()
+
+
 def refresh_zoom_token(recruiter):
     """
     Refresh the Zoom access token using the stored refresh token.
     Returns True if refresh is successful; False otherwise.
     """
-    token_url = "https://zoom.us/oauth/token"
-    params = {
-        "grant_type": "refresh_token",
-        "refresh_token": recruiter.zoom_refresh_token
-    }
-    auth = (
-        current_app.config.get("ZOOM_CLIENT_ID"),
-        current_app.config.get("ZOOM_CLIENT_SECRET")
-    )
-    response = requests.post(token_url, params=params, auth=auth)
-    if response.status_code == 200:
-        token_info = response.json()
-        recruiter.zoom_access_token = token_info.get("access_token")
-        recruiter.zoom_refresh_token = token_info.get("refresh_token")
-        # Optionally, store token expiry if desired
-        db.session.commit()
-        return True
-    else:
-        current_app.logger.error("Zoom token refresh failed: %s", response.text)
+    try:
+        zoom_client.refresh_token(recruiter)
+    except ZoomError as e:
+        db.session.rollback()
+        current_app.logger.error("Zoom token refresh failed: %s", str(e))
         return False
+    db.session.commit()
+    return True
 
 def create_zoom_meeting(recruiter, slot):
     """
     Create a Zoom meeting using the recruiter's stored access token and slot information.
     Returns the join_url if meeting is created successfully; otherwise returns a fallback meeting link.
     """
-    access_token = getattr(recruiter, "zoom_access_token", None)
-    if not access_token:
-        current_app.logger.error("Recruiter has not connected Zoom. Using fallback meeting link.")
-        return generate_random_meeting_link()
-
-    url = "https://api.zoom.us/v2/users/me/meetings"
-    # Combine slot.date and slot.start_time into a datetime object (assuming stored in UTC)
-    slot_start_dt = datetime.combine(slot.date, slot.start_time)
-    meeting_details = {
-        "topic": "Interview Meeting",
-        "type": 2,  # Scheduled meeting
-        "start_time": slot_start_dt.isoformat() + "Z",  # ISO 8601 format in UTC
-        "duration": 30,  # Meeting duration in minutes; adjust as needed
-        "timezone": "UTC",
-        "agenda": "Interview scheduled via Scheduler App",
-        "settings": {
-            "host_video": True,
-            "participant_video": True,
-            "join_before_host": False,
-            "mute_upon_entry": True
-        }
-    }
-    headers = {
-        "authorization": f"Bearer {access_token}",
-        "content-type": "application/json"
-    }
-    response = requests.post(url, headers=headers, json=meeting_details)
-    if response.status_code == 201:
-        meeting_info = response.json()
-        join_url = meeting_info.get("join_url")
-        if join_url:
-            return join_url
-        else:
-            current_app.logger.error("Zoom meeting created but join_url missing; using fallback.")
-            return generate_random_meeting_link()
-    elif response.status_code == 401:
-        # Possibly token expired: try refreshing token and retry once.
-        if refresh_zoom_token(recruiter):
-            headers["authorization"] = f"Bearer {recruiter.zoom_access_token}"
-            response = requests.post(url, headers=headers, json=meeting_details)
-            if response.status_code == 201:
-                meeting_info = response.json()
-                join_url = meeting_info.get("join_url")
-                if join_url:
-                    return join_url
-        current_app.logger.error("Zoom meeting creation failed after token refresh: %s", response.text)
-        return generate_random_meeting_link()
-    else:
-        current_app.logger.error("Zoom meeting creation failed: %s", response.text)
+    try:
+        return zoom_client.create_meeting(recruiter, slot)
+    except ZoomError as e:
+        current_app.logger.error("Zoom meeting creation failed: %s. Using fallback meeting link.", str(e))
         return generate_random_meeting_link()
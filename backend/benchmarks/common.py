@@ -0,0 +1,93 @@
+"""
+Shared helpers for the scripts in benchmarks/.
+
+Benchmarks run against a real gunicorn started here with a throwaway SQLite
+database and MAIL_SUPPRESS_SEND=True, so nothing leaves the machine.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentiles(latencies):
+    """p50/p95/p99/max in milliseconds for a list of latencies in seconds."""
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def write_results(path, results):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"Results written to {path}")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LocalServer:
+    """
+    gunicorn serving application:app on a free port with its own SQLite file.
+    Use as a context manager; the schema is created before the server starts.
+    """
+
+    def __init__(self, gunicorn_args=("-w", "4"), env=None):
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._tmpdir = tempfile.mkdtemp(prefix="scheduling-bench-")
+        self.env = dict(os.environ)
+        self.env.update({
+            "DATABASE_URL": f"sqlite:///{os.path.join(self._tmpdir, 'bench.db')}",
+            "MAIL_SUPPRESS_SEND": "True",
+            "MAIL_DEFAULT_SENDER": "bench@example.com",
+            "CELERY_TASK_ALWAYS_EAGER": "True",
+            "OTP_STORE_URL": os.environ.get("OTP_STORE_URL", "memory://"),
+        })
+        self.env.update(env or {})
+        self.gunicorn_args = list(gunicorn_args)
+        self._process = None
+
+    def __enter__(self):
+        subprocess.run(
+            [sys.executable, "-c", "from app import create_app, db\napp = create_app()\nwith app.app_context(): db.create_all()"],
+            cwd=BACKEND_DIR, env=self.env, check=True,
+        )
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", *self.gunicorn_args, "-b", f"127.0.0.1:{self.port}", "application:app"],
+            cwd=BACKEND_DIR, env=self.env,
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                requests.get(f"{self.base_url}/public/availability/0", timeout=1)
+                return self
+            except requests.RequestException:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("gunicorn did not start")
+
+    def __exit__(self, *exc):
+        if self._process:
+            self._process.terminate()
+            self._process.wait(timeout=10)
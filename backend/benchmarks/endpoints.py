@@ -0,0 +1,507 @@
+"""
+Throughput and p50/p95/p99 latency of every route in app/routes.py.
+
+    python -m benchmarks.endpoints --recruiters 50 --slots-per-recruiter 500 --requests 100 --out endpoints.json
+    python -m benchmarks.endpoints --gunicorn --workers 4 --concurrency 8 --out endpoints_gunicorn.json
+    python -m benchmarks.endpoints --only public_availability,my_availability --requests 1000
+
+Builds a throwaway SQLite database seeded with `flask seed` (or uses
+DATABASE_URL with --database-url and --no-seed), then times each endpoint
+through the Flask test client, or through a local gunicorn with --gunicorn.
+Mail is suppressed, Celery publishes to an in-memory broker that nobody
+consumes, and in test-client mode outbound HTTP (Zoom) is stubbed; seeded
+recruiters have no Zoom or Google credentials, so gunicorn mode makes no
+external calls either. Request payloads and fixtures are prepared before each
+endpoint's timed run. verify-otp and reset-password read codes from the
+captured outbox and are only measured in test-client mode.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_PASSWORD = "bench-password"
+
+
+class ClientDriver:
+    """Requests through app.test_client(), one at a time."""
+
+    concurrency = 1
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def send(self, spec):
+        response = self.client.open(
+            spec["path"], method=spec["method"], json=spec.get("json"), data=spec.get("data"),
+            headers=spec.get("headers"), content_type=spec.get("content_type"),
+            # Read streamed bodies (exports) inside the timing too
+            buffered=True
+        )
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPDriver:
+    """Requests over HTTP to a running server, from a pool of threads."""
+
+    def __init__(self, base_url, concurrency):
+        import requests
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self._local = threading.local()
+        self._requests = requests
+
+    def send(self, spec):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        headers = dict(spec.get("headers") or {})
+        if spec.get("content_type"):
+            headers["Content-Type"] = spec["content_type"]
+        response = session.request(
+            spec["method"], self.base_url + spec["path"], json=spec.get("json"), data=spec.get("data"), headers=headers
+        )
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+
+def run_specs(driver, specs):
+    """Send every spec; returns (latencies, statuses, wall time, responses)."""
+    latencies, statuses, responses = [], {}, [None] * len(specs)
+    lock = threading.Lock()
+
+    def one(index):
+        started = time.perf_counter()
+        status, body = driver.send(specs[index])
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+            responses[index] = body
+
+    started = time.perf_counter()
+    if driver.concurrency > 1:
+        with ThreadPoolExecutor(max_workers=driver.concurrency) as pool:
+            list(pool.map(one, range(len(specs))))
+    else:
+        for index in range(len(specs)):
+            one(index)
+    return latencies, statuses, time.perf_counter() - started, responses
+
+
+class Fixtures:
+    """Test data for the write endpoints, created directly in the database."""
+
+    def __init__(self, app, rng, seeded_recruiter_ids):
+        from app import db, password_hasher
+        from app.models import Recruiter
+        self.app = app
+        self.rng = rng
+        self.seeded_recruiter_ids = seeded_recruiter_ids
+        self.outbox = []
+        self.registered_emails = []
+        with app.app_context():
+            recruiter = Recruiter(
+                name="Bench Recruiter",
+                email=f"bench-{uuid.uuid4().hex[:8]}@bench.example.com",
+                password=password_hasher.hash(BENCH_PASSWORD),
+                timezone="UTC"
+            )
+            db.session.add(recruiter)
+            db.session.commit()
+            self.bench_id, self.bench_email = recruiter.id, recruiter.email
+        self._next_day = date.today() + timedelta(days=3650)
+        self._pool_id = None
+
+    def token_headers(self, recruiter_id):
+        from flask_jwt_extended import create_access_token
+        from app import db
+        from app.auth_utils import recruiter_claims
+        from app.models import Recruiter
+        with self.app.app_context():
+            recruiter = db.session.get(Recruiter, recruiter_id)
+            token = create_access_token(identity=recruiter.email, additional_claims=recruiter_claims(recruiter))
+        return {"Authorization": f"Bearer {token}"}
+
+    def fresh_days(self, n, spacing=1):
+        """n future dates no other fixture or request has used."""
+        days = [self._next_day + timedelta(days=i * spacing) for i in range(n)]
+        self._next_day += timedelta(days=n * spacing + 1)
+        return days
+
+    def open_slots(self, n):
+        """n open one-hour slots for the bench recruiter, on unused days."""
+        from sqlalchemy import insert
+        from app import db
+        from app.models import Availability
+        from app.tz_utils import UTC
+        rows = []
+        for day in self.fresh_days(n):
+            start = datetime.combine(day, datetime.min.time(), tzinfo=UTC) + timedelta(hours=9)
+            row = Availability.interval_columns(start, start + timedelta(hours=1))
+            row.update(recruiter_id=self.bench_id, booked=False, google_event_id=None)
+            rows.append(row)
+        with self.app.app_context():
+            ids = list(db.session.scalars(
+                insert(Availability).returning(Availability.id, sort_by_parameter_order=True), rows
+            ))
+            db.session.commit()
+        return ids
+
+    def invitations(self, n):
+        """n unused invitation tokens of the bench recruiter, with candidate emails."""
+        from sqlalchemy import insert
+        from app import db
+        from app.models import Invitation
+        rows = [{
+            "recruiter_id": self.bench_id,
+            "token": uuid.uuid4().hex,
+            "used": False,
+            "cancel_count": 0,
+            "expiration": datetime.utcnow() + timedelta(days=2),
+            "candidate_name": "Bench Candidate",
+            "candidate_email": f"candidate-{uuid.uuid4().hex[:12]}@bench.example.com",
+        } for _ in range(n)]
+        with self.app.app_context():
+            db.session.execute(insert(Invitation), rows)
+            db.session.commit()
+        return [(row["token"], row["candidate_email"]) for row in rows]
+
+    def book_slot_specs(self, n):
+        specs = []
+        for slot_id, (token, email) in zip(self.open_slots(n), self.invitations(n)):
+            specs.append({"method": "POST", "path": "/public/book-slot", "json": {
+                "candidate_name": "Bench Candidate", "candidate_email": email,
+                "availability_id": slot_id, "invitation_token": token, "candidate_position": "Engineer"
+            }})
+        return specs
+
+    def bench_bookings(self):
+        """(booking id, invitation token, candidate email) of the bench recruiter's bookings."""
+        from app import db
+        from app.models import Booking, Invitation
+        with self.app.app_context():
+            return db.session.query(Booking.id, Invitation.token, Booking.candidate_email).join(
+                Invitation, Invitation.id == Booking.invitation_id
+            ).filter(Booking.recruiter_id == self.bench_id).all()
+
+    def seeded_pool(self):
+        """Id of a pool owned by the bench recruiter whose members are all the seeded recruiters."""
+        if self._pool_id is None:
+            from sqlalchemy import insert
+            from app import db
+            from app.models import InterviewPool, InterviewPoolMember
+            with self.app.app_context():
+                pool = InterviewPool(name="Bench pool", owner_id=self.bench_id)
+                db.session.add(pool)
+                db.session.flush()
+                member_ids = set(self.seeded_recruiter_ids) | {self.bench_id}
+                db.session.execute(insert(InterviewPoolMember), [
+                    {"pool_id": pool.id, "recruiter_id": recruiter_id} for recruiter_id in member_ids
+                ])
+                db.session.commit()
+                self._pool_id = pool.id
+        return self._pool_id
+
+    def last_emails(self, subject, count):
+        return [message for message in self.outbox if message.subject == subject][-count:]
+
+
+def build_cases(fx, driver, in_process):
+    """(name, prepare(n) -> specs) for every route, in an order where later cases reuse earlier data."""
+    bench = lambda: fx.token_headers(fx.bench_id)
+    seeded = lambda: fx.rng.choice(fx.seeded_recruiter_ids)
+
+    def register(n):
+        emails = [f"reg-{uuid.uuid4().hex[:12]}@bench.example.com" for _ in range(n)]
+        fx.registered_emails.extend(emails)
+        return [{"method": "POST", "path": "/register", "json": {
+            "name": "Registered", "email": email, "password": BENCH_PASSWORD, "timezone": "America/New_York"
+        }} for email in emails]
+
+    def login(n):
+        return [{"method": "POST", "path": "/login", "json": {"email": fx.bench_email, "password": BENCH_PASSWORD}}
+                for _ in range(n)]
+
+    def verify_otp(n):
+        # Each code belongs to a different recruiter: a new login replaces the previous code
+        emails = fx.registered_emails[:n]
+        run_specs(driver, [{"method": "POST", "path": "/login", "json": {"email": email, "password": BENCH_PASSWORD}}
+                           for email in emails])
+        codes = [m.body.split("password is: ")[1].split()[0] for m in fx.last_emails("Your OTP for Login", len(emails))]
+        return [{"method": "POST", "path": "/verify-otp", "json": {"email": email, "otp": code}}
+                for email, code in zip(emails, codes)]
+
+    def forgot_password(n):
+        return [{"method": "POST", "path": "/forgot-password", "json": {"email": fx.bench_email}} for _ in range(n)]
+
+    def reset_password(n):
+        run_specs(driver, forgot_password(n))
+        tokens = [m.body.rsplit("/", 1)[1].strip() for m in fx.last_emails("Password Reset Request", n)]
+        return [{"method": "POST", "path": "/reset-password", "json": {"token": token, "new_password": BENCH_PASSWORD}}
+                for token in tokens]
+
+    def profile(n):
+        return [{"method": "GET", "path": "/profile", "headers": fx.token_headers(seeded())} for _ in range(n)]
+
+    def public_availability(n):
+        return [{"method": "GET", "path": f"/public/availability/{seeded()}"} for _ in range(n)]
+
+    def public_availability_tz(n):
+        return [{"method": "GET", "path": f"/public/availability/{seeded()}?tz=Europe/Berlin"} for _ in range(n)]
+
+    def pool_availability(n):
+        pool_id = fx.seeded_pool()
+        return [{"method": "GET", "path": f"/public/pools/{pool_id}/availability?limit=50"} for _ in range(n)]
+
+    def my_availability(n):
+        return [{"method": "GET", "path": "/my-availability", "headers": fx.token_headers(seeded())} for _ in range(n)]
+
+    def analytics(n):
+        today = date.today()
+        path = f"/analytics?from={today}&to={today + timedelta(days=90)}"
+        return [{"method": "GET", "path": path, "headers": fx.token_headers(seeded())} for _ in range(n)]
+
+    def export_bookings(n):
+        return [{"method": "GET", "path": "/export/bookings", "headers": fx.token_headers(seeded())} for _ in range(n)]
+
+    def export_availability(n):
+        return [{"method": "GET", "path": "/export/availability?format=ndjson", "headers": fx.token_headers(seeded())}
+                for _ in range(n)]
+
+    def set_availability(n):
+        headers = bench()
+        return [{"method": "POST", "path": "/set-availability", "headers": headers, "json": {
+            "date": day.isoformat(), "start_time": "09:00", "end_time": "10:00"
+        }} for day in fx.fresh_days(n)]
+
+    def set_recurring(n):
+        headers = bench()
+        return [{"method": "POST", "path": "/set-recurring-availability", "headers": headers, "json": {
+            "start_date": day.isoformat(), "end_date": (day + timedelta(days=28)).isoformat(),
+            "start_time": "09:00", "end_time": "10:00"
+        }} for day in fx.fresh_days(n, spacing=35)]
+
+    def set_daily(n):
+        headers = bench()
+        return [{"method": "POST", "path": "/set-daily-availability", "headers": headers, "json": {
+            "date": day.isoformat(), "start_time": "09:00", "end_time": "17:00", "duration": "30"
+        }} for day in fx.fresh_days(n)]
+
+    def set_bulk(n):
+        headers = bench()
+        return [{"method": "POST", "path": "/set-availability/bulk", "headers": headers, "json": {
+            "dates": [(day + timedelta(days=i)).isoformat() for i in range(5)],
+            "ranges": [{"start_time": "09:00", "end_time": "17:00"}], "duration": 30
+        }} for day in fx.fresh_days(n, spacing=6)]
+
+    def update_availability(n):
+        headers = bench()
+        return [{"method": "PUT", "path": f"/update-availability/{slot_id}", "headers": headers, "json": {
+            "date": day.isoformat(), "start_time": "11:00", "end_time": "12:00"
+        }} for slot_id, day in zip(fx.open_slots(n), fx.fresh_days(n))]
+
+    def delete_availability(n):
+        headers = bench()
+        return [{"method": "DELETE", "path": f"/delete-availability/{slot_id}", "headers": headers}
+                for slot_id in fx.open_slots(n)]
+
+    def send_invitation(n):
+        headers = bench()
+        return [{"method": "POST", "path": "/send-invitation", "headers": headers, "json": {
+            "candidate_name": "Invited", "candidate_email": f"inv-{i}@bench.example.com"
+        }} for i in range(n)]
+
+    def send_bulk_invitations(n):
+        headers = bench()
+        return [{"method": "POST", "path": "/send-invitation/bulk", "headers": headers, "json": {
+            "name": f"Bench campaign {i}",
+            "candidates": [{"candidate_name": f"C{j}", "candidate_email": f"bulk-{i}-{j}@bench.example.com"}
+                           for j in range(50)]
+        }} for i in range(n)]
+
+    def campaign_status(n):
+        from app import db
+        from app.models import InvitationCampaign
+        with fx.app.app_context():
+            ids = [row.id for row in db.session.query(InvitationCampaign.id).filter_by(recruiter_id=fx.bench_id)]
+        if not ids:
+            run_specs(driver, send_bulk_invitations(1))
+            return campaign_status(n)
+        headers = bench()
+        return [{"method": "GET", "path": f"/invitation-campaigns/{fx.rng.choice(ids)}", "headers": headers}
+                for _ in range(n)]
+
+    def book_slot(n):
+        return fx.book_slot_specs(n)
+
+    def public_cancel(n):
+        bookings = fx.bench_bookings()
+        if len(bookings) < n:
+            run_specs(driver, fx.book_slot_specs(n - len(bookings)))
+            bookings = fx.bench_bookings()
+        return [{"method": "POST", "path": "/public/cancel-booking", "json": {
+            "candidate_name": "Bench Candidate", "candidate_email": email, "invitation_token": token
+        }} for _, token, email in bookings[:n]]
+
+    def cancel_booking(n):
+        run_specs(driver, fx.book_slot_specs(n))
+        headers = bench()
+        return [{"method": "DELETE", "path": f"/cancel-booking/{booking_id}", "headers": headers}
+                for booking_id, _, _ in fx.bench_bookings()[:n]]
+
+    cases = [
+        ("register", register),
+        ("login", login),
+        ("verify_otp", verify_otp if in_process else None),
+        ("forgot_password", forgot_password),
+        ("reset_password", reset_password if in_process else None),
+        ("profile", profile),
+        ("public_availability", public_availability),
+        ("public_availability_tz", public_availability_tz),
+        ("public_pool_availability", pool_availability),
+        ("my_availability", my_availability),
+        ("analytics", analytics),
+        ("export_bookings", export_bookings),
+        ("export_availability", export_availability),
+        ("set_availability", set_availability),
+        ("set_recurring_availability", set_recurring),
+        ("set_daily_availability", set_daily),
+        ("set_bulk_availability", set_bulk),
+        ("update_availability", update_availability),
+        ("delete_availability", delete_availability),
+        ("send_invitation", send_invitation),
+        ("send_bulk_invitations", send_bulk_invitations),
+        ("invitation_campaign_status", campaign_status),
+        ("public_book_slot", book_slot),
+        ("public_cancel_booking", public_cancel),
+        ("cancel_booking", cancel_booking),
+    ]
+    return cases
+
+
+def _stub_response(request, *args, **kwargs):
+    import requests
+    response = requests.Response()
+    response.status_code = 201
+    response._content = b'{"join_url": "https://zoom.example.com/j/1", "access_token": "x", "expires_in": 3600}'
+    response.headers["Content-Type"] = "application/json"
+    response.request = request
+    response.url = request.url
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recruiters", type=int, default=50)
+    parser.add_argument("--slots-per-recruiter", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=100, help="Timed requests per endpoint.")
+    parser.add_argument("--only", help="Comma-separated endpoint names to run.")
+    parser.add_argument("--gunicorn", action="store_true", help="Drive a local gunicorn instead of the test client.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--database-url", help="Benchmark this database instead of a temporary SQLite file.")
+    parser.add_argument("--no-seed", action="store_true", help="Use the recruiters already in the database.")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--out", default="endpoints.json")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='scheduling-bench-'), 'bench.db')}"
+    bench_env = {
+        "DATABASE_URL": database_url,
+        "MAIL_SUPPRESS_SEND": "True",
+        "MAIL_DEFAULT_SENDER": "bench@example.com",
+        "CELERY_BROKER_URL": "memory://",
+        "CELERY_TASK_ALWAYS_EAGER": "False",
+        "OTP_STORE_URL": "memory://",
+        "GOOGLE_SERVICE_ACCOUNT_FILE": "",
+    }
+    # Config is read at import time, so the environment must be set first
+    os.environ.update(bench_env)
+    sys.path.insert(0, BACKEND_DIR)
+    from flask_mail import email_dispatched
+    from app import create_app, db
+    from app.models import Recruiter
+    from app.seed import seed_dataset
+    from benchmarks.common import LocalServer, percentiles, write_results
+
+    app = create_app()
+    seed_counts = {}
+    with app.app_context():
+        db.create_all()
+        if not args.no_seed:
+            seed_counts = seed_dataset(
+                recruiters=args.recruiters, slots_per_recruiter=args.slots_per_recruiter,
+                email_domain=f"{uuid.uuid4().hex[:8]}.seed.example.com", random_seed=args.random_seed
+            )
+        seeded_ids = [row.id for row in db.session.query(Recruiter.id).limit(10000)]
+    if not seeded_ids:
+        parser.error("No recruiters in the database; drop --no-seed")
+
+    rng = random.Random(args.random_seed)
+    fx = Fixtures(app, rng, seeded_ids)
+
+    def capture(message, app=None):
+        fx.outbox.append(message)
+    email_dispatched.connect(capture)
+
+    results = {}
+    server = None
+    patcher = None
+    try:
+        if args.gunicorn:
+            server = LocalServer(gunicorn_args=("-w", str(args.workers)), env=bench_env).__enter__()
+            driver = HTTPDriver(server.base_url, args.concurrency)
+        else:
+            driver = ClientDriver(app)
+            patcher = mock.patch("requests.adapters.HTTPAdapter.send", _stub_response)
+            patcher.start()
+
+        only = set(args.only.split(",")) if args.only else None
+        for name, prepare in build_cases(fx, driver, in_process=not args.gunicorn):
+            if only and name not in only:
+                continue
+            if prepare is None:
+                results[name] = {"skipped": "needs the in-process outbox; run without --gunicorn"}
+                continue
+            specs = prepare(args.requests)
+            latencies, statuses, wall, _ = run_specs(driver, specs)
+            results[name] = {
+                **percentiles(latencies),
+                "throughput_rps": round(len(specs) / wall, 2) if wall else None,
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            }
+            print(f"{name:<28} p50 {results[name].get('p50_ms')} ms  p99 {results[name].get('p99_ms')} ms  "
+                  f"{results[name]['throughput_rps']} req/s  {results[name]['statuses']}")
+    finally:
+        if patcher:
+            patcher.stop()
+        if server:
+            server.__exit__(None, None, None)
+
+    write_results(args.out, {
+        "meta": {
+            "mode": "gunicorn" if args.gunicorn else "test_client",
+            "gunicorn_workers": args.workers if args.gunicorn else None,
+            "concurrency": driver.concurrency,
+            "requests_per_endpoint": args.requests,
+            "database": database_url.split(":", 1)[0],
+            "seeded": seed_counts,
+            "started_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+        "endpoints": results,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Latency of cheap public reads while a burst of logins hashes passwords.
+
+    python -m benchmarks.login_burst --logins 200 --concurrency 32 --out login_burst.json
+
+Starts gunicorn (gunicorn.conf.py settings, as in the Procfile), registers
+one recruiter with a few slots, then fires concurrent POST /login requests
+while a second thread pool polls GET /public/availability/<id>. Reports
+p50/p95/p99 for both, plus how many logins were shed with 503 by the
+per-process hashing limits.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from benchmarks.common import LocalServer, percentiles, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--out", default="login_burst.json")
+    args = parser.parse_args()
+
+    with LocalServer(gunicorn_args=("-w", str(args.workers))) as server:
+        base = server.base_url
+        email, password = "bench@example.com", "bench-password"
+        recruiter_id = requests.post(f"{base}/register", json={
+            "name": "Bench", "email": email, "password": password, "timezone": "UTC"
+        }).json()["recruiter_id"]
+
+        login_latencies, read_latencies, statuses = [], [], {}
+        done = threading.Event()
+
+        def login_once(_):
+            started = time.perf_counter()
+            response = requests.post(f"{base}/login", json={"email": email, "password": password})
+            login_latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        def poll_reads():
+            session = requests.Session()
+            while not done.is_set():
+                started = time.perf_counter()
+                session.get(f"{base}/public/availability/{recruiter_id}")
+                read_latencies.append(time.perf_counter() - started)
+
+        readers = [threading.Thread(target=poll_reads) for _ in range(args.readers)]
+        for reader in readers:
+            reader.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(login_once, range(args.logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        for reader in readers:
+            reader.join()
+
+    write_results(args.out, {
+        "logins": {**percentiles(login_latencies), "statuses": statuses, "throughput_rps": round(args.logins / elapsed, 2)},
+        "public_availability_during_burst": percentiles(read_latencies),
+        "gunicorn_workers": args.workers,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Public read throughput while the mail server is slow, per gunicorn worker class.
+
+    python -m benchmarks.slow_smtp --smtp-latency 2 --senders 8 --seconds 15 --out slow_smtp.json
+
+Starts a local fake SMTP server that waits --smtp-latency seconds before its
+greeting, like a congested relay, and accepts everything it is sent. For each
+mode (sync workers, then gthread as in gunicorn.conf.py) it starts gunicorn
+with real mail sending pointed at that server, registers one recruiter with a
+few slots, and runs two phases of --seconds each:
+
+- idle: --readers threads poll GET /public/availability/<id>;
+- slow_mail: the same readers, while --senders threads keep calling
+  POST /send-invitation, each of which waits on the fake server.
+
+Reports read throughput and latency percentiles for both phases, and how many
+invitations went out. With sync workers the senders hold every worker and
+reads queue behind them; with gthread reads should keep their idle numbers.
+"""
+import argparse
+import socketserver
+import threading
+import time
+from datetime import date, timedelta
+import requests
+from benchmarks.common import LocalServer, free_port, percentiles, write_results
+
+
+class _SlowSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        time.sleep(self.server.latency)
+        self.reply("220 fake-smtp ready")
+        in_data = False
+        for raw in self.rfile:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    with self.server.lock:
+                        self.server.delivered += 1
+                    self.reply("250 queued")
+                continue
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-fake-smtp")
+                self.reply("250 8BITMIME")
+            elif verb == "DATA":
+                in_data = True
+                self.reply("354 end with .")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            else:
+                self.reply("502 not implemented")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency):
+        self.port = free_port()
+        super().__init__(("127.0.0.1", self.port), _SlowSMTPHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.delivered = 0
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def bearer_token(recruiter_id, email):
+    """A JWT the server accepts: same secret, same claims as /verify-otp issues."""
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+    from config import Config
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    JWTManager(app)
+    with app.app_context():
+        return create_access_token(identity=email, additional_claims={"rid": recruiter_id, "tz": "UTC"})
+
+
+def run_phase(base, recruiter_id, headers, seconds, readers, senders):
+    read_latencies, send_latencies, send_statuses = [], [], {}
+    done = threading.Event()
+
+    def poll_reads():
+        session = requests.Session()
+        while not done.is_set():
+            started = time.perf_counter()
+            session.get(f"{base}/public/availability/{recruiter_id}")
+            read_latencies.append(time.perf_counter() - started)
+
+    def send_invitations(worker_index):
+        session = requests.Session()
+        sent = 0
+        while not done.is_set():
+            started = time.perf_counter()
+            response = session.post(f"{base}/send-invitation", headers=headers, json={
+                "candidate_name": "Bench Candidate", "candidate_email": f"candidate-{worker_index}-{sent}@example.com"
+            })
+            send_latencies.append(time.perf_counter() - started)
+            send_statuses[response.status_code] = send_statuses.get(response.status_code, 0) + 1
+            sent += 1
+
+    threads = [threading.Thread(target=poll_reads) for _ in range(readers)]
+    threads += [threading.Thread(target=send_invitations, args=(i,)) for i in range(senders)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    result = {"reads": {**percentiles(read_latencies), "throughput_rps": round(len(read_latencies) / seconds, 2)}}
+    if senders:
+        result["invitations"] = {**percentiles(send_latencies), "statuses": send_statuses}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--smtp-latency", type=float, default=2.0)
+    parser.add_argument("--senders", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--out", default="slow_smtp.json")
+    args = parser.parse_args()
+
+    modes = {
+        "sync": ("-w", str(args.workers), "-k", "sync", "--threads", "1"),
+        "gthread": ("-w", str(args.workers), "-k", "gthread", "--threads", str(args.threads)),
+    }
+    results = {}
+    with FakeSMTPServer(args.smtp_latency) as smtp:
+        mail_env = {
+            "MAIL_SUPPRESS_SEND": "False",
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": str(smtp.port),
+            "MAIL_USE_TLS": "False",
+            "MAIL_USERNAME": "",
+            "MAIL_TIMEOUT": str(args.smtp_latency + 10),
+        }
+        for mode, gunicorn_args in modes.items():
+            with LocalServer(gunicorn_args=gunicorn_args, env=mail_env) as server:
+                base = server.base_url
+                email = f"bench-{mode}@example.com"
+                recruiter_id = requests.post(f"{base}/register", json={
+                    "name": "Bench", "email": email, "password": "bench-password", "timezone": "UTC"
+                }).json()["recruiter_id"]
+                headers = {"Authorization": f"Bearer {bearer_token(recruiter_id, email)}"}
+                for offset in range(5):
+                    requests.post(f"{base}/set-availability", headers=headers, json={
+                        "date": (date.today() + timedelta(days=7 + offset)).isoformat(),
+                        "start_time": "09:00", "end_time": "12:00"
+                    })
+
+                delivered_before = smtp.delivered
+                results[mode] = {
+                    "idle": run_phase(base, recruiter_id, headers, args.seconds, args.readers, 0),
+                    "slow_mail": run_phase(base, recruiter_id, headers, args.seconds, args.readers, args.senders),
+                }
+                results[mode]["emails_delivered"] = smtp.delivered - delivered_before
+                idle, slow = results[mode]["idle"]["reads"], results[mode]["slow_mail"]["reads"]
+                print(f"{mode:<8} reads idle {idle['throughput_rps']} req/s p99 {idle.get('p99_ms')} ms  "
+                      f"slow mail {slow['throughput_rps']} req/s p99 {slow.get('p99_ms')} ms")
+
+    write_results(args.out, {
+        "modes": results,
+        "smtp_latency_s": args.smtp_latency,
+        "senders": args.senders,
+        "readers": args.readers,
+        "seconds_per_phase": args.seconds,
+        "gunicorn_workers": args.workers,
+        "gunicorn_threads": args.threads,
+    })
+
+
+if __name__ == "__main__":
+    main()
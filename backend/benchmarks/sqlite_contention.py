@@ -0,0 +1,180 @@
+"""
+Write contention on one SQLite file from several processes, as under
+`gunicorn -w 4` plus a Celery worker.
+
+    python -m benchmarks.sqlite_contention --writers 8 --readers 2 --bookings 200 --out sqlite_contention.json
+
+Seeds a throwaway database, then starts --writers processes that each book
+--bookings slots through /public/book-slot (test client, so no HTTP in the
+way) while --readers processes page /my-availability until the writers are
+done. Every process creates its own app, like a gunicorn worker. Runs once
+with SQLITE_TUNING=False (SQLAlchemy defaults) and once with the tuned SQLite
+mode, and reports bookings per second, latency percentiles and how many
+bookings failed.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _bench_env(database_url, tuned):
+    return {
+        "DATABASE_URL": database_url,
+        "SQLITE_TUNING": "True" if tuned else "False",
+        "MAIL_SUPPRESS_SEND": "True",
+        "MAIL_DEFAULT_SENDER": "bench@example.com",
+        "CELERY_BROKER_URL": "memory://",
+        "CELERY_TASK_ALWAYS_EAGER": "False",
+        "OTP_STORE_URL": "memory://",
+        "METRICS_ENABLED": "False",
+    }
+
+
+def _make_app(env):
+    os.environ.update(env)
+    sys.path.insert(0, BACKEND_DIR)
+    from app import create_app
+    return create_app()
+
+
+def writer(env, jobs, start, results):
+    app = _make_app(env)
+    client = app.test_client()
+    latencies, statuses = [], {}
+    start.wait()
+    for slot_id, token, email in jobs:
+        started = time.perf_counter()
+        response = client.post("/public/book-slot", json={
+            "candidate_name": "Bench Candidate", "candidate_email": email,
+            "availability_id": slot_id, "invitation_token": token
+        })
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    results.put(("writer", latencies, statuses))
+
+
+def reader(env, recruiter_ids, start, stop, results):
+    from flask_jwt_extended import create_access_token
+    app = _make_app(env)
+    from app import db
+    from app.auth_utils import recruiter_claims
+    from app.models import Recruiter
+    with app.app_context():
+        headers = []
+        for recruiter in db.session.query(Recruiter).filter(Recruiter.id.in_(recruiter_ids)):
+            token = create_access_token(identity=recruiter.email, additional_claims=recruiter_claims(recruiter))
+            headers.append({"Authorization": f"Bearer {token}"})
+    client = app.test_client()
+    latencies, statuses = [], {}
+    start.wait()
+    i = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = client.get("/my-availability?limit=100", headers=headers[i % len(headers)])
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        i += 1
+    results.put(("reader", latencies, statuses))
+
+
+def seed(env, recruiters, slots):
+    app = _make_app(env)
+    from app import db
+    from app.models import Availability, Invitation
+    from app.seed import seed_dataset
+    with app.app_context():
+        db.create_all()
+        seed_dataset(recruiters=recruiters, slots_per_recruiter=slots, booked_fraction=0.0, open_invitations=slots)
+        jobs = []
+        recruiter_ids = sorted(row.recruiter_id for row in db.session.query(Availability.recruiter_id).distinct())
+        for recruiter_id in recruiter_ids:
+            slot_ids = [row.id for row in db.session.query(Availability.id)
+                        .filter_by(recruiter_id=recruiter_id).order_by(Availability.id)]
+            invitations = db.session.query(Invitation.token, Invitation.candidate_email).filter_by(
+                recruiter_id=recruiter_id).order_by(Invitation.id).all()
+            jobs.extend((slot_id, token, email) for slot_id, (token, email) in zip(slot_ids, invitations))
+        return jobs, recruiter_ids
+
+
+def run_mode(tuned, args):
+    from benchmarks.common import percentiles
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='scheduling-contention-'), 'bench.db')}"
+    env = _bench_env(database_url, tuned)
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        jobs, recruiter_ids = pool.apply(seed, (env, args.writers, args.bookings))
+
+    start, stop, results = ctx.Event(), ctx.Event(), ctx.Queue()
+    writers = [
+        ctx.Process(target=writer, args=(env, jobs[i::args.writers], start, results))
+        for i in range(args.writers)
+    ]
+    readers = [ctx.Process(target=reader, args=(env, recruiter_ids, start, stop, results)) for _ in range(args.readers)]
+    for process in writers + readers:
+        process.start()
+    time.sleep(args.warmup)  # let every process import and build its app
+    started = time.perf_counter()
+    start.set()
+
+    collected = {"writer": ([], {}), "reader": ([], {})}
+    for _ in writers:
+        kind, latencies, statuses = results.get()
+        collected[kind][0].extend(latencies)
+        for status, count in statuses.items():
+            collected[kind][1][status] = collected[kind][1].get(status, 0) + count
+    wall = time.perf_counter() - started
+    stop.set()
+    for _ in readers:
+        kind, latencies, statuses = results.get()
+        collected[kind][0].extend(latencies)
+        for status, count in statuses.items():
+            collected[kind][1][status] = collected[kind][1].get(status, 0) + count
+    for process in writers + readers:
+        process.join()
+
+    write_latencies, write_statuses = collected["writer"]
+    read_latencies, read_statuses = collected["reader"]
+    booked = write_statuses.get(201, 0)
+    return {
+        "bookings_attempted": len(write_latencies),
+        "bookings_succeeded": booked,
+        "bookings_failed": len(write_latencies) - booked,
+        "bookings_per_second": round(booked / wall, 2),
+        "book_slot": {**percentiles(write_latencies), "statuses": {str(k): v for k, v in sorted(write_statuses.items())}},
+        "my_availability": {**percentiles(read_latencies), "statuses": {str(k): v for k, v in sorted(read_statuses.items())}},
+        "wall_seconds": round(wall, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8, help="Writer processes (one recruiter each).")
+    parser.add_argument("--readers", type=int, default=2, help="Reader processes.")
+    parser.add_argument("--bookings", type=int, default=200, help="Bookings per writer process.")
+    parser.add_argument("--mode", choices=["both", "default", "tuned"], default="both")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds to wait for the processes to start.")
+    parser.add_argument("--out", default="sqlite_contention.json")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    from benchmarks.common import write_results
+
+    modes = {"default": [False], "tuned": [True], "both": [False, True]}[args.mode]
+    results = {"meta": {"writers": args.writers, "readers": args.readers, "bookings_per_writer": args.bookings}}
+    for tuned in modes:
+        name = "tuned" if tuned else "default"
+        results[name] = run_mode(tuned, args)
+        summary = results[name]
+        print(f"{name:<8} {summary['bookings_per_second']} bookings/s, {summary['bookings_failed']} failed, "
+              f"book p99 {summary['book_slot'].get('p99_ms')} ms, read p99 {summary['my_availability'].get('p99_ms')} ms")
+    write_results(args.out, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,9 @@
-from celery import Celery
-from app import create_app
-from config import Config
+from app import create_app, celery as app_celery
 
 def make_celery(app):
-    celery = Celery(app.import_name, broker=app.config.get("CELERY_BROKER_URL"))
-    celery.conf.update(app.config)
-    # Ensure tasks run within the Flask app context
-    class ContextTask(celery.Task):
-        def __call__(self, *args, **kwargs):
-            with app.app_context():
-                return self.run(*args, **kwargs)
-    celery.Task = ContextTask
-    return celery
+    # The Celery instance lives in the app package so the web process can
+    # enqueue tasks too; create_app() has already bound it to the Flask app.
+    return app_celery
 
 app = create_app()
 celery = make_celery(app)
@@ -21,10 +13,23 @@ import tasks
 
 # Update beat schedule to reference the correct task name
 celery.conf.beat_schedule = {
+    # Reminders are scheduled per booking with an ETA; this is only a catch-up
+    # sweep for bookings whose ETA task was lost (broker restart, enqueue error).
     'send-reminders-every-10-minutes': {
         'task': 'tasks.send_reminder_emails',  # Task name as defined in tasks.py
         'schedule': 600.0,  # Run every 10 minutes
     },
+    # Keeps Zoom access tokens fresh so booking-time meeting creation never
+    # has to refresh inline; the interval must stay below the refresh margin.
+    'refresh-zoom-tokens-every-5-minutes': {
+        'task': 'tasks.refresh_expiring_zoom_tokens',
+        'schedule': 300.0,
+    },
+    # Re-queues invitation campaigns whose delivery task was lost
+    'resume-invitation-campaigns-every-10-minutes': {
+        'task': 'tasks.resume_invitation_campaigns',
+        'schedule': 600.0,
+    },
 }
 
 if __name__ == '__main__':
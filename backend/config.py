@@ -10,6 +10,21 @@ class Config:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:////persistent/scheduling.db")
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Comma-separated read replica URLs for @read_only views and tasks (app/db_routing.py)
+    SQLALCHEMY_REPLICA_URLS = [url.strip() for url in os.getenv("SQLALCHEMY_REPLICA_URLS", "").split(",") if url.strip()]
+    # A recruiter's reads stay on the primary this long after their own write
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+
+    # SQLite file databases: WAL, busy timeout, BEGIN IMMEDIATE for writes and
+    # separate reader/writer pools per process (app/sqlite_mode.py)
+    SQLITE_TUNING = os.getenv("SQLITE_TUNING", "True") == "True"
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 20000))
+    SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", 128))
+    SQLITE_WRITER_POOL_SIZE = int(os.getenv("SQLITE_WRITER_POOL_SIZE", 2))
+    SQLITE_READER_POOL_SIZE = int(os.getenv("SQLITE_READER_POOL_SIZE", 4))
+    SQLITE_POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", 10))
 
     # Mail config
     MAIL_SERVER = os.getenv("MAIL_SERVER")
@@ -18,6 +33,93 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER")
+    MAIL_SUPPRESS_SEND = os.getenv("MAIL_SUPPRESS_SEND") == "True"
+    # Seconds to wait for the SMTP server on connect and on each command
+    MAIL_TIMEOUT = float(os.getenv("MAIL_TIMEOUT", 10))
+
+    # Password hashing; changing the method, iterations or salt length rehashes each
+    # password on its next login
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:260000")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+    # Per-process hashing limits (gthread workers): running hashes, waiting hashes, max wait (s)
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 8))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", 2.0))
+
+    # Login OTPs and password reset tokens in Redis (>= 2.6.12); "memory://" keeps them in-process (tests, single worker)
+    OTP_STORE_URL = os.getenv("OTP_STORE_URL", os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"))
+    OTP_TTL_SECONDS = int(os.getenv("OTP_TTL_SECONDS", 300))
+    OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", 5))
+    RESET_TOKEN_TTL_SECONDS = int(os.getenv("RESET_TOKEN_TTL_SECONDS", 3600))
+
+    # Celery config (reminders and other background jobs)
+    CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+    CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER") == "True"
+    # Reminders go out this many minutes before the interview starts
+    REMINDER_LEAD_MINUTES = int(os.getenv("REMINDER_LEAD_MINUTES", 120))
+
+    # Per-process cache of the recruiter identity behind a JWT. Profile changes
+    # only invalidate it in the worker that made them; other workers can serve
+    # the old name or timezone for up to this many seconds (0 disables it).
+    RECRUITER_CACHE_TTL = int(os.getenv("RECRUITER_CACHE_TTL", 60))
+    RECRUITER_CACHE_SIZE = int(os.getenv("RECRUITER_CACHE_SIZE", 1024))
+
+    # Public availability cache and replica write marks, shared by all workers in
+    # Redis; "memory://" keeps them per-process (tests, single worker)
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"))
+    PUBLIC_AVAILABILITY_CACHE_TTL = int(os.getenv("PUBLIC_AVAILABILITY_CACHE_TTL", 60))
+
+    # Bulk availability creation
+    BULK_AVAILABILITY_MAX_SLOTS = int(os.getenv("BULK_AVAILABILITY_MAX_SLOTS", 5000))
+    BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", 500))
+
+    # Bulk invitation campaigns: max candidates per request, emails sent per SMTP connection
+    BULK_INVITATION_MAX_CANDIDATES = int(os.getenv("BULK_INVITATION_MAX_CANDIDATES", 2000))
+    INVITATION_SEND_BATCH_SIZE = int(os.getenv("INVITATION_SEND_BATCH_SIZE", 100))
+
+    # Open slots suggested when a candidate loses a race for a slot
+    BOOKING_ALTERNATIVES_LIMIT = int(os.getenv("BOOKING_ALTERNATIVES_LIMIT", 5))
+
+    # Interview pools: times returned by /public/pools/<id>/availability (default,
+    # max), and the days around a slot whose bookings count as a member's load
+    POOL_AVAILABILITY_LIMIT = int(os.getenv("POOL_AVAILABILITY_LIMIT", 20))
+    POOL_AVAILABILITY_MAX_LIMIT = int(os.getenv("POOL_AVAILABILITY_MAX_LIMIT", 100))
+    POOL_LOAD_WINDOW_DAYS = int(os.getenv("POOL_LOAD_WINDOW_DAYS", 7))
+
+    # /my-availability pagination
+    MY_AVAILABILITY_PAGE_SIZE = int(os.getenv("MY_AVAILABILITY_PAGE_SIZE", 500))
+    MY_AVAILABILITY_MAX_PAGE_SIZE = int(os.getenv("MY_AVAILABILITY_MAX_PAGE_SIZE", 2000))
+
+    # /export/bookings and /export/availability: rows per server-side cursor fetch and per chunk sent
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # Zoom OAuth app and HTTP client behaviour
+    ZOOM_CLIENT_ID = os.getenv("ZOOM_CLIENT_ID")
+    ZOOM_CLIENT_SECRET = os.getenv("ZOOM_CLIENT_SECRET")
+    ZOOM_CONNECT_TIMEOUT = float(os.getenv("ZOOM_CONNECT_TIMEOUT", 3.05))
+    ZOOM_READ_TIMEOUT = float(os.getenv("ZOOM_READ_TIMEOUT", 10))
+    ZOOM_HTTP_RETRIES = int(os.getenv("ZOOM_HTTP_RETRIES", 3))
+    ZOOM_HTTP_BACKOFF = float(os.getenv("ZOOM_HTTP_BACKOFF", 0.5))
+    # Tokens expiring within this many minutes are refreshed by the beat job
+    ZOOM_TOKEN_REFRESH_MARGIN_MINUTES = int(os.getenv("ZOOM_TOKEN_REFRESH_MARGIN_MINUTES", 15))
+
+    # Google Calendar sync of availability slots (disabled without a service account file)
+    GOOGLE_SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE")
+    GOOGLE_CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID", "primary")
+
+    # Longest /analytics?from=&to= series, in days
+    ANALYTICS_MAX_RANGE_DAYS = int(os.getenv("ANALYTICS_MAX_RANGE_DAYS", 366))
+
+    # Prometheus metrics on /metrics, served only to "Authorization: Bearer <token>";
+    # METRICS_PUBLIC=True serves them without a token (development)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+    METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN")
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC") == "True"
+
+    # N+1 detection for development and tests: "record", "warn" or "raise" when a request or
+    # task runs the same statement more than QUERY_AUDIT_REPEAT_THRESHOLD times (off when empty)
+    QUERY_AUDIT = os.getenv("QUERY_AUDIT", "")
+    QUERY_AUDIT_REPEAT_THRESHOLD = int(os.getenv("QUERY_AUDIT_REPEAT_THRESHOLD", 5))
 
     # Make sure this matches your frontend Render domain!
     FRONTEND_URL = os.getenv("FRONTEND_URL", "https://scheduling-frontend.onrender.com")
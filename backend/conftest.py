@@ -0,0 +1,65 @@
+import os
+import tempfile
+import uuid
+import pytest
+
+# Config is read when the app is imported, so the environment goes first: a
+# throwaway SQLite file (tuned mode, as deployed), suppressed mail, in-process
+# OTP store and cache, no identity caching (every request is measured cold)
+# and Celery tasks run inline.
+_db_dir = tempfile.mkdtemp(prefix="scheduling-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_db_dir, 'test.db')}",
+    "SQLALCHEMY_REPLICA_URLS": "",
+    "QUERY_AUDIT": "record",
+    "MAIL_SUPPRESS_SEND": "True",
+    "MAIL_DEFAULT_SENDER": "tests@example.com",
+    "OTP_STORE_URL": "memory://",
+    "CACHE_REDIS_URL": "memory://",
+    "RECRUITER_CACHE_TTL": "0",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_TASK_ALWAYS_EAGER": "True",
+    "GOOGLE_SERVICE_ACCOUNT_FILE": "",
+})
+
+pytest_plugins = ["app.testing"]
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app import create_app, db
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_recruiter(app):
+    """make_recruiter(timezone="UTC") -> (recruiter_id, email, auth headers)."""
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.auth_utils import recruiter_claims
+    from app.models import Recruiter
+
+    def make(timezone="UTC"):
+        with app.app_context():
+            recruiter = Recruiter(
+                name="Test Recruiter", email=f"recruiter-{uuid.uuid4().hex[:12]}@example.com",
+                password="unused", timezone=timezone
+            )
+            db.session.add(recruiter)
+            db.session.commit()
+            token = create_access_token(identity=recruiter.email, additional_claims=recruiter_claims(recruiter))
+            return recruiter.id, recruiter.email, {"Authorization": f"Bearer {token}"}
+    return make
+
+
+@pytest.fixture
+def auth_headers(make_recruiter):
+    return make_recruiter()[2]
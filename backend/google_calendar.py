@@ -0,0 +1,100 @@
+import os
+import threading
+import uuid
+from flask import current_app
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from google.oauth2 import service_account
+from app.metrics import timed_outbound
+from app.tz_utils import as_utc
+
+CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# Google rejects batch requests with more than 50 calls
+BATCH_LIMIT = 50
+
+# httplib2, under the API client, is not thread-safe: each thread (or
+# greenlet, under gevent) of each process builds its own client
+_local = threading.local()
+
+
+def calendar_sync_enabled():
+    return bool(current_app.config.get("GOOGLE_SERVICE_ACCOUNT_FILE"))
+
+
+def get_calendar_service():
+    """
+    Calendar API client, built once per thread from the service account file.
+    Uses the discovery document bundled with google-api-python-client, so no
+    discovery request is made. Returns None if sync is not configured.
+    """
+    service = getattr(_local, "service", None)
+    if service is not None and _local.pid == os.getpid():
+        return service
+    service_account_file = current_app.config.get("GOOGLE_SERVICE_ACCOUNT_FILE")
+    if not service_account_file:
+        return None
+    credentials = service_account.Credentials.from_service_account_file(
+        service_account_file, scopes=CALENDAR_SCOPES
+    )
+    _local.service = build("calendar", "v3", credentials=credentials, cache_discovery=False)
+    _local.pid = os.getpid()
+    return _local.service
+
+
+def new_event_id():
+    """
+    Event id for a new slot, or None when sync is disabled. The id is chosen
+    by us (base32hex, as the Calendar API requires) and stored on the slot
+    before the event exists, so a retried insert is recognised as a duplicate
+    instead of creating a second event.
+    """
+    if not calendar_sync_enabled():
+        return None
+    return uuid.uuid4().hex
+
+
+def slot_event_body(slot):
+    return {
+        "id": slot.google_event_id,
+        "summary": "Available Slot",
+        "start": {"dateTime": as_utc(slot.start_at).isoformat(), "timeZone": "UTC"},
+        "end": {"dateTime": as_utc(slot.end_at).isoformat(), "timeZone": "UTC"},
+        "extendedProperties": {"private": {"availability_id": str(slot.id)}},
+    }
+
+
+def _status(exception):
+    if isinstance(exception, HttpError):
+        return exception.resp.status
+    return None
+
+
+def execute_batch(calls):
+    """
+    Run calls as Calendar batch HTTP requests of up to BATCH_LIMIT each.
+
+    calls is a list of (key, method, kwargs) with method one of "insert",
+    "update", "delete". Returns {key: (http_status, exception)} for the calls
+    that failed; a whole batch failing marks all of its calls with status None.
+    """
+    service = get_calendar_service()
+    calendar_id = current_app.config.get("GOOGLE_CALENDAR_ID", "primary")
+    failures = {}
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            failures[request_id] = (_status(exception), exception)
+
+    for offset in range(0, len(calls), BATCH_LIMIT):
+        chunk = calls[offset:offset + BATCH_LIMIT]
+        batch = service.new_batch_http_request(callback=callback)
+        for key, method, kwargs in chunk:
+            request = getattr(service.events(), method)(calendarId=calendar_id, **kwargs)
+            batch.add(request, request_id=str(key))
+        try:
+            with timed_outbound("google_calendar", "batch"):
+                batch.execute()
+        except Exception as e:
+            for key, _, _ in chunk:
+                failures[str(key)] = (None, e)
+    return failures
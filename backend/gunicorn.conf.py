@@ -0,0 +1,80 @@
+"""
+gunicorn settings, picked up automatically when gunicorn starts in this
+directory (Procfile and benchmarks/ both do). Command-line flags still win.
+
+Workers share Prometheus metrics through files in PROMETHEUS_MULTIPROC_DIR,
+which has to be in the environment before a worker imports prometheus_client.
+
+Worker class
+------------
+Several views wait on SMTP, Zoom or Google while they hold their worker:
+send_invitation, public_book_slot, update_availability, login (OTP mail).
+With sync workers, GUNICORN_WORKERS slow mail servers stall every request.
+
+- gthread (default): GUNICORN_WORKERS processes x GUNICORN_THREADS threads.
+  A thread waiting on a socket releases the GIL, so other requests in the
+  same process carry on. Nothing is monkey-patched, and every client used
+  here is safe across threads: db.session is scoped per app context, each
+  Flask-Mail send opens its own SMTP connection (bounded by MAIL_TIMEOUT),
+  ZoomClient's requests.Session is pooled, the Calendar client is built per
+  thread, and the in-process caches are locked. Size workers to CPU cores
+  and threads to how many requests may wait on I/O at once.
+- gevent: GUNICORN_WORKER_CLASS=gevent with `pip install gevent psycogreen`.
+  Thousands of greenlets per worker (GUNICORN_WORKER_CONNECTIONS); psycopg2
+  is made cooperative in post_fork. Postgres only: sqlite3 calls block the
+  whole worker while they run.
+- sync: GUNICORN_WORKER_CLASS=sync restores one request per process.
+
+Database pools must cover the concurrent requests of one process. The
+SQLite reader pool defaults to the thread count under gthread; the writer
+pool stays small on purpose (app/sqlite_mode.py). For Postgres, SQLAlchemy's
+default pool (5 plus 10 overflow) covers up to 15 threads or greenlets per
+worker; above that set pool_size in SQLALCHEMY_ENGINE_OPTIONS.
+"""
+import os
+import shutil
+import tempfile
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("GUNICORN_WORKERS", 4))
+# gunicorn turns sync workers with more than one thread into gthread
+threads = int(os.getenv("GUNICORN_THREADS", 8 if worker_class == "gthread" else 1))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 200))
+# Longer than MAIL_TIMEOUT and the Zoom timeouts, so those fail first and the
+# request gets an error response instead of a killed worker
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+
+# Without an explicit directory each server gets its own, removed on exit
+_own_multiproc_dir = "PROMETHEUS_MULTIPROC_DIR" not in os.environ
+prometheus_multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), f"scheduling-metrics-{os.getpid()}")
+)
+
+# Imported here, after the variable is set, rather than in child_exit: that
+# runs from the master's SIGCHLD handler and can interrupt its own import
+from prometheus_client import multiprocess
+
+
+def on_starting(server):
+    # Files left by an earlier run would be added to this run's totals
+    shutil.rmtree(prometheus_multiproc_dir, ignore_errors=True)
+    os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # Runs before the worker loads the app, and sees command-line overrides
+    if server.cfg.worker_class_str == "gthread":
+        os.environ.setdefault("SQLITE_READER_POOL_SIZE", str(server.cfg.threads))
+    elif server.cfg.worker_class_str == "gevent":
+        # The gevent worker patches sockets, but psycopg2 talks to Postgres in C
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _own_multiproc_dir:
+        shutil.rmtree(prometheus_multiproc_dir, ignore_errors=True)
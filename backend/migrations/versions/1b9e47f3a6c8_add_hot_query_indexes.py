@@ -0,0 +1,41 @@
+"""Add indexes for the hot availability and booking queries
+
+Revision ID: 1b9e47f3a6c8
+Revises: f2a6d8c4e1b7
+Create Date: 2026-10-17 20:26:44.905127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b9e47f3a6c8'
+down_revision = 'f2a6d8c4e1b7'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns). Booking(recruiter_id, date) lookups now go through
+# ix_booking_recruiter_start_at, so no date index is added.
+INDEXES = [
+    # Public availability: open slots of a recruiter in start order
+    ('ix_availability_recruiter_booked_start_at', 'availability', ['recruiter_id', 'booked', 'start_at']),
+    # Slot -> booking (my-availability join, update-availability, cancel)
+    ('ix_booking_availability_id', 'booking', ['availability_id']),
+    # Legacy public cancellation of bookings without an invitation link
+    ('ix_booking_candidate_email', 'booking', ['candidate_email', 'recruiter_id']),
+]
+
+
+def upgrade():
+    # Built CONCURRENTLY on Postgres so bookings keep flowing during the deploy
+    # (that needs to run outside the migration transaction).
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,55 @@
+"""Add interview pools and pool invitations
+
+Revision ID: 4d7b1e9c2f60
+Revises: 1b9e47f3a6c8
+Create Date: 2026-10-17 21:14:08.532917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d7b1e9c2f60'
+down_revision = '1b9e47f3a6c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('interview_pool',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['recruiter.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('interview_pool_member',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pool_id', sa.Integer(), nullable=False),
+    sa.Column('recruiter_id', sa.Integer(), nullable=False),
+    sa.Column('last_assigned_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['pool_id'], ['interview_pool.id'], ),
+    sa.ForeignKeyConstraint(['recruiter_id'], ['recruiter.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('pool_id', 'recruiter_id', name='uq_interview_pool_member')
+    )
+    with op.batch_alter_table('interview_pool_member', schema=None) as batch_op:
+        batch_op.create_index('ix_interview_pool_member_recruiter_id', ['recruiter_id'], unique=False)
+
+    with op.batch_alter_table('invitation', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pool_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_invitation_pool_id', 'interview_pool', ['pool_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('invitation', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_invitation_pool_id', type_='foreignkey')
+        batch_op.drop_column('pool_id')
+
+    with op.batch_alter_table('interview_pool_member', schema=None) as batch_op:
+        batch_op.drop_index('ix_interview_pool_member_recruiter_id')
+
+    op.drop_table('interview_pool_member')
+    op.drop_table('interview_pool')
@@ -0,0 +1,30 @@
+"""Add reminder tracking to Booking
+
+Revision ID: 6f1d2c8b9a47
+Revises: 01c44a652d92
+Create Date: 2026-10-17 09:12:41.508113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f1d2c8b9a47'
+down_revision = '01c44a652d92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reminder_task_id', sa.String(length=155), nullable=True))
+        batch_op.add_column(sa.Column('reminder_sent_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_booking_reminder_due', ['reminder_sent_at', 'date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_reminder_due')
+        batch_op.drop_column('reminder_sent_at')
+        batch_op.drop_column('reminder_task_id')
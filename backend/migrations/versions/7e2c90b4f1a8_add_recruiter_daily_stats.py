@@ -0,0 +1,60 @@
+"""Add recruiter_daily_stats rollup
+
+Revision ID: 7e2c90b4f1a8
+Revises: d41f7a9e6c35
+Create Date: 2026-10-17 15:21:09.334871
+
+"""
+from collections import defaultdict
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2c90b4f1a8'
+down_revision = 'd41f7a9e6c35'
+branch_labels = None
+depends_on = None
+
+
+def _backfill(stats_table):
+    """
+    Seed the counters from the current slots and bookings. Cancellations were
+    never recorded (the bookings were deleted), so those counters start at 0.
+    """
+    bind = op.get_bind()
+    counts = defaultdict(lambda: {"slots_offered": 0, "slots_booked": 0})
+    for source, column in (("availability", "slots_offered"), ("booking", "slots_booked")):
+        table = sa.table(source, sa.column('recruiter_id', sa.Integer), sa.column('date', sa.Date))
+        query = sa.select(table.c.recruiter_id, table.c.date, sa.func.count()).group_by(
+            table.c.recruiter_id, table.c.date
+        )
+        for recruiter_id, day, n in bind.execute(query):
+            counts[(recruiter_id, day)][column] = n
+
+    rows = [
+        dict(values, recruiter_id=recruiter_id, day=day, cancelled_by_candidate=0, cancelled_by_recruiter=0)
+        for (recruiter_id, day), values in counts.items()
+    ]
+    for offset in range(0, len(rows), 1000):
+        op.bulk_insert(stats_table, rows[offset:offset + 1000])
+
+
+def upgrade():
+    stats_table = op.create_table('recruiter_daily_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recruiter_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('slots_offered', sa.Integer(), nullable=False),
+    sa.Column('slots_booked', sa.Integer(), nullable=False),
+    sa.Column('cancelled_by_candidate', sa.Integer(), nullable=False),
+    sa.Column('cancelled_by_recruiter', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['recruiter_id'], ['recruiter.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('recruiter_id', 'day', name='uq_recruiter_daily_stats_day')
+    )
+    _backfill(stats_table)
+
+
+def downgrade():
+    op.drop_table('recruiter_daily_stats')
@@ -0,0 +1,33 @@
+"""Pool members accept their invitation before joining
+
+Revision ID: 9c1e5f7a2b34
+Revises: 4d7b1e9c2f60
+Create Date: 2026-10-18 10:02:37.114520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1e5f7a2b34'
+down_revision = '4d7b1e9c2f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('interview_pool_member', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('accepted_at', sa.DateTime(), nullable=True))
+
+    # Owners are in their own pools; everyone else was added without being
+    # asked and stays pending until they accept.
+    op.execute(
+        "UPDATE interview_pool_member SET accepted_at = CURRENT_TIMESTAMP "
+        "WHERE recruiter_id = (SELECT owner_id FROM interview_pool WHERE interview_pool.id = interview_pool_member.pool_id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('interview_pool_member', schema=None) as batch_op:
+        batch_op.drop_column('accepted_at')
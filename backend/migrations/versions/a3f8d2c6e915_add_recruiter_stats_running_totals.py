@@ -0,0 +1,40 @@
+"""Add running totals rows to recruiter_daily_stats
+
+Revision ID: a3f8d2c6e915
+Revises: 9c1e5f7a2b34
+Create Date: 2026-10-18 11:26:03.871204
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f8d2c6e915'
+down_revision = '9c1e5f7a2b34'
+branch_labels = None
+depends_on = None
+
+# app.stats.TOTALS_DAY
+TOTALS_DAY = date(1, 1, 1)
+STAT_COLUMNS = ("slots_offered", "slots_booked", "cancelled_by_candidate", "cancelled_by_recruiter")
+
+
+def upgrade():
+    stats = sa.table(
+        'recruiter_daily_stats', sa.column('recruiter_id', sa.Integer), sa.column('day', sa.Date),
+        *[sa.column(column, sa.Integer) for column in STAT_COLUMNS]
+    )
+    # One row per recruiter summing their days
+    op.execute(stats.insert().from_select(
+        ['recruiter_id', 'day', *STAT_COLUMNS],
+        sa.select(
+            stats.c.recruiter_id, sa.literal(TOTALS_DAY, sa.Date),
+            *[sa.func.sum(stats.c[column]) for column in STAT_COLUMNS]
+        ).group_by(stats.c.recruiter_id)
+    ))
+
+
+def downgrade():
+    op.execute(sa.text("DELETE FROM recruiter_daily_stats WHERE day = :day").bindparams(day=TOTALS_DAY))
@@ -0,0 +1,28 @@
+"""Add zoom_token_expires_at to Recruiter
+
+Revision ID: a9d3e61c27f4
+Revises: 7e2c90b4f1a8
+Create Date: 2026-10-17 16:47:52.120384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3e61c27f4'
+down_revision = '7e2c90b4f1a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing tokens have an unknown expiry (NULL), which the refresh job
+    # treats as due, so they are refreshed on its first run.
+    with op.batch_alter_table('recruiter', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('zoom_token_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('recruiter', schema=None) as batch_op:
+        batch_op.drop_column('zoom_token_expires_at')
@@ -0,0 +1,98 @@
+"""Add UTC start_at/end_at to Availability and Booking
+
+Revision ID: b83e5a1f0c2d
+Revises: 6f1d2c8b9a47
+Create Date: 2026-10-17 11:03:27.214590
+
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e5a1f0c2d'
+down_revision = '6f1d2c8b9a47'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _backfill(table_name):
+    """
+    Fill start_at/end_at from the legacy UTC date/start_time/end_time columns.
+    A slot whose end_time is not after its start_time crossed UTC midnight, so
+    its end belongs to the following day.
+    """
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('date', sa.Date),
+        sa.column('start_time', sa.Time),
+        sa.column('end_time', sa.Time),
+        sa.column('start_at', sa.DateTime(timezone=True)),
+        sa.column('end_at', sa.DateTime(timezone=True)),
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.date, table.c.start_time, table.c.end_time)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            start_at = datetime.combine(row.date, row.start_time).replace(tzinfo=timezone.utc)
+            end_at = datetime.combine(row.date, row.end_time).replace(tzinfo=timezone.utc)
+            if end_at <= start_at:
+                end_at += timedelta(days=1)
+            params.append({'b_id': row.id, 'b_start_at': start_at, 'b_end_at': end_at})
+        bind.execute(
+            table.update()
+            .where(table.c.id == sa.bindparam('b_id'))
+            .values(start_at=sa.bindparam('b_start_at'), end_at=sa.bindparam('b_end_at')),
+            params,
+        )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    for table_name in ('availability', 'booking'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('start_at', sa.DateTime(timezone=True), nullable=True))
+            batch_op.add_column(sa.Column('end_at', sa.DateTime(timezone=True), nullable=True))
+
+        _backfill(table_name)
+
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column('start_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+            batch_op.alter_column('end_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+
+    with op.batch_alter_table('availability', schema=None) as batch_op:
+        batch_op.create_index('ix_availability_recruiter_start_at', ['recruiter_id', 'start_at'], unique=False)
+
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_reminder_due')
+        batch_op.create_index('ix_booking_reminder_due', ['reminder_sent_at', 'start_at'], unique=False)
+        batch_op.create_index('ix_booking_recruiter_start_at', ['recruiter_id', 'start_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_recruiter_start_at')
+        batch_op.drop_index('ix_booking_reminder_due')
+        batch_op.create_index('ix_booking_reminder_due', ['reminder_sent_at', 'date'], unique=False)
+
+    with op.batch_alter_table('availability', schema=None) as batch_op:
+        batch_op.drop_index('ix_availability_recruiter_start_at')
+
+    for table_name in ('booking', 'availability'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('end_at')
+            batch_op.drop_column('start_at')
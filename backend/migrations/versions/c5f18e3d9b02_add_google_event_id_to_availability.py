@@ -0,0 +1,26 @@
+"""Add google_event_id to Availability
+
+Revision ID: c5f18e3d9b02
+Revises: a9d3e61c27f4
+Create Date: 2026-10-17 17:35:16.682930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f18e3d9b02'
+down_revision = 'a9d3e61c27f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('availability', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('google_event_id', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('availability', schema=None) as batch_op:
+        batch_op.drop_column('google_event_id')
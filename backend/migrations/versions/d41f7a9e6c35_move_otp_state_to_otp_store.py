@@ -0,0 +1,32 @@
+"""Move OTP and reset token state out of Recruiter
+
+Revision ID: d41f7a9e6c35
+Revises: b83e5a1f0c2d
+Create Date: 2026-10-17 14:03:27.915402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f7a9e6c35'
+down_revision = 'b83e5a1f0c2d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Codes and reset tokens now live in the OTP store; outstanding ones are
+    # short-lived and are simply re-requested after the deploy.
+    with op.batch_alter_table('recruiter', schema=None) as batch_op:
+        batch_op.drop_column('otp_expiration')
+        batch_op.drop_column('otp')
+        batch_op.drop_column('reset_token')
+
+
+def downgrade():
+    with op.batch_alter_table('recruiter', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reset_token', sa.String(length=120), nullable=True))
+        batch_op.add_column(sa.Column('otp', sa.String(length=6), nullable=True))
+        batch_op.add_column(sa.Column('otp_expiration', sa.DateTime(), nullable=True))
@@ -0,0 +1,53 @@
+"""Add invitation campaigns and per-invitation delivery tracking
+
+Revision ID: e8b4c2a7d513
+Revises: c5f18e3d9b02
+Create Date: 2026-10-17 18:52:40.417266
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b4c2a7d513'
+down_revision = 'c5f18e3d9b02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('invitation_campaign',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recruiter_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['recruiter_id'], ['recruiter.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('invitation', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('candidate_name', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('candidate_email', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('campaign_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('delivery_status', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('delivery_error', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('sent_at', sa.DateTime(), nullable=True))
+        batch_op.create_foreign_key('fk_invitation_campaign_id', 'invitation_campaign', ['campaign_id'], ['id'])
+        batch_op.create_index('ix_invitation_campaign_status', ['campaign_id', 'delivery_status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('invitation', schema=None) as batch_op:
+        batch_op.drop_index('ix_invitation_campaign_status')
+        batch_op.drop_constraint('fk_invitation_campaign_id', type_='foreignkey')
+        batch_op.drop_column('sent_at')
+        batch_op.drop_column('delivery_error')
+        batch_op.drop_column('delivery_status')
+        batch_op.drop_column('campaign_id')
+        batch_op.drop_column('candidate_email')
+        batch_op.drop_column('candidate_name')
+
+    op.drop_table('invitation_campaign')
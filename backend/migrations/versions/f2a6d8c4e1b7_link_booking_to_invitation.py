@@ -0,0 +1,76 @@
+"""Link Booking to the Invitation it was made with
+
+Revision ID: f2a6d8c4e1b7
+Revises: e8b4c2a7d513
+Create Date: 2026-10-17 19:40:03.271558
+
+"""
+from collections import defaultdict
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d8c4e1b7'
+down_revision = 'e8b4c2a7d513'
+branch_labels = None
+depends_on = None
+
+
+def _backfill():
+    """
+    Link existing bookings where the match is unambiguous: exactly one used
+    invitation and exactly one booking for the same recruiter and candidate
+    email. Invitations only record the candidate since campaigns were added,
+    so older bookings stay unlinked and are cancelled via the email fallback.
+    """
+    bind = op.get_bind()
+    booking = sa.table('booking',
+        sa.column('id', sa.Integer),
+        sa.column('recruiter_id', sa.Integer),
+        sa.column('candidate_email', sa.String),
+        sa.column('invitation_id', sa.Integer)
+    )
+    invitation = sa.table('invitation',
+        sa.column('id', sa.Integer),
+        sa.column('recruiter_id', sa.Integer),
+        sa.column('candidate_email', sa.String),
+        sa.column('used', sa.Boolean)
+    )
+
+    bookings = defaultdict(list)
+    for row in bind.execute(sa.select(booking.c.id, booking.c.recruiter_id, booking.c.candidate_email)):
+        bookings[(row.recruiter_id, row.candidate_email.lower())].append(row.id)
+    invitations = defaultdict(list)
+    for row in bind.execute(
+        sa.select(invitation.c.id, invitation.c.recruiter_id, invitation.c.candidate_email)
+        .where(invitation.c.candidate_email.isnot(None), invitation.c.used == sa.true())
+    ):
+        invitations[(row.recruiter_id, row.candidate_email.lower())].append(row.id)
+
+    links = [
+        {"b_id": booking_ids[0], "i_id": invitations[key][0]}
+        for key, booking_ids in bookings.items()
+        if len(booking_ids) == 1 and len(invitations.get(key, ())) == 1
+    ]
+    if links:
+        bind.execute(
+            booking.update().where(booking.c.id == sa.bindparam('b_id')).values(invitation_id=sa.bindparam('i_id')),
+            links
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('invitation_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_booking_invitation_id', 'invitation', ['invitation_id'], ['id'])
+        batch_op.create_index('ix_booking_invitation_id', ['invitation_id'], unique=False)
+
+    _backfill()
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_invitation_id')
+        batch_op.drop_constraint('fk_booking_invitation_id', type_='foreignkey')
+        batch_op.drop_column('invitation_id')
@@ -1,55 +1,457 @@
+import uuid
 from celery import shared_task
-from app import mail, db
+from flask import current_app
+from app import mail, db, celery
 from flask_mail import Message
-from app.models import Booking, Recruiter
+from sqlalchemy import or_, update
+from app.models import Availability, Booking, Invitation, InvitationCampaign, Recruiter
+from app.invitations import invitation_email_body
+from app.metrics import timed_outbound
+from app.tz_utils import as_utc, utc_now
+from app.zoom_utils import ZoomError, generate_jitsi_meeting_link, zoom_client
+from google_calendar import calendar_sync_enabled, execute_batch, slot_event_body
 from datetime import datetime, timedelta
 
+def _reminder_lead():
+    return timedelta(minutes=current_app.config.get("REMINDER_LEAD_MINUTES", 120))
+
+def _appointment_start(booking):
+    return as_utc(booking.start_at)
+
+def _deliver_reminder(booking):
+    """
+    Send the candidate and recruiter reminder for a booking exactly once.
+    The reminder_sent_at marker is claimed with a conditional UPDATE, so an ETA
+    task and the catch-up sweep racing on the same booking only send one email.
+    Returns True if this call sent the reminder.
+    """
+    claimed = Booking.query.filter_by(id=booking.id, reminder_sent_at=None).update(
+        {"reminder_sent_at": datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+    if not claimed:
+        return False
+    return _send_reminder(booking)
+
+def _send_reminder(booking):
+    """Send the reminders for a booking whose marker this worker has claimed."""
+    recruiter = booking.recruiter
+    # Prepare candidate reminder email
+    candidate_msg = Message(
+        subject="Reminder: Your Upcoming Interview",
+        recipients=[booking.candidate_email],
+        body=(
+            f"Hello {booking.candidate_name},\n\n"
+            f"This is a reminder that your interview is scheduled on {booking.date} at {booking.start_time}.\n"
+            "Please ensure you're available to join the meeting on time.\n\n"
+            "Best regards,\nYour Recruitment Team"
+        )
+    )
+    # Prepare recruiter reminder email
+    recruiter_email = recruiter.email if recruiter else ""
+    recruiter_msg = Message(
+        subject="Reminder: Upcoming Interview",
+        recipients=[recruiter_email] if recruiter_email else [],
+        body=(
+            f"Hello {recruiter.name if recruiter else 'Recruiter'},\n\n"
+            f"This is a reminder that your interview with {booking.candidate_name} is scheduled on {booking.date} at {booking.start_time}.\n\n"
+            "Best regards,\nYour Scheduler App"
+        )
+    )
+    try:
+        with timed_outbound("smtp", "send"):
+            mail.send(candidate_msg)
+    except Exception as e:
+        # Release the marker so the sweep retries this booking
+        Booking.query.filter_by(id=booking.id).update(
+            {"reminder_sent_at": None}, synchronize_session=False
+        )
+        db.session.commit()
+        current_app.logger.error("Error sending reminder for booking %s: %s", booking.id, str(e))
+        return False
+    try:
+        if recruiter_email:
+            with timed_outbound("smtp", "send"):
+                mail.send(recruiter_msg)
+    except Exception as e:
+        current_app.logger.error("Error sending recruiter reminder for booking %s: %s", booking.id, str(e))
+    return True
+
+@shared_task(bind=True)
+def send_booking_reminder(self, booking_id):
+    """
+    ETA task enqueued when a booking is made (or rescheduled).
+    Skips bookings that were cancelled, already reminded, or rescheduled to a
+    different task in the meantime.
+    """
+    booking = Booking.query.options(db.joinedload(Booking.recruiter)).filter_by(id=booking_id).first()
+    if not booking or booking.reminder_sent_at is not None:
+        return
+    if booking.reminder_task_id and booking.reminder_task_id != self.request.id:
+        # A newer reminder was scheduled for this booking (revocation missed)
+        return
+    now = utc_now()
+    start = _appointment_start(booking)
+    if start <= now or start - _reminder_lead() > now + timedelta(minutes=5):
+        return
+    _deliver_reminder(booking)
+
 @shared_task
 def send_reminder_emails():
     """
-    This task checks for bookings starting approximately 2 hours from now (±5 minutes)
-    and sends reminder emails to both the candidate and the recruiter.
+    Catch-up sweep run from beat. Reminders are normally sent by the ETA task
+    scheduled at booking time; this only picks up bookings starting within the
+    reminder lead time that still have no reminder_sent_at marker.
     """
-    target_time = datetime.utcnow() + timedelta(hours=2)
-    window_start = target_time - timedelta(minutes=5)
-    window_end = target_time + timedelta(minutes=5)
-    
-    # Retrieve all bookings (in production, filter to only upcoming bookings)
-    bookings = Booking.query.all()
-    
+    now = utc_now()
+    horizon = now + _reminder_lead()
+
+    # Claim every due booking in one UPDATE ... RETURNING (a range scan on
+    # ix_booking_reminder_due), then load the claimed ones with their
+    # recruiters in one query, instead of claiming and reloading per booking.
+    claimed_ids = db.session.execute(
+        update(Booking)
+        .where(
+            Booking.reminder_sent_at.is_(None),
+            Booking.start_at > now,
+            Booking.start_at <= horizon,
+        )
+        .values(reminder_sent_at=datetime.utcnow())
+        .returning(Booking.id)
+    ).scalars().all()
+    db.session.commit()
+    if not claimed_ids:
+        return
+
+    bookings = Booking.query.options(db.joinedload(Booking.recruiter)).filter(Booking.id.in_(claimed_ids)).all()
     for booking in bookings:
-        # Combine booking.date and booking.start_time (assuming they are stored in UTC)
-        appointment_dt = datetime.combine(booking.date, booking.start_time)
-        
-        if window_start <= appointment_dt <= window_end:
-            # Prepare candidate reminder email
-            candidate_msg = Message(
-                subject="Reminder: Your Upcoming Interview",
-                recipients=[booking.candidate_email],
-                body=(
-                    f"Hello {booking.candidate_name},\n\n"
-                    f"This is a reminder that your interview is scheduled on {booking.date} at {booking.start_time}.\n"
-                    "Please ensure you're available to join the meeting on time.\n\n"
-                    "Best regards,\nYour Recruitment Team"
-                )
+        _send_reminder(booking)
+
+    db.session.commit()
+
+def new_reminder_task_id():
+    return uuid.uuid4().hex
+
+def schedule_booking_reminder(booking):
+    """
+    Enqueue the reminder ETA task for a committed booking, using the task id
+    already stored in booking.reminder_task_id. Failures are logged only; the
+    beat sweep covers any booking whose task never made it to the broker.
+    """
+    if not booking.reminder_task_id:
+        return
+    now = utc_now()
+    start = _appointment_start(booking)
+    if start <= now:
+        return
+    eta = max(start - _reminder_lead(), now)
+    try:
+        send_booking_reminder.apply_async((booking.id,), eta=eta, task_id=booking.reminder_task_id)
+    except Exception as e:
+        current_app.logger.error("Error scheduling reminder for booking %s: %s", booking.id, str(e))
+
+def revoke_booking_reminder(task_id):
+    """Revoke a pending reminder task (best effort; the task re-checks the booking anyway)."""
+    if not task_id or celery.conf.task_always_eager:
+        return
+    try:
+        celery.control.revoke(task_id)
+    except Exception as e:
+        current_app.logger.error("Error revoking reminder task %s: %s", task_id, str(e))
+
+@shared_task
+def refresh_expiring_zoom_tokens():
+    """
+    Beat job: refresh every Zoom token that lapses within the refresh margin
+    (or whose expiry is unknown), so meeting creation finds a valid token.
+    """
+    horizon = utc_now() + zoom_client.refresh_margin
+    recruiters = Recruiter.query.filter(
+        Recruiter.zoom_refresh_token.isnot(None),
+        or_(Recruiter.zoom_token_expires_at.is_(None), Recruiter.zoom_token_expires_at <= horizon)
+    ).all()
+    for recruiter in recruiters:
+        try:
+            zoom_client.refresh_token(recruiter)
+            db.session.commit()
+        except ZoomError as e:
+            db.session.rollback()
+            current_app.logger.error("Zoom token refresh failed for recruiter %s: %s", recruiter.id, str(e))
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def create_booking_meeting(self, booking_id):
+    """
+    Create the Zoom meeting for a booking after the booking request has
+    returned, store the link and email it to both sides. Retries a few times
+    on Zoom errors, then falls back to a Jitsi link so the interview always
+    has somewhere to happen.
+    """
+    booking = Booking.query.options(db.joinedload(Booking.recruiter)).filter_by(id=booking_id).first()
+    if not booking or booking.meeting_link:
+        return
+    recruiter = booking.recruiter
+    try:
+        meeting_link = zoom_client.create_meeting(recruiter, booking)
+    except ZoomError as e:
+        db.session.rollback()
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        current_app.logger.error("Zoom meeting creation failed for booking %s: %s. Using Jitsi.", booking.id, str(e))
+        meeting_link = generate_jitsi_meeting_link()
+
+    # Only the first delivery of this task gets to set the link
+    updated = Booking.query.filter_by(id=booking.id, meeting_link=None).update(
+        {"meeting_link": meeting_link}, synchronize_session=False
+    )
+    db.session.commit()
+    if not updated:
+        return
+
+    messages = [
+        Message(
+            subject="Your Interview Meeting Link",
+            recipients=[booking.candidate_email],
+            body=(
+                f"Hello {booking.candidate_name},\n\n"
+                f"Your interview on {booking.date} at {booking.start_time} will take place at:\n{meeting_link}\n\n"
+                "Good luck!"
             )
-            # Prepare recruiter reminder email
-            recruiter = Recruiter.query.filter_by(id=booking.recruiter_id).first()
-            recruiter_email = recruiter.email if recruiter else ""
-            recruiter_msg = Message(
-                subject="Reminder: Upcoming Interview",
-                recipients=[recruiter_email] if recruiter_email else [],
-                body=(
-                    f"Hello {recruiter.name if recruiter else 'Recruiter'},\n\n"
-                    f"This is a reminder that your interview with {booking.candidate_name} is scheduled on {booking.date} at {booking.start_time}.\n\n"
-                    "Best regards,\nYour Scheduler App"
-                )
+        ),
+        Message(
+            subject="Interview Meeting Link",
+            recipients=[recruiter.email],
+            body=(
+                f"Hello {recruiter.name},\n\n"
+                f"The meeting for your interview with {booking.candidate_name} on {booking.date} at {booking.start_time} is ready:\n"
+                f"{meeting_link}"
             )
-            try:
-                mail.send(candidate_msg)
-                if recruiter_email:
-                    mail.send(recruiter_msg)
-            except Exception as e:
-                print(f"Error sending reminder for booking {booking.id}: {e}")
-    
+        ),
+    ]
+    for msg in messages:
+        try:
+            with timed_outbound("smtp", "send"):
+                mail.send(msg)
+        except Exception as e:
+            current_app.logger.error("Error sending meeting link for booking %s: %s", booking.id, str(e))
+
+def enqueue_booking_meeting(booking):
+    """Queue Zoom meeting creation for a committed booking; falls back to Jitsi if it cannot be queued."""
+    try:
+        create_booking_meeting.delay(booking.id)
+        return True
+    except Exception as e:
+        current_app.logger.error("Error queueing meeting creation for booking %s: %s", booking.id, str(e))
+        return False
+
+# What to try when a calendar call fails with a given status: an insert that
+# already exists (earlier attempt) becomes an update, an update of a missing
+# event becomes an insert.
+_CALENDAR_FALLBACK = {("insert", 409): "update", ("update", 404): "insert"}
+
+def _retryable_calendar_status(status):
+    return status is None or status in (403, 429) or status >= 500
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def push_calendar_events(self, slot_ids, update=False):
+    """
+    Create (or, with update=True, rewrite) the calendar events of the given
+    slots using batch requests. Slots that failed transiently are retried
+    together; slots deleted in the meantime are skipped.
+    """
+    if not calendar_sync_enabled():
+        return
+    slots = {
+        str(slot.id): slot
+        for slot in Availability.query.filter(
+            Availability.id.in_(slot_ids), Availability.google_event_id.isnot(None)
+        )
+    }
+    method = "update" if update else "insert"
+    pending = {key: method for key in slots}
+    retry_keys = []
+    for _ in range(2):
+        calls = []
+        for key, call_method in pending.items():
+            kwargs = {"body": slot_event_body(slots[key])}
+            if call_method == "update":
+                kwargs["eventId"] = slots[key].google_event_id
+            calls.append((key, call_method, kwargs))
+        failures = execute_batch(calls)
+        next_pending = {}
+        for key, (status, error) in failures.items():
+            fallback = _CALENDAR_FALLBACK.get((pending[key], status))
+            if fallback:
+                next_pending[key] = fallback
+            elif _retryable_calendar_status(status):
+                retry_keys.append(key)
+            else:
+                current_app.logger.error("Calendar sync failed for slot %s: %s", key, str(error))
+        pending = next_pending
+        if not pending:
+            break
+
+    if retry_keys:
+        current_app.logger.error("Calendar sync will retry %s slot(s)", len(retry_keys))
+        raise self.retry(args=([int(key) for key in retry_keys], update))
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def delete_calendar_events(self, event_ids):
+    """Delete calendar events by id in batches; events already gone count as deleted."""
+    if not calendar_sync_enabled():
+        return
+    failures = execute_batch([(event_id, "delete", {"eventId": event_id}) for event_id in event_ids])
+    retry_ids = []
+    for event_id, (status, error) in failures.items():
+        if status in (404, 410):
+            continue
+        if _retryable_calendar_status(status):
+            retry_ids.append(event_id)
+        else:
+            current_app.logger.error("Calendar delete failed for event %s: %s", event_id, str(error))
+    if retry_ids:
+        raise self.retry(args=(retry_ids,))
+
+def queue_calendar_push(slot_ids, update=False):
+    """Queue calendar sync for committed slots (no-op when sync is not configured)."""
+    slot_ids = list(slot_ids)
+    if not slot_ids or not calendar_sync_enabled():
+        return
+    try:
+        push_calendar_events.delay(slot_ids, update)
+    except Exception as e:
+        current_app.logger.error("Error queueing calendar sync for %s slot(s): %s", len(slot_ids), str(e))
+
+def queue_calendar_delete(event_ids):
+    event_ids = [event_id for event_id in event_ids if event_id]
+    if not event_ids or not calendar_sync_enabled():
+        return
+    try:
+        delete_calendar_events.delay(event_ids)
+    except Exception as e:
+        current_app.logger.error("Error queueing calendar delete for %s event(s): %s", len(event_ids), str(e))
+
+def _send_invitation_chunk(campaign_id, size):
+    """
+    Claim up to size pending invitations of the campaign (pending -> sending,
+    so a duplicate task run cannot pick the same rows), send them over one
+    SMTP connection and record the per-recipient result. Returns the number
+    of invitations handled; 0 means the campaign has nothing left to send.
+    """
+    ids = [row.id for row in db.session.query(Invitation.id).filter(
+        Invitation.campaign_id == campaign_id,
+        Invitation.delivery_status == "pending"
+    ).order_by(Invitation.id).limit(size)]
+    if not ids:
+        return 0
+    claimed = db.session.execute(
+        update(Invitation)
+        .where(Invitation.id.in_(ids), Invitation.delivery_status == "pending")
+        .values(delivery_status="sending", sent_at=datetime.utcnow())
+        .returning(
+            Invitation.id, Invitation.recruiter_id, Invitation.token, Invitation.expiration,
+            Invitation.candidate_name, Invitation.candidate_email, Invitation.pool_id
+        )
+    ).all()
     db.session.commit()
+
+    results = []
+    try:
+        with mail.connect() as conn:
+            for invitation in claimed:
+                try:
+                    with timed_outbound("smtp", "send"):
+                        conn.send(Message(
+                            subject="Interview Invitation",
+                            recipients=[invitation.candidate_email],
+                            body=invitation_email_body(
+                                invitation.candidate_name, invitation.recruiter_id, invitation.token,
+                                invitation.expiration, invitation.pool_id
+                            )
+                        ))
+                    results.append({"id": invitation.id, "delivery_status": "sent", "sent_at": datetime.utcnow()})
+                except Exception as e:
+                    results.append({
+                        "id": invitation.id, "delivery_status": "failed", "delivery_error": str(e)[:255], "sent_at": None
+                    })
+    except Exception as e:
+        # Could not (re)connect: put the unsent part of the chunk back
+        current_app.logger.error("SMTP connection failed for campaign %s: %s", campaign_id, str(e))
+        handled = {result["id"] for result in results}
+        results.extend(
+            {"id": invitation.id, "delivery_status": "pending", "sent_at": None}
+            for invitation in claimed if invitation.id not in handled
+        )
+        db.session.execute(update(Invitation), results)
+        db.session.commit()
+        raise
+
+    db.session.execute(update(Invitation), results)
+    db.session.commit()
+    return len(claimed)
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=60)
+def deliver_invitation_campaign(self, campaign_id):
+    """
+    Email every pending invitation of a campaign, INVITATION_SEND_BATCH_SIZE
+    messages per SMTP connection, committing results after each chunk so the
+    status endpoint shows progress. SMTP connection failures retry the task;
+    rows already sent are never sent again.
+    """
+    campaign = db.session.get(InvitationCampaign, campaign_id)
+    if not campaign or campaign.status == "completed":
+        return
+    campaign.status = "sending"
+    db.session.commit()
+
+    size = current_app.config.get("INVITATION_SEND_BATCH_SIZE", 100)
+    try:
+        while _send_invitation_chunk(campaign_id, size):
+            pass
+    except Exception as e:
+        raise self.retry(exc=e)
+
+    InvitationCampaign.query.filter_by(id=campaign_id).update(
+        {"status": "completed", "completed_at": datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+
+def _invitation_claim_lease():
+    """
+    Longest a live worker can hold a claimed chunk: every message waits for up
+    to four SMTP replies (MAIL, RCPT, DATA, end of data) and the connection
+    for a few more (greeting, EHLO, STARTTLS, AUTH, QUIT), each allowed
+    MAIL_TIMEOUT, plus a minute to spare.
+    """
+    size = current_app.config.get("INVITATION_SEND_BATCH_SIZE", 100)
+    timeout = current_app.config.get("MAIL_TIMEOUT", 10)
+    return timedelta(seconds=(4 * size + 7) * timeout + 60)
+
+@shared_task
+def resume_invitation_campaigns():
+    """
+    Beat sweep: re-queue campaigns that have not finished ten minutes after
+    creation (enqueue failed, worker died). Invitations still "sending" once
+    the claim lease has run out belonged to a dead worker and go back to
+    pending first (sent_at holds the claim time until the send completes).
+    """
+    now = datetime.utcnow()
+    campaign_ids = [row.id for row in db.session.query(InvitationCampaign.id).filter(
+        InvitationCampaign.status != "completed",
+        InvitationCampaign.created_at < now - timedelta(minutes=10)
+    )]
+    if not campaign_ids:
+        return
+    Invitation.query.filter(
+        Invitation.campaign_id.in_(campaign_ids),
+        Invitation.delivery_status == "sending",
+        Invitation.sent_at < now - _invitation_claim_lease()
+    ).update({"delivery_status": "pending", "sent_at": None}, synchronize_session=False)
+    db.session.commit()
+    for campaign_id in campaign_ids:
+        queue_invitation_campaign(campaign_id)
+
+def queue_invitation_campaign(campaign_id):
+    try:
+        deliver_invitation_campaign.delay(campaign_id)
+    except Exception as e:
+        current_app.logger.error("Error queueing invitation campaign %s: %s", campaign_id, str(e))
@@ -0,0 +1,46 @@
+"""Data set up for the tests, outside any query budget."""
+import uuid
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+from app import db
+from app.models import Availability, Invitation
+from app.tz_utils import UTC
+
+
+def day(offset):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def open_slots(app, recruiter_id, count, first_day=30):
+    with app.app_context():
+        rows = []
+        for i in range(count):
+            start = datetime.combine(date.today() + timedelta(days=first_day + i), datetime.min.time(), tzinfo=UTC)
+            start += timedelta(hours=9)
+            row = Availability.interval_columns(start, start + timedelta(hours=1))
+            row.update(recruiter_id=recruiter_id, booked=False)
+            rows.append(row)
+        ids = list(db.session.scalars(
+            insert(Availability).returning(Availability.id, sort_by_parameter_order=True), rows
+        ))
+        db.session.commit()
+        return ids
+
+
+def invitation(app, recruiter_id, pool_id=None):
+    token = uuid.uuid4().hex
+    email = f"candidate-{token[:12]}@example.com"
+    with app.app_context():
+        db.session.add(Invitation(
+            recruiter_id=recruiter_id, token=token, candidate_name="Candidate", candidate_email=email,
+            expiration=datetime.utcnow() + timedelta(days=2), pool_id=pool_id
+        ))
+        db.session.commit()
+    return token, email
+
+
+def book(client, slot_id, token, email):
+    return client.post("/public/book-slot", json={
+        "candidate_name": "Candidate", "candidate_email": email, "availability_id": slot_id,
+        "invitation_token": token, "candidate_position": "Engineer"
+    })
@@ -0,0 +1,50 @@
+from sqlalchemy import func, select
+from app import db
+from app.models import Availability, Booking, RecruiterDailyStats
+from app.stats import STAT_COLUMNS, TOTALS_DAY
+from tests.helpers import book, day, invitation
+
+
+def test_running_totals_follow_bookings_and_cancellations(app, client, make_recruiter):
+    recruiter_id, _, headers = make_recruiter()
+    for offset in (30, 31, 32):
+        response = client.post("/set-availability", headers=headers, json={
+            "date": day(offset), "start_time": "09:00", "end_time": "10:00"
+        })
+        assert response.status_code == 201
+    with app.app_context():
+        slot_ids = list(db.session.scalars(
+            select(Availability.id).filter_by(recruiter_id=recruiter_id).order_by(Availability.start_at)
+        ))
+
+    invitations = [invitation(app, recruiter_id) for _ in range(3)]
+    for slot_id, (token, email) in zip(slot_ids, invitations):
+        assert book(client, slot_id, token, email).status_code == 201
+    totals = client.get("/analytics", headers=headers).get_json()
+    assert totals["totals"] == {
+        "slots_offered": 3, "slots_booked": 3, "cancelled_by_candidate": 0, "cancelled_by_recruiter": 0
+    }
+    assert totals["total_bookings"] == totals["upcoming_bookings"] == 3
+
+    token, email = invitations[0]
+    response = client.post("/public/cancel-booking", json={
+        "candidate_name": "Candidate", "candidate_email": email, "invitation_token": token
+    })
+    assert response.status_code == 200
+    with app.app_context():
+        booking_id = db.session.scalar(select(Booking.id).filter_by(availability_id=slot_ids[1]))
+    assert client.delete(f"/cancel-booking/{booking_id}", headers=headers).status_code == 200
+
+    totals = client.get("/analytics", headers=headers).get_json()
+    assert totals["totals"] == {
+        "slots_offered": 3, "slots_booked": 3, "cancelled_by_candidate": 1, "cancelled_by_recruiter": 1
+    }
+    assert totals["total_bookings"] == totals["upcoming_bookings"] == 1
+
+    # The running totals row matches the daily rows it summarises
+    with app.app_context():
+        sums = db.session.execute(
+            select(*[func.sum(getattr(RecruiterDailyStats, column)) for column in STAT_COLUMNS])
+            .filter(RecruiterDailyStats.recruiter_id == recruiter_id, RecruiterDailyStats.day > TOTALS_DAY)
+        ).one()
+    assert dict(zip(STAT_COLUMNS, sums)) == totals["totals"]
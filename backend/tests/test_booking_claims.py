@@ -0,0 +1,50 @@
+from app import db, routes
+from app.models import Availability, Invitation
+from tests.helpers import book, invitation, open_slots
+
+
+def test_second_booking_of_a_slot_gets_alternatives(app, client, make_recruiter):
+    recruiter_id, _, _ = make_recruiter()
+    taken, free = open_slots(app, recruiter_id, 2)
+    first, second = invitation(app, recruiter_id), invitation(app, recruiter_id)
+
+    assert book(client, taken, *first).status_code == 201
+    response = book(client, taken, *second)
+    assert response.status_code == 409
+    assert [slot["id"] for slot in response.get_json()["alternative_slots"]] == [free]
+
+    # The losing request did not consume its invitation
+    assert book(client, free, *second).status_code == 201
+
+
+def test_invitation_is_claimed_once(app, client, make_recruiter):
+    recruiter_id, _, _ = make_recruiter()
+    first, second = open_slots(app, recruiter_id, 2)
+    token, email = invitation(app, recruiter_id)
+
+    assert book(client, first, token, email).status_code == 201
+    assert book(client, second, token, email).status_code == 400
+    with app.app_context():
+        assert db.session.get(Availability, second).booked is False
+
+
+def test_invitation_claimed_by_a_concurrent_request(app, client, make_recruiter, monkeypatch):
+    recruiter_id, _, _ = make_recruiter()
+    slot_id = open_slots(app, recruiter_id, 1)[0]
+    token, email = invitation(app, recruiter_id)
+
+    claim_invitation = routes.claim_invitation
+
+    def claimed_in_between(invitation):
+        # Another request uses the invitation after this one read it as unused
+        assert claim_invitation(invitation) == 1
+        return claim_invitation(invitation)
+
+    monkeypatch.setattr(routes, "claim_invitation", claimed_in_between)
+    response = book(client, slot_id, token, email)
+    assert response.status_code == 409
+    assert response.get_json()["error"] == "This invitation link has already been used."
+    with app.app_context():
+        # The slot claim was rolled back along with it
+        assert db.session.get(Availability, slot_id).booked is False
+        assert Invitation.query.filter_by(token=token).one().used is False
@@ -0,0 +1,38 @@
+import json
+from tests.helpers import book, invitation, open_slots
+
+
+def _victim_with_a_booking(app, client, make_recruiter):
+    victim_id, victim_email, _ = make_recruiter()
+    slot_id = open_slots(app, victim_id, 1)[0]
+    token, candidate_email = invitation(app, victim_id)
+    assert book(client, slot_id, token, candidate_email).status_code == 201
+    return victim_id, victim_email, candidate_email
+
+
+def test_pool_owner_cannot_export_a_members_bookings(app, client, make_recruiter):
+    victim_id, victim_email, _ = _victim_with_a_booking(app, client, make_recruiter)
+    _, _, headers = make_recruiter()
+    pool_id = client.post("/pools", headers=headers, json={"name": "Team"}).get_json()["pool_id"]
+    client.post(f"/pools/{pool_id}/members", headers=headers, json={"emails": [victim_email]})
+
+    for kind in ("bookings", "availability"):
+        response = client.get(f"/export/{kind}?recruiter_id={victim_id}", headers=headers)
+        assert response.status_code == 403
+
+
+def test_export_own_bookings(app, client, make_recruiter):
+    victim_id, _, _ = _victim_with_a_booking(app, client, make_recruiter)
+    recruiter_id, _, headers = make_recruiter()
+    slot_id = open_slots(app, recruiter_id, 1)[0]
+    token, candidate_email = invitation(app, recruiter_id)
+    assert book(client, slot_id, token, candidate_email).status_code == 201
+
+    for query in ("", f"&recruiter_id={recruiter_id}"):
+        response = client.get(f"/export/bookings?format=ndjson{query}", headers=headers)
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [(row["recruiter_id"], row["candidate_email"]) for row in rows] == [(recruiter_id, candidate_email)]
+
+    response = client.get(f"/export/bookings?recruiter_id={recruiter_id},{victim_id}", headers=headers)
+    assert response.status_code == 403
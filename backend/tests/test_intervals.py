@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.intervals import load_recruiter_intervals
+from app.models import MAX_SLOT_DURATION, Availability
+from app.tz_utils import UTC
+
+
+def test_load_recruiter_intervals_reaches_back_one_slot_length(app, make_recruiter):
+    recruiter_id = make_recruiter()[0]
+    range_start = datetime(2031, 3, 10, 12, tzinfo=UTC)
+    with app.app_context():
+        for start, end in [
+            (range_start - timedelta(hours=20), range_start + timedelta(hours=1)),   # reaches in
+            (range_start - timedelta(hours=30), range_start - timedelta(hours=27)),  # ends before
+        ]:
+            slot = Availability(recruiter_id=recruiter_id, booked=False)
+            slot.set_interval(start, end)
+            db.session.add(slot)
+        db.session.commit()
+
+        busy = load_recruiter_intervals(recruiter_id, range_start, range_start + timedelta(hours=2))
+        assert len(busy) == 1
+        assert busy.overlaps(range_start, range_start + timedelta(minutes=30))
+
+
+def test_intervals_longer_than_a_slot_are_rejected():
+    start = datetime(2031, 3, 10, tzinfo=UTC)
+    with pytest.raises(ValueError):
+        Availability.interval_columns(start, start + MAX_SLOT_DURATION + timedelta(minutes=1))
@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime, timedelta
+from app import db
+from app.models import Invitation, InvitationCampaign
+
+
+def _claimed_campaign(recruiter_id, claimed_at):
+    campaign = InvitationCampaign(
+        recruiter_id=recruiter_id, total=1, status="sending", created_at=datetime.utcnow() - timedelta(days=1)
+    )
+    db.session.add(campaign)
+    db.session.flush()
+    invitation = Invitation(
+        recruiter_id=recruiter_id, token=uuid.uuid4().hex, candidate_name="Candidate",
+        candidate_email="candidate@example.com", expiration=datetime.utcnow() + timedelta(days=2),
+        campaign_id=campaign.id, delivery_status="sending", sent_at=claimed_at
+    )
+    db.session.add(invitation)
+    db.session.flush()
+    # Taken before the commit: reloading it after would hold a read snapshot
+    # from before the sweep
+    invitation_id = invitation.id
+    db.session.commit()
+    return invitation_id
+
+
+def test_resume_leaves_live_claims_alone(app, make_recruiter):
+    # After create_app, so the tasks run in app contexts
+    from tasks import _invitation_claim_lease, resume_invitation_campaigns
+
+    recruiter_id = make_recruiter()[0]
+    with app.app_context():
+        lease = _invitation_claim_lease()
+        # A full chunk at the default MAIL_TIMEOUT may legitimately take well over ten minutes
+        assert lease > timedelta(minutes=30)
+        live = _claimed_campaign(recruiter_id, datetime.utcnow() - lease + timedelta(minutes=5))
+        dead = _claimed_campaign(recruiter_id, datetime.utcnow() - lease - timedelta(minutes=5))
+
+        resume_invitation_campaigns()
+
+        assert db.session.get(Invitation, live).delivery_status == "sending"
+        assert db.session.get(Invitation, dead).delivery_status == "sent"
@@ -0,0 +1,24 @@
+import pytest
+from flask import Flask
+from app.metrics import Metrics
+
+
+def _client(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    Metrics(app)
+    return app.test_client()
+
+
+def test_metrics_are_off_without_a_token():
+    assert _client().get("/metrics").status_code == 404
+
+
+@pytest.mark.parametrize("authorization, status", [(None, 401), ("Bearer wrong", 401), ("Bearer scrape", 200)])
+def test_metrics_require_the_token(authorization, status):
+    headers = {"Authorization": authorization} if authorization else {}
+    assert _client(METRICS_AUTH_TOKEN="scrape").get("/metrics", headers=headers).status_code == status
+
+
+def test_metrics_public_opt_in():
+    assert _client(METRICS_PUBLIC=True).get("/metrics").status_code == 200
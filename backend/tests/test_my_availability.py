@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app import db
+from app.models import Availability
+from app.tz_utils import UTC, get_zone, utc_now
+from tests.helpers import open_slots
+
+
+def _old_slots(app, recruiter_id, count):
+    start = datetime(2020, 1, 1, 9, tzinfo=UTC)
+    rows = [
+        dict(Availability.interval_columns(start + timedelta(hours=2 * i), start + timedelta(hours=2 * i, minutes=30)),
+             recruiter_id=recruiter_id, booked=False)
+        for i in range(count)
+    ]
+    with app.app_context():
+        db.session.execute(insert(Availability), rows)
+        db.session.commit()
+
+
+def _pages(client, headers, query):
+    pages, cursor = [], None
+    while True:
+        url = f"/my-availability?{query}" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url, headers=headers).get_json()
+        pages.append(body["available_slots"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            return pages
+
+
+def test_default_window_starts_today(app, client, make_recruiter):
+    recruiter_id, _, headers = make_recruiter("America/New_York")
+    _old_slots(app, recruiter_id, 600)
+    upcoming = open_slots(app, recruiter_id, 3, first_day=1) + open_slots(app, recruiter_id, 1, first_day=2000)
+
+    body = client.get("/my-availability", headers=headers).get_json()
+    assert [slot["id"] for slot in body["available_slots"]] == upcoming
+    assert body["next_cursor"] is None
+    today = utc_now().astimezone(get_zone("America/New_York")).strftime("%Y-%m-%d")
+    assert all(slot["date"] >= today for slot in body["available_slots"])
+
+    # An explicit from still reaches back
+    body = client.get("/my-availability?from=2020-01-01&limit=10", headers=headers).get_json()
+    assert body["available_slots"][0]["date"] == "2020-01-01"
+    assert body["next_cursor"]
+
+
+def test_cursor_walks_to_the_last_page(app, client, make_recruiter):
+    recruiter_id, _, headers = make_recruiter()
+    _old_slots(app, recruiter_id, 5)
+    upcoming = open_slots(app, recruiter_id, 7, first_day=1)
+
+    pages = _pages(client, headers, "limit=3")
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [slot["id"] for page in pages for slot in page] == upcoming
+
+    # A last page that is exactly full has no cursor either
+    pages = _pages(client, headers, "limit=7")
+    assert [len(page) for page in pages] == [7]
@@ -0,0 +1,105 @@
+import importlib
+import os
+import re
+import time
+import uuid
+import pytest
+from flask import Flask
+from app import mail
+from app.otp_store import OTPStore
+
+# app.otp_store is also the name of the extension instance
+otp_store_module = importlib.import_module("app.otp_store")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request, monkeypatch):
+    """(OTPStore with a 2 second attempt window, advance(seconds)) on each backend."""
+    flask_app = Flask(__name__)
+    flask_app.config["OTP_TTL_SECONDS"] = 2
+    if request.param == "memory":
+        clock = _Clock()
+        monkeypatch.setattr(otp_store_module.time, "monotonic", clock)
+        flask_app.config["OTP_STORE_URL"] = "memory://"
+        advance = clock.advance
+    else:
+        if not os.getenv("TEST_REDIS_URL"):
+            pytest.skip("TEST_REDIS_URL is not set")
+        flask_app.config["OTP_STORE_URL"] = os.environ["TEST_REDIS_URL"]
+        advance = time.sleep
+    with flask_app.app_context():
+        yield OTPStore(flask_app), advance
+
+
+def test_codes_expire(store):
+    otp_store, advance = store
+    subject = uuid.uuid4().hex
+    otp_store.issue("login", subject, "123456", 2)
+    assert otp_store.peek("login", subject) == "123456"
+    advance(2.5)
+    assert otp_store.peek("login", subject) is None
+    assert otp_store.consume("login", subject) is None
+
+
+def test_codes_are_consumed_once(store):
+    otp_store, _ = store
+    subject = uuid.uuid4().hex
+    otp_store.issue("reset", subject, "42", 60)
+    assert otp_store.record_attempt("reset", subject) == 1
+    assert otp_store.consume("reset", subject) == "42"
+    assert otp_store.consume("reset", subject) is None
+    # Consuming clears the attempt counter too
+    assert otp_store.record_attempt("reset", subject) == 1
+
+
+def test_attempt_window_starts_at_the_first_attempt(store):
+    otp_store, advance = store
+    subject = uuid.uuid4().hex
+    assert [otp_store.record_attempt("login", subject) for _ in range(3)] == [1, 2, 3]
+    advance(1.2)
+    # Later attempts don't push the window out
+    assert otp_store.record_attempt("login", subject) == 4
+    advance(1.2)
+    assert otp_store.record_attempt("login", subject) == 1
+
+
+def _register_and_login(client):
+    email = f"otp-{uuid.uuid4().hex[:12]}@example.com"
+    assert client.post("/register", json={
+        "name": "OTP", "email": email, "password": "secret-password", "timezone": "UTC"
+    }).status_code == 201
+    with mail.record_messages() as outbox:
+        assert client.post("/login", json={"email": email, "password": "secret-password"}).status_code == 200
+    return email, re.search(r"password is: (\d+)", outbox[-1].body).group(1)
+
+
+def test_too_many_wrong_codes_lock_the_login(app, client):
+    email, otp = _register_and_login(client)
+    wrong = "000000" if otp != "000000" else "111111"
+    for _ in range(app.config["OTP_MAX_ATTEMPTS"]):
+        assert client.post("/verify-otp", json={"email": email, "otp": wrong}).status_code == 401
+    assert client.post("/verify-otp", json={"email": email, "otp": otp}).status_code == 429
+    # The code was burned with the lockout
+    assert client.post("/verify-otp", json={"email": email, "otp": otp}).status_code == 401
+
+    email, otp = _register_and_login(client)
+    assert client.post("/verify-otp", json={"email": email, "otp": otp}).status_code == 200
+
+
+def test_expired_code_is_rejected(app, client, monkeypatch):
+    email, otp = _register_and_login(client)
+    clock = _Clock()
+    monkeypatch.setattr(otp_store_module.time, "monotonic", clock)
+    clock.advance(app.config["OTP_TTL_SECONDS"] + 1)
+    assert client.post("/verify-otp", json={"email": email, "otp": otp}).status_code == 401
@@ -0,0 +1,44 @@
+import uuid
+from werkzeug.security import generate_password_hash
+from app import db, password_hasher
+from app.models import Recruiter
+from app.passwords import PasswordHasher
+
+
+def _hasher(method, salt_length=16):
+    hasher = PasswordHasher()
+    hasher.method, hasher.salt_length = method, salt_length
+    return hasher
+
+
+def test_needs_rehash_compares_parsed_parameters():
+    stored = generate_password_hash("pw", method="pbkdf2:sha256:260000", salt_length=16)
+    assert not _hasher("pbkdf2:sha256:260000").needs_rehash(stored)
+    # werkzeug's default iteration count is written into the hash
+    assert not _hasher("pbkdf2:sha256").needs_rehash(stored)
+    assert _hasher("pbkdf2:sha256:600000").needs_rehash(stored)
+    assert _hasher("pbkdf2:sha512:260000").needs_rehash(stored)
+    assert _hasher("pbkdf2:sha256:260000", salt_length=32).needs_rehash(stored)
+
+
+def test_hash_from_default_method_is_stable():
+    hasher = _hasher("pbkdf2:sha256")
+    assert not hasher.needs_rehash(hasher.hash("pw"))
+    assert hasher.verify(hasher.hash("pw"), "pw")
+
+
+def test_login_upgrades_an_old_hash(app, client):
+    email = f"rehash-{uuid.uuid4().hex[:12]}@example.com"
+    with app.app_context():
+        db.session.add(Recruiter(
+            name="Old", email=email, password=generate_password_hash("pw", method="pbkdf2:sha256:1000"),
+            timezone="UTC"
+        ))
+        db.session.commit()
+
+    assert client.post("/login", json={"email": email, "password": "wrong"}).status_code == 401
+    assert client.post("/login", json={"email": email, "password": "pw"}).status_code == 200
+    with app.app_context():
+        stored = Recruiter.query.filter_by(email=email).one().password
+    assert not password_hasher.needs_rehash(stored)
+    assert password_hasher.verify(stored, "pw")
@@ -0,0 +1,102 @@
+from datetime import date, datetime, time, timedelta
+from app import db
+from app.models import Availability, InterviewPoolMember
+from app.pools import assignment_candidates
+from app.tz_utils import UTC
+from tests.helpers import book, invitation, open_slots
+
+
+def _pool(client, owner_headers, members, accept=True):
+    pool_id = client.post("/pools", headers=owner_headers, json={"name": "Team"}).get_json()["pool_id"]
+    response = client.post(f"/pools/{pool_id}/members", headers=owner_headers, json={
+        "emails": [email for _, email, _ in members]
+    })
+    assert response.get_json()["invited"] == sorted(recruiter_id for recruiter_id, _, _ in members)
+    if accept:
+        for _, _, headers in members:
+            assert client.post(f"/pools/{pool_id}/accept", headers=headers).status_code == 200
+    return pool_id
+
+
+def _slot_owners(app, client, pool_id):
+    slots = client.get(f"/public/pools/{pool_id}/availability?limit=100").get_json()["available_slots"]
+    return sum(slot["recruiters_available"] for slot in slots)
+
+
+def test_invited_recruiters_join_only_when_they_accept(app, client, make_recruiter):
+    owner_id, _, owner_headers = make_recruiter()
+    member = make_recruiter()
+    member_id, _, member_headers = member
+    open_slots(app, owner_id, 2)
+    open_slots(app, member_id, 3)
+    pool_id = _pool(client, owner_headers, [member], accept=False)
+
+    # Pending: none of the member's slots, and no pool invitations in their name
+    assert _slot_owners(app, client, pool_id) == 2
+    assert client.get("/pools", headers=member_headers).get_json()["pools"] == [
+        {"id": pool_id, "name": "Team", "owner": False, "pending": True, "member_count": 1}
+    ]
+    assert client.post("/send-invitation", headers=member_headers, json={
+        "candidate_name": "Candidate", "candidate_email": "c@example.com", "pool_id": pool_id
+    }).status_code == 404
+
+    assert client.post(f"/pools/{pool_id}/accept", headers=member_headers).status_code == 200
+    assert client.post(f"/pools/{pool_id}/accept", headers=member_headers).status_code == 404
+    assert _slot_owners(app, client, pool_id) == 5
+    assert client.get("/pools", headers=owner_headers).get_json()["pools"][0]["member_count"] == 2
+
+
+def test_invited_recruiter_can_decline(app, client, make_recruiter):
+    _, _, owner_headers = make_recruiter()
+    member = make_recruiter()
+    pool_id = _pool(client, owner_headers, [member], accept=False)
+    assert client.delete(f"/pools/{pool_id}/members/{member[0]}", headers=member[2]).status_code == 200
+    assert client.get("/pools", headers=member[2]).get_json()["pools"] == []
+    assert client.post(f"/pools/{pool_id}/accept", headers=member[2]).status_code == 404
+
+
+def _interview_time(days):
+    start = datetime.combine(date.today() + timedelta(days=days), time(9), tzinfo=UTC)
+    return start, start + timedelta(hours=1)
+
+
+def _set_last_assigned(app, pool_id, recruiter_id, value):
+    with app.app_context():
+        InterviewPoolMember.query.filter_by(pool_id=pool_id, recruiter_id=recruiter_id).update(
+            {"last_assigned_at": value}, synchronize_session=False
+        )
+        db.session.commit()
+
+
+def test_assignment_prefers_least_loaded_then_longest_unassigned(app, client, make_recruiter):
+    busy, idle, rested = (make_recruiter() for _ in range(3))
+    # All three are free at 09:00 on day 40; busy already has interviews on days 39 and 41
+    busy_slots = open_slots(app, busy[0], 3, first_day=39)
+    for slot_id in (busy_slots[0], busy_slots[2]):
+        assert book(client, slot_id, *invitation(app, busy[0])).status_code == 201
+    open_slots(app, idle[0], 1, first_day=40)
+    open_slots(app, rested[0], 1, first_day=40)
+    pool_id = _pool(client, busy[2], [idle, rested])
+    _set_last_assigned(app, pool_id, idle[0], datetime.utcnow() - timedelta(hours=1))
+    _set_last_assigned(app, pool_id, rested[0], datetime.utcnow() - timedelta(days=3))
+
+    start, end = _interview_time(40)
+    with app.app_context():
+        order = [recruiter_id for _, recruiter_id in assignment_candidates(pool_id, start, end)]
+    assert order == [rested[0], idle[0], busy[0]]
+
+    # Booking through the pool follows that order, and each booking adds to the member's load
+    assigned = []
+    for _ in range(3):
+        token, email = invitation(app, busy[0], pool_id)
+        response = client.post(f"/public/pools/{pool_id}/book-slot", json={
+            "candidate_name": "Candidate", "candidate_email": email, "invitation_token": token,
+            "start_at": start.isoformat(), "end_at": end.isoformat()
+        })
+        assert response.status_code == 201
+        with app.app_context():
+            assigned.append(db.session.query(Availability.recruiter_id).filter(
+                Availability.start_at == start, Availability.booked == True,
+                Availability.recruiter_id.notin_(assigned)
+            ).scalar())
+    assert assigned == [rested[0], idle[0], busy[0]]
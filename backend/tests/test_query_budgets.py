@@ -0,0 +1,141 @@
+"""
+Every hot endpoint stays within its statement budget (app/testing.py).
+
+Fixtures are set up outside query_budget(); each block then holds only the
+requests being measured.
+"""
+import re
+import uuid
+from app import db, mail
+from app.models import Booking
+from tests.helpers import book, day, invitation, open_slots
+
+
+def test_account_endpoints(app, client, make_recruiter, query_budget):
+    email = f"new-{uuid.uuid4().hex[:12]}@example.com"
+    with mail.record_messages() as outbox:
+        with query_budget():
+            assert client.post("/register", json={
+                "name": "New", "email": email, "password": "secret-password", "timezone": "UTC"
+            }).status_code == 201
+            assert client.post("/login", json={"email": email, "password": "secret-password"}).status_code == 200
+        otp = re.search(r"password is: (\d+)", outbox[-1].body).group(1)
+        with query_budget():
+            assert client.post("/verify-otp", json={"email": email, "otp": otp}).status_code == 200
+            assert client.post("/forgot-password", json={"email": email}).status_code == 200
+        reset_token = outbox[-1].body.rsplit("/", 1)[1].strip()
+        with query_budget():
+            assert client.post("/reset-password", json={
+                "token": reset_token, "new_password": "another-password"
+            }).status_code == 200
+
+    _, _, headers = make_recruiter()
+    with query_budget():
+        assert client.get("/profile", headers=headers).status_code == 200
+
+
+def test_recruiter_reads(app, client, make_recruiter, query_budget):
+    recruiter_id, _, headers = make_recruiter("America/New_York")
+    slot_ids = open_slots(app, recruiter_id, 20)
+    book(client, slot_ids[0], *invitation(app, recruiter_id))
+
+    with query_budget():
+        assert client.get("/my-availability?limit=10", headers=headers).status_code == 200
+        assert client.get(f"/analytics?from={day(0)}&to={day(60)}", headers=headers).status_code == 200
+        assert client.get(f"/public/availability/{recruiter_id}").status_code == 200
+        assert client.get(f"/public/availability/{recruiter_id}?tz=Europe/Berlin").status_code == 200
+        assert client.get("/export/bookings", headers=headers).status_code == 200
+        assert client.get("/export/availability?format=ndjson", headers=headers).status_code == 200
+
+
+def test_availability_writes(app, client, make_recruiter, query_budget):
+    recruiter_id, _, headers = make_recruiter()
+    with query_budget():
+        assert client.post("/set-availability", headers=headers, json={
+            "date": day(10), "start_time": "09:00", "end_time": "10:00"
+        }).status_code == 201
+        assert client.post("/set-recurring-availability", headers=headers, json={
+            "start_date": day(20), "end_date": day(48), "start_time": "09:00", "end_time": "10:00"
+        }).status_code == 201
+        assert client.post("/set-daily-availability", headers=headers, json={
+            "date": day(11), "start_time": "09:00", "end_time": "17:00", "duration": "30"
+        }).status_code == 201
+        assert client.post("/set-availability/bulk", headers=headers, json={
+            "dates": [day(60 + i) for i in range(5)],
+            "ranges": [{"start_time": "09:00", "end_time": "17:00"}], "duration": 30
+        }).status_code == 201
+
+    slot_ids = open_slots(app, recruiter_id, 2, first_day=100)
+    with query_budget():
+        assert client.put(f"/update-availability/{slot_ids[0]}", headers=headers, json={
+            "date": day(102), "start_time": "11:00", "end_time": "12:00"
+        }).status_code == 200
+        assert client.delete(f"/delete-availability/{slot_ids[1]}", headers=headers).status_code == 200
+
+
+def test_booking_endpoints(app, client, make_recruiter, query_budget):
+    recruiter_id, _, headers = make_recruiter()
+    slot_ids = open_slots(app, recruiter_id, 3)
+    with query_budget():
+        assert client.post("/send-invitation", headers=headers, json={
+            "candidate_name": "Candidate", "candidate_email": "invited@example.com"
+        }).status_code == 200
+        assert client.post("/send-invitation/bulk", headers=headers, json={
+            "name": "Campaign", "candidates": [
+                {"candidate_name": f"C{i}", "candidate_email": f"bulk-{i}@example.com"} for i in range(20)
+            ]
+        }).status_code == 202
+
+    token, email = invitation(app, recruiter_id)
+    with query_budget():
+        assert book(client, slot_ids[0], token, email).status_code == 201
+    with query_budget():
+        assert client.post("/public/cancel-booking", json={
+            "candidate_name": "Candidate", "candidate_email": email, "invitation_token": token
+        }).status_code == 200
+
+    book(client, slot_ids[1], *invitation(app, recruiter_id))
+    with app.app_context():
+        booking_id = db.session.query(Booking.id).filter_by(availability_id=slot_ids[1]).scalar()
+    with query_budget():
+        assert client.delete(f"/cancel-booking/{booking_id}", headers=headers).status_code == 200
+
+
+def test_campaign_status(app, client, make_recruiter, query_budget):
+    _, _, headers = make_recruiter()
+    campaign_id = client.post("/send-invitation/bulk", headers=headers, json={
+        "candidates": [{"candidate_name": "C", "candidate_email": "c@example.com"}]
+    }).get_json()["campaign_id"]
+    with query_budget():
+        assert client.get(f"/invitation-campaigns/{campaign_id}", headers=headers).status_code == 200
+
+
+def test_pool_endpoints(app, client, make_recruiter, query_budget):
+    owner_id, _, owner_headers = make_recruiter()
+    members = [make_recruiter() for _ in range(3)]
+    for recruiter_id, _, _ in [(owner_id, None, None)] + members:
+        open_slots(app, recruiter_id, 5)
+
+    with query_budget():
+        response = client.post("/pools", headers=owner_headers, json={"name": "Team"})
+        assert response.status_code == 201
+        pool_id = response.get_json()["pool_id"]
+        assert client.post(f"/pools/{pool_id}/members", headers=owner_headers, json={
+            "emails": [email for _, email, _ in members]
+        }).status_code == 200
+        for _, _, member_headers in members:
+            assert client.post(f"/pools/{pool_id}/accept", headers=member_headers).status_code == 200
+        assert client.get("/pools", headers=owner_headers).status_code == 200
+        assert client.get(f"/public/pools/{pool_id}/availability?limit=10").status_code == 200
+
+    first = client.get(f"/public/pools/{pool_id}/availability").get_json()["available_slots"][0]
+    token, email = invitation(app, owner_id, pool_id)
+    with query_budget():
+        assert client.post(f"/public/pools/{pool_id}/book-slot", json={
+            "candidate_name": "Candidate", "candidate_email": email, "invitation_token": token,
+            "start_at": first["start_at"], "end_at": first["end_at"]
+        }).status_code == 201
+
+    member_id = members[0][0]
+    with query_budget():
+        assert client.delete(f"/pools/{pool_id}/members/{member_id}", headers=owner_headers).status_code == 200
@@ -0,0 +1,31 @@
+"""
+The hot queries in app/query_plans.py are served by indexes: on the SQLite
+test database, and on Postgres when TEST_POSTGRES_URL points at a scratch
+database (its tables are created and dropped by the test).
+"""
+import os
+import pytest
+from sqlalchemy import create_engine
+from app import db
+from app.query_plans import check_query_plans
+
+
+def _full_scans(results):
+    return {name: (plan, scans) for name, plan, scans in results if scans}
+
+
+def test_sqlite_plans_use_indexes(app):
+    with app.app_context():
+        assert db.engine.dialect.name == "sqlite"
+        assert _full_scans(check_query_plans()) == {}
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL is not set")
+def test_postgres_plans_use_indexes():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    db.metadata.create_all(engine)
+    try:
+        assert _full_scans(check_query_plans(engine)) == {}
+    finally:
+        db.metadata.drop_all(engine)
+        engine.dispose()
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from sqlalchemy import select, update
+from app import celery, db, mail
+from app.models import Availability, Booking
+from app.tz_utils import UTC, utc_now
+from tests.helpers import book, invitation, open_slots
+
+
+def _reminders(outbox, email):
+    return [message for message in outbox if message.subject.startswith("Reminder") and email in message.recipients]
+
+
+def _booking(app, slot_id):
+    with app.app_context():
+        return db.session.execute(
+            select(Booking.id, Booking.reminder_task_id, Booking.reminder_sent_at).filter_by(availability_id=slot_id)
+        ).one()
+
+
+def _move_to(app, slot_id, start):
+    """Move a booked slot so it starts at start, without touching its reminder state."""
+    with app.app_context():
+        columns = Availability.interval_columns(start, start + timedelta(hours=1))
+        db.session.execute(update(Availability).filter_by(id=slot_id).values(columns))
+        db.session.execute(update(Booking).filter_by(availability_id=slot_id).values(columns))
+        db.session.commit()
+
+
+def test_booking_stores_and_cancelling_revokes_the_reminder(app, client, make_recruiter, monkeypatch):
+    from app import routes
+
+    recruiter_id, _, headers = make_recruiter()
+    slot_id = open_slots(app, recruiter_id, 1)[0]
+    token, email = invitation(app, recruiter_id)
+    with mail.record_messages() as outbox:
+        assert book(client, slot_id, token, email).status_code == 201
+    booking_id, task_id, sent_at = _booking(app, slot_id)
+    assert task_id
+    # Far ahead: the (eager) ETA task ran and left the reminder for later
+    assert sent_at is None and _reminders(outbox, email) == []
+
+    revoked = []
+    monkeypatch.setattr(routes, "revoke_booking_reminder", revoked.append)
+    assert client.delete(f"/cancel-booking/{booking_id}", headers=headers).status_code == 200
+    assert revoked == [task_id]
+
+
+def test_revoke_booking_reminder(app, monkeypatch):
+    from tasks import revoke_booking_reminder
+
+    revoked = []
+    monkeypatch.setattr(celery.control, "revoke", revoked.append)
+    with app.app_context():
+        revoke_booking_reminder("eager")
+        monkeypatch.setattr(celery.conf, "task_always_eager", False)
+        revoke_booking_reminder(None)
+        revoke_booking_reminder("queued")
+    assert revoked == ["queued"]
+
+
+def test_booking_inside_the_lead_time_is_reminded_once(app, client, make_recruiter):
+    from tasks import send_booking_reminder, send_reminder_emails
+
+    recruiter_id, _, _ = make_recruiter()
+    slot_id = open_slots(app, recruiter_id, 1)[0]
+    _move_to(app, slot_id, utc_now().replace(second=0, microsecond=0) + timedelta(hours=1))
+    token, email = invitation(app, recruiter_id)
+    with mail.record_messages() as outbox:
+        assert book(client, slot_id, token, email).status_code == 201
+        booking_id, task_id, sent_at = _booking(app, slot_id)
+        assert sent_at is not None
+
+        with app.app_context():
+            send_booking_reminder.apply((booking_id,), task_id=task_id)
+            send_reminder_emails()
+    assert len(_reminders(outbox, email)) == 1
+
+
+def test_sweep_claims_each_due_reminder_once(app, client, make_recruiter):
+    from tasks import send_booking_reminder, send_reminder_emails
+
+    recruiter_id, _, _ = make_recruiter()
+    due, later = open_slots(app, recruiter_id, 2)
+    candidates = {}
+    for slot_id in (due, later):
+        token, email = invitation(app, recruiter_id)
+        assert book(client, slot_id, token, email).status_code == 201
+        candidates[slot_id] = email
+    # As if the ETA task had been lost
+    now = utc_now().replace(second=0, microsecond=0)
+    _move_to(app, due, now + timedelta(hours=1))
+    _move_to(app, later, now + timedelta(hours=3))
+
+    with mail.record_messages() as outbox:
+        with app.app_context():
+            send_reminder_emails()
+            send_reminder_emails()
+            booking_id, task_id, _ = _booking(app, due)
+            send_booking_reminder.apply((booking_id,), task_id=task_id)
+    assert len(_reminders(outbox, candidates[due])) == 1
+    assert _reminders(outbox, candidates[later]) == []
+    assert _booking(app, due).reminder_sent_at is not None
+    assert _booking(app, later).reminder_sent_at is None
@@ -0,0 +1,83 @@
+from flask import Flask
+from sqlalchemy import func, select, update
+from app import db
+from app.cache import SlotCache
+from app.models import Availability, Booking
+from tests.helpers import book, day, invitation, open_slots
+
+
+def test_invalidate_moves_readers_to_a_new_generation():
+    cache = SlotCache(Flask(__name__))
+    loads = []
+
+    def loader():
+        loads.append(len(loads))
+        return [{"id": len(loads)}]
+
+    assert cache.get_or_load(1, loader) == [{"id": 1}]
+    assert cache.get_or_load(1, loader) == [{"id": 1}]
+    cache.invalidate(1)
+    assert cache.get_or_load(1, loader) == [{"id": 2}]
+    assert cache.get_or_load(2, loader) == [{"id": 3}]
+    assert len(loads) == 3
+
+
+def test_a_load_that_raced_a_write_is_not_served():
+    cache = SlotCache(Flask(__name__))
+
+    def stale_loader():
+        # A write commits and invalidates while this reader is loading
+        cache.invalidate(1)
+        return ["stale"]
+
+    assert cache.get_or_load(1, stale_loader) == ["stale"]
+    assert cache.get_or_load(1, lambda: ["fresh"]) == ["fresh"]
+
+
+def _public_slot_ids(client, recruiter_id):
+    response = client.get(f"/public/availability/{recruiter_id}")
+    assert response.status_code == 200
+    return [slot["id"] for slot in response.get_json()["available_slots"]]
+
+
+def test_writes_invalidate_public_availability(app, client, make_recruiter):
+    recruiter_id, _, headers = make_recruiter()
+    first, second = open_slots(app, recruiter_id, 2)
+    assert _public_slot_ids(client, recruiter_id) == [first, second]
+
+    # A write that skips invalidate() is not seen: reads really are cached
+    with app.app_context():
+        db.session.execute(update(Availability).where(Availability.id == second).values(booked=True))
+        db.session.commit()
+    assert _public_slot_ids(client, recruiter_id) == [first, second]
+    with app.app_context():
+        db.session.execute(update(Availability).where(Availability.id == second).values(booked=False))
+        db.session.commit()
+
+    token, email = invitation(app, recruiter_id)
+    assert book(client, first, token, email).status_code == 201
+    assert _public_slot_ids(client, recruiter_id) == [second]
+
+    response = client.post("/public/cancel-booking", json={
+        "candidate_name": "Candidate", "candidate_email": email, "invitation_token": token
+    })
+    assert response.status_code == 200
+    assert _public_slot_ids(client, recruiter_id) == [first, second]
+
+    assert book(client, second, token, email).status_code == 201
+    assert _public_slot_ids(client, recruiter_id) == [first]
+    with app.app_context():
+        booking_id = db.session.scalar(select(Booking.id).filter_by(availability_id=second))
+    assert client.delete(f"/cancel-booking/{booking_id}", headers=headers).status_code == 200
+    assert _public_slot_ids(client, recruiter_id) == [first, second]
+
+    response = client.post("/set-availability", headers=headers, json={
+        "date": day(60), "start_time": "09:00", "end_time": "10:00"
+    })
+    assert response.status_code == 201
+    with app.app_context():
+        added = db.session.scalar(select(func.max(Availability.id)).filter_by(recruiter_id=recruiter_id))
+    assert _public_slot_ids(client, recruiter_id) == [first, second, added]
+
+    assert client.delete(f"/delete-availability/{first}", headers=headers).status_code == 200
+    assert _public_slot_ids(client, recruiter_id) == [second, added]
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import pytest
+from app.tz_utils import UTC, ZoneWindow, _year_transitions, local_to_utc, utc_to_local
+
+
+def _every_quarter_hour(start, end):
+    times = []
+    while start < end:
+        times.append(start)
+        start += timedelta(minutes=15)
+    return times
+
+
+def _assert_matches_zoneinfo(zone_name, local_start, local_end):
+    """Both directions, every quarter hour, against datetime + zoneinfo (fold=0)."""
+    zone = ZoneInfo(zone_name)
+    local_times = _every_quarter_hour(local_start, local_end)
+    expected_utc = [dt.replace(tzinfo=zone).astimezone(UTC) for dt in local_times]
+    assert local_to_utc(local_times, zone_name) == expected_utc
+
+    utc_times = _every_quarter_hour(expected_utc[0], expected_utc[-1])
+    converted = utc_to_local(utc_times, zone_name)
+    for utc_dt, local_dt in zip(utc_times, converted):
+        expected = utc_dt.astimezone(zone)
+        assert local_dt.replace(tzinfo=None) == expected.replace(tzinfo=None)
+        assert local_dt.utcoffset() == expected.utcoffset()
+        assert local_dt == utc_dt
+
+
+def _transitions_from_zoneinfo(zone_name, year):
+    zone = ZoneInfo(zone_name)
+    transitions = []
+    instant = datetime(year, 1, 1, tzinfo=UTC)
+    previous = instant.astimezone(zone).utcoffset()
+    while instant < datetime(year + 1, 1, 1, tzinfo=UTC):
+        instant += timedelta(minutes=15)
+        offset = instant.astimezone(zone).utcoffset()
+        if offset != previous:
+            transitions.append((instant, previous, offset))
+            previous = offset
+    return tuple(transitions)
+
+
+@pytest.mark.parametrize("zone_name, year", [
+    ("America/New_York", 2026),
+    ("Europe/London", 2026),
+    ("Australia/Lord_Howe", 2026),  # half hour DST
+    ("Asia/Kolkata", 2026),
+    ("Pacific/Apia", 2011),  # skipped 30 December
+])
+def test_year_transitions(zone_name, year):
+    assert _year_transitions(zone_name, year) == _transitions_from_zoneinfo(zone_name, year)
+
+
+def test_spring_forward_gap():
+    # 02:00-03:00 on 8 March 2026 does not exist in New York
+    _assert_matches_zoneinfo("America/New_York", datetime(2026, 3, 7, 20), datetime(2026, 3, 8, 8))
+    assert local_to_utc([datetime(2026, 3, 8, 2, 30)], "America/New_York") == [
+        datetime(2026, 3, 8, 7, 30, tzinfo=UTC)
+    ]
+
+
+def test_fall_back_fold():
+    # 01:00-02:00 on 1 November 2026 happens twice in New York; fold=0 is the first
+    _assert_matches_zoneinfo("America/New_York", datetime(2026, 10, 31, 20), datetime(2026, 11, 1, 8))
+    assert local_to_utc([datetime(2026, 11, 1, 1, 30)], "America/New_York") == [
+        datetime(2026, 11, 1, 5, 30, tzinfo=UTC)
+    ]
+    window = ZoneWindow("America/New_York", datetime(2026, 11, 1, tzinfo=UTC), datetime(2026, 11, 2, tzinfo=UTC))
+    assert window.offset_for_utc(datetime(2026, 11, 1, 5, 30, tzinfo=UTC)) == timedelta(hours=-4)
+    assert window.offset_for_utc(datetime(2026, 11, 1, 6, 30, tzinfo=UTC)) == timedelta(hours=-5)
+
+
+def test_zone_without_dst():
+    _assert_matches_zoneinfo("Asia/Kolkata", datetime(2026, 3, 1), datetime(2026, 3, 3))
+    assert _year_transitions("Asia/Kolkata", 2026) == ()
+
+
+@pytest.mark.parametrize("zone_name, local_start, local_end", [
+    # Sydney is on DST across New Year
+    ("Australia/Sydney", datetime(2025, 12, 30), datetime(2026, 1, 2)),
+    # Apia jumped from -10 to +14 at the end of 2011
+    ("Pacific/Apia", datetime(2011, 12, 28), datetime(2012, 1, 2)),
+])
+def test_year_boundary(zone_name, local_start, local_end):
+    _assert_matches_zoneinfo(zone_name, local_start, local_end)